@@ -4,11 +4,18 @@ from fastapi import FastAPI, Request, HTTPException, BackgroundTasks, UploadFile
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.persistencia_conversa.redis_adapter import AdaptadorRedis
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.persistencia_conversa.memoria_local_adapter import AdaptadorMemoriaLocal
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.groq_adapter import AdaptadorGroq
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.resiliente_adapter import AdaptadorLLMResiliente
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.instrumentacao_llm import InstrumentacaoLLM
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.openai_adapter import AdaptadorOpenAI
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.entrada.whatsapp.zapi_adapter import AdaptadorZAPI
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_remetente import RepoAgriwinRemetente
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_responsavel import RepoAgriwinResponsavel
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_consumo import RepoAgriwinConsumo
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_ferramentas import RepoAgriwinFerramentas
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.diretorio_remetente_cache import DiretorioRemetenteCache
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.catalogo_cache import CacheCatalogo
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.resposta_llm_cache import CacheRespostasLLM
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.historico_ponto_estoque_cache import HistoricoPontoEstoqueCache
 
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.whisper_adapter import AdaptadorWhisper
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.gemini_vision_adapter import AdaptadorGeminiVision
@@ -20,6 +27,11 @@ from src.comunicacao_wpp_ia.aplicacao.dtos.mensagem_recebida import MensagemRece
 from src.comunicacao_wpp_ia.aplicacao.servicos.remetente.obter_remetente import ObterRemetente
 from src.comunicacao_wpp_ia.dominio.servicos.responsavel.obter_responsavel import ObterResponsavel
 from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.salvar_consumo import SalvarConsumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.catalogo.pre_carregar_catalogos import PreCarregarCatalogos
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.resolver_consumo_informado import ResolverConsumoInformado
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.caminho_rapido_consumo import CaminhoRapidoConsumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.tabela_compacta import TabelaCompacta
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
 
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.clientes_api.agriwin_cliente import AgriwinCliente
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.entrada.eventos.redis_listener_adapter import AdaptadorListenerRedis
@@ -37,32 +49,72 @@ app = FastAPI(
 servico_conversa: ServicoConversa = None
 whatsapp_adapter: AdaptadorZAPI = None
 agriwin_cliente: AgriwinCliente = None 
+diretorio_remetentes: DiretorioRemetenteCache = None
+cache_catalogo: CacheCatalogo = None
+caminho_rapido_consumo: CaminhoRapidoConsumo = None
+cache_respostas_llm: CacheRespostasLLM = None
+llm_adapter: AdaptadorLLMResiliente = None
+instrumentacao_llm: InstrumentacaoLLM = None
+tabela_compacta: TabelaCompacta = None
 
 @app.on_event("startup")
 def inicializar_servicos_e_adaptadores():
     print("--- INICIALIZANDO ADAPTADORES E SERVIÇOS DA APLICAÇÃO ---")
 
-    global servico_conversa, whatsapp_adapter, agriwin_cliente
+    global servico_conversa, whatsapp_adapter, agriwin_cliente, diretorio_remetentes, cache_catalogo, caminho_rapido_consumo, cache_respostas_llm, llm_adapter, instrumentacao_llm, tabela_compacta
 
-    # Cliente da API Externa
+    ambiente = os.getenv("AMBIENTE", "dev")
+
+    # Cliente da API Externa e cache dos catálogos do produtor (compartilhado entre as conversas)
     agriwin_cliente = AgriwinCliente()
+    cache_catalogo = CacheCatalogo()
+
+    # Teto de tokens (estimados) das respostas das ferramentas de áreas do agente
+    tabela_compacta = TabelaCompacta(max_tokens=int(os.getenv("FERRAMENTAS_MAX_TOKENS", "600")))
 
     # Adaptadores de Saída (Infraestrutura)
-    repo_remetente = RepoAgriwinRemetente(agriwin_cliente)
-    repo_responsavel = RepoAgriwinResponsavel(agriwin_cliente)
+    diretorio_remetentes = DiretorioRemetenteCache(RepoAgriwinRemetente(agriwin_cliente), usar_redis=ambiente == "prod")
+    repo_remetente = diretorio_remetentes
+    repo_responsavel = RepoAgriwinResponsavel(agriwin_cliente, cache=cache_catalogo)
+    repo_ferramentas = RepoAgriwinFerramentas(agriwin_cliente, cache=cache_catalogo)
     repo_consumo = RepoAgriwinConsumo(agriwin_cliente)
-    llm_adapter = AdaptadorOpenAI()  #TODO: Este adaptador também cria sua própria instância de AgriwinCliente internamente, o que pode ser refatorado no futuro.
+    # Pontos de estoque usados nos consumos salvos (no Redis em produção, compartilhado entre as réplicas)
+    historico_ponto_estoque = HistoricoPontoEstoqueCache(usar_redis=ambiente == "prod")
+    servico_ferramentas = UtilizarFerramenta(repositorio_ferramentas=repo_ferramentas, historico_ponto_estoque=historico_ponto_estoque, tabela_compacta=tabela_compacta)
+    # Respostas estruturadas do LLM reaproveitadas para chamadas idênticas (desligável via LLM_CACHE=false)
+    if os.getenv("LLM_CACHE", "true").lower() == "true":
+        cache_respostas_llm = CacheRespostasLLM(usar_redis=ambiente == "prod")
+    # Latência, tokens, iterações e ferramentas de cada etapa do fluxo (expostos em /metricas)
+    instrumentacao_llm = InstrumentacaoLLM()
+    # Provedores de LLM: OpenAI e, se houver chave da Groq, a Groq como reserva (failover e hedge)
+    timeout_llm = float(os.getenv("LLM_TIMEOUT_SEGUNDOS", "20"))
+    max_tentativas_llm = int(os.getenv("LLM_MAX_TENTATIVAS", "1"))
+    provedores_llm = [("openai", AdaptadorOpenAI(timeout_segundos=timeout_llm, max_tentativas=max_tentativas_llm, cache_respostas=cache_respostas_llm, instrumentacao=instrumentacao_llm, servico_ferramentas=servico_ferramentas))]
+    if os.getenv("GROQ_API_KEY") and os.getenv("LLM_FALLBACK_GROQ", "true").lower() == "true":
+        provedores_llm.append(("groq", AdaptadorGroq(timeout_segundos=timeout_llm, max_tentativas=max_tentativas_llm, cache_respostas=cache_respostas_llm, instrumentacao=instrumentacao_llm, servico_ferramentas=servico_ferramentas)))
+    llm_adapter = AdaptadorLLMResiliente(
+        provedores_llm,
+        prazo_estruturado=float(os.getenv("LLM_PRAZO_ESTRUTURADO", "30")),
+        prazo_ferramentas=float(os.getenv("LLM_PRAZO_FERRAMENTAS", "90")),
+        hedge=os.getenv("LLM_HEDGE", "false").lower() == "true",
+        hedge_minimo_segundos=float(os.getenv("LLM_HEDGE_MIN_SEGUNDOS", "2")),
+        max_workers_por_provedor=int(os.getenv("LLM_MAX_WORKERS_POR_PROVEDOR", "16"))
+    )
     whatsapp_adapter = AdaptadorZAPI()
     whisper_adapter = AdaptadorWhisper()
     gemini_adapter = AdaptadorGeminiVision()
 
-    ambiente = os.getenv("AMBIENTE", "dev")
     memoria_adapter = AdaptadorRedis() if ambiente == "prod" else AdaptadorMemoriaLocal()
 
     # Serviços de Aplicação (Core)
     obter_remetente_service = ObterRemetente(repo_remetente=repo_remetente)
     obter_responsavel_service = ObterResponsavel(repo_responsavel=repo_responsavel)
-    salvar_consumo_service = SalvarConsumo(repositorio=repo_consumo)
+    salvar_consumo_service = SalvarConsumo(repositorio=repo_consumo, historico_ponto_estoque=historico_ponto_estoque)
+    pre_carregar_catalogos = PreCarregarCatalogos(repositorio_ferramentas=repo_ferramentas, repositorio_responsavel=repo_responsavel)
+
+    # Monta o consumo sem o agente quando todas as menções são únicas (desligável via CAMINHO_RAPIDO_CONSUMO=false)
+    if os.getenv("CAMINHO_RAPIDO_CONSUMO", "true").lower() == "true":
+        caminho_rapido_consumo = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas, historico_ponto_estoque))
 
     pre_processador = PreProcessamentoService(
         servico_transcricao=whisper_adapter,
@@ -77,7 +129,11 @@ def inicializar_servicos_e_adaptadores():
         pre_processador=pre_processador,
         whatsapp=whatsapp_adapter,
         agriwin_cliente=agriwin_cliente ,
-        obter_responsavel_service = obter_responsavel_service
+        obter_responsavel_service = obter_responsavel_service,
+        pre_carregar_catalogos=pre_carregar_catalogos,
+        caminho_rapido_consumo=caminho_rapido_consumo,
+        reescrever_verificacao_com_llm=os.getenv("VERIFICADOR_REESCREVER_COM_LLM", "false").lower() == "true",
+        modo_extracao=os.getenv("MODO_EXTRACAO", "combinada")
     )
 
     servico_notificacao = NotificarExpiracaoConversa(whatsapp=whatsapp_adapter)
@@ -109,6 +165,23 @@ async def receber_webhook_zapi(request: Request, background_tasks: BackgroundTas
     except Exception as e:
         print(f"[API CRITICAL] Erro inesperado no endpoint do webhook: {e}")
         raise HTTPException(status_code=500, detail="Ocorreu um erro interno no servidor.")
+
+@app.get("/metricas", status_code=200, tags=["Monitoramento"])
+def obter_metricas():
+    """
+    Expõe as métricas internas de desempenho (ex: reuso das conexões com a API Agriwin).
+    """
+    return {
+        "agriwin_pool": agriwin_cliente.obter_estatisticas_pool() if agriwin_cliente else {},
+        "diretorio_remetentes": diretorio_remetentes.obter_estatisticas() if diretorio_remetentes else {},
+        "catalogo": cache_catalogo.obter_estatisticas() if cache_catalogo else {},
+        "caminho_rapido_consumo": caminho_rapido_consumo.obter_estatisticas() if caminho_rapido_consumo else {},
+        "conversa": servico_conversa.obter_estatisticas() if servico_conversa else {},
+        "ferramentas_saida_compacta": tabela_compacta.obter_estatisticas() if tabela_compacta else {},
+        "llm_cache": cache_respostas_llm.obter_estatisticas() if cache_respostas_llm else {},
+        "llm_provedores": llm_adapter.obter_estatisticas() if llm_adapter else {},
+        "llm_etapas": instrumentacao_llm.obter_estatisticas() if instrumentacao_llm else {},
+    }
     
 @app.post("/webhook/zapi/test-audio", status_code=200, tags=["Testes"])
 async def receber_audio_para_teste(
@@ -0,0 +1,106 @@
+"""
+Benchmark do custo de construção, por mensagem, dos agentes de LLM (sem chamadas de rede).
+Compara a construção feita a cada consumo (repositório, serviço, ferramentas, bind_tools, prompt, AgentExecutor
+e as cadeias com saída estruturada) com a reutilização dos objetos compilados pelo AdaptadorLangChainBase.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_construcao_agente
+"""
+import os
+import statistics
+import time
+from typing import Callable, List
+
+# Nenhuma chamada externa é feita; as variáveis só satisfazem a inicialização dos clientes
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("AGRIWIN_USUARIO", "benchmark")
+os.environ.setdefault("AGRIWIN_SENHA", "benchmark")
+
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain.agents import AgentExecutor
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain.agents.output_parsers.tools import ToolsAgentOutputParser
+
+from src.comunicacao_wpp_ia.aplicacao.criacionais.consumo.consumo_builder import ConsumoBuilder
+from src.comunicacao_wpp_ia.aplicacao.dtos.validacao_intencao import ValidacaoIntencao
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
+from src.comunicacao_wpp_ia.dominio.utilitarios.estatistica import EstatisticaUtilidade
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.langchain_ferramentas_adapter import AdaptadorLangChainFerramentas
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.openai_adapter import AdaptadorOpenAI
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_ferramentas import RepoAgriwinFerramentas
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.clientes_api.agriwin_cliente import AgriwinCliente
+
+REPETICOES = 200
+PROMPT_SISTEMA = "Você é um assistente."
+PROMPT_USUARIO = "Histórico: {historico}\nMensagem: {mensagem}"
+
+
+def construir_como_antes(adaptador: AdaptadorOpenAI, agriwin_cliente: AgriwinCliente, prompt_agente: str) -> None:
+    """Reproduz o que era construído a cada mensagem: duas cadeias estruturadas e o agente com ferramentas."""
+    llm = adaptador._llm
+    for modelo_saida in (ValidacaoIntencao, ConsumoInformado):
+        ChatPromptTemplate.from_messages([("system", PROMPT_SISTEMA), ("human", PROMPT_USUARIO)]) | llm.with_structured_output(modelo_saida, include_raw=False)
+
+    repo_ferramentas = RepoAgriwinFerramentas(agriwin_cliente)
+    servico_ferramentas = UtilizarFerramenta(repositorio_ferramentas=repo_ferramentas)
+    ferramentas = AdaptadorLangChainFerramentas(servico_ferramentas).obter_ferramentas()
+    llm_com_ferramentas = llm.bind_tools(ferramentas)
+    prompt = ChatPromptTemplate.from_messages([("system", prompt_agente), MessagesPlaceholder(variable_name="agent_scratchpad")])
+    cadeia_agente = (
+        {
+            "input": lambda x: x.get("input", ""),
+            "dados_iniciais": lambda x: x.get("dados_iniciais", {}),
+            "historico": lambda x: x.get("historico", []),
+            "telefone": lambda x: x.get("telefone", ""),
+            "agent_scratchpad": lambda x: format_to_tool_messages(x.get("intermediate_steps", [])),
+        }
+        | prompt
+        | llm_com_ferramentas
+        | ToolsAgentOutputParser()
+    )
+    AgentExecutor(agent=cadeia_agente, tools=ferramentas, verbose=True)
+
+
+def construir_reutilizando(adaptador: AdaptadorOpenAI, remetente: DadosRemetente, prompt_agente: str) -> None:
+    """O mesmo conjunto de agentes, obtido dos objetos compilados pelo adaptador."""
+    for modelo_saida in (ValidacaoIntencao, ConsumoInformado):
+        adaptador.criar_agente(PROMPT_SISTEMA, PROMPT_USUARIO, modelo_saida)
+    adaptador.criar_agente_com_ferramentas(remetente, prompt_agente)
+
+
+def medir(funcao: Callable[[], None]) -> List[float]:
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def _resumo(nome: str, tempos: List[float]) -> str:
+    p95 = EstatisticaUtilidade.percentil(tempos, 0.95)
+    return f"{nome:<14} média={statistics.mean(tempos):8.3f} ms  p95={p95:8.3f} ms"
+
+
+def main():
+    agriwin_cliente = AgriwinCliente()
+    adaptador = AdaptadorOpenAI(servico_ferramentas=UtilizarFerramenta(repositorio_ferramentas=RepoAgriwinFerramentas(agriwin_cliente)))
+    remetente = DadosRemetente(base_url="https://benchmark.local", numero_telefone="5511999999999", produtor_id=["1"])
+    prompt_agente = ConsumoBuilder(adaptador)._criar_prompt()
+
+    # Aquece os caches do adaptador, como acontece na primeira mensagem após a inicialização
+    construir_reutilizando(adaptador, remetente, prompt_agente)
+
+    antes = medir(lambda: construir_como_antes(adaptador, agriwin_cliente, prompt_agente))
+    depois = medir(lambda: construir_reutilizando(adaptador, remetente, prompt_agente))
+
+    print(f"\nConstrução dos agentes por mensagem ({REPETICOES} repetições)")
+    print(_resumo("reconstruindo", antes))
+    print(_resumo("reutilizando", depois))
+    print(f"Redução: {statistics.mean(antes) / statistics.mean(depois):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
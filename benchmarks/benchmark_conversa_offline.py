@@ -0,0 +1,186 @@
+"""
+Benchmark offline do fluxo completo do ServicoConversa (validação, extração, construção, verificação e salvamento),
+sem rede e sem custo de API: o LLM é o AdaptadorLLMRoteirizado, que responde a partir de um roteiro gravado com
+latências sorteadas, e o Agriwin, o WhatsApp e a memória da conversa são substituídos por implementações em memória.
+As ferramentas do agente rodam de verdade sobre o catálogo em memória.
+
+Mede a latência de ponta a ponta por mensagem (média, p50, p95 e p99), a vazão e, pela InstrumentacaoLLM,
+a latência, os tokens simulados e as iterações de cada etapa.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_conversa_offline
+    python -m benchmarks.benchmark_conversa_offline --mensagens 200 --concorrencia 16 --modo-extracao paralela --caminho-rapido
+"""
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from src.comunicacao_wpp_ia.aplicacao.dtos.mensagem_recebida import MensagemRecebida
+from src.comunicacao_wpp_ia.aplicacao.portas.whatsapp import Whatsapp
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.caminho_rapido_consumo import CaminhoRapidoConsumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.resolver_consumo_informado import ResolverConsumoInformado
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.salvar_consumo import SalvarConsumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.conversasao import ServicoConversa
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
+from src.comunicacao_wpp_ia.aplicacao.servicos.pre_processamento import PreProcessamentoService
+from src.comunicacao_wpp_ia.aplicacao.servicos.remetente.obter_remetente import ObterRemetente
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.modelos.imobilizado import Imobilizado
+from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
+from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
+from src.comunicacao_wpp_ia.dominio.modelos.produto import Produto
+from src.comunicacao_wpp_ia.dominio.modelos.propriedade import Propriedade
+from src.comunicacao_wpp_ia.dominio.modelos.responsavel import Responsavel
+from src.comunicacao_wpp_ia.dominio.modelos.safra import Safra
+from src.comunicacao_wpp_ia.dominio.modelos.talhao import Talhao
+from src.comunicacao_wpp_ia.dominio.objetos.api.resposta_api import RespostaApi
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_consumo import RepositorioConsumo
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_ferramentas import RepositorioFerramentas
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_remetente import RepositorioRemetente
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_responsavel import RepositorioResponsavel
+from src.comunicacao_wpp_ia.dominio.servicos.responsavel.obter_responsavel import ObterResponsavel
+from src.comunicacao_wpp_ia.dominio.utilitarios.estatistica import EstatisticaUtilidade
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.instrumentacao_llm import InstrumentacaoLLM
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.roteirizado_adapter import AdaptadorLLMRoteirizado
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.persistencia_conversa.memoria_local_adapter import AdaptadorMemoriaLocal
+
+ROTEIRO_PADRAO = os.path.join(os.path.dirname(__file__), "roteiros", "consumo_pulverizacao.json")
+MENSAGEM = "Apliquei 12 litros de roundup original no talhão 03 ontem, saiu do depósito central, safra 2025/2026"
+RESPOSTA_SUCESSO = "Seu registro foi salvo com sucesso!"
+
+FAZENDA = Propriedade(id="F1", nome="Fazenda Boa Vista")
+
+
+class RepoFerramentasMemoria(RepositorioFerramentas):
+    """Catálogo fixo de um produtor, coerente com as respostas do roteiro padrão."""
+    def buscar_maquinas_do_produtor(self, base_url: str, id_produtor: str) -> List[Imobilizado]:
+        return [Imobilizado(id="M1", nome="Pulverizador Uniport 3030", ativo=True)]
+
+    def buscar_pontos_estoque_do_produtor(self, base_url: str, id_produtor: str) -> List[PontoEstoque]:
+        return [PontoEstoque(id="E1", nome="Depósito Central", ativo=True), PontoEstoque(id="E2", nome="Galpão Sede", ativo=True)]
+
+    def buscar_produtos_do_produtor(self, base_url: str, id_produtor: str) -> List[Produto]:
+        return [Produto(id="P1", nome="Roundup Original", ingredientes_ativos=["glifosato"]), Produto(id="P2", nome="Elatus", ingredientes_ativos=["azoxistrobina"])]
+
+    def buscar_produtos_em_estoque(self, base_url: str, id_produtor: str, nomes_produtos: List[str]) -> List[Produto]:
+        return self.buscar_produtos_do_produtor(base_url, id_produtor)
+
+    def buscar_produtos_mais_consumidos(self, base_url: str, id_produtor: str, nomes_produtos: List[str]) -> List[Produto]:
+        return self.buscar_produtos_do_produtor(base_url, id_produtor)
+
+    def buscar_safras_do_produtor(self, base_url: str, id_produtor: str) -> List[Safra]:
+        return [Safra(id="S1", nome="Safra 2025/2026", ano_inicio=2025, ano_termino=2026, data_inicio=date(2025, 7, 1), data_termino=date(2026, 6, 30))]
+
+    def buscar_atraves_dos_talhoes_do_produtor(self, base_url: str, id_produtor: str) -> List[Plantio]:
+        return self.buscar_plantios_do_produtor(base_url, id_produtor)
+
+    def buscar_plantios_do_produtor(self, base_url: str, id_produtor: str) -> List[Plantio]:
+        return [
+            Plantio(id="PL1", nome="Soja", talhao=Talhao(id="T3", nome="Talhão 03", area_ha=42.5), propriedade=FAZENDA),
+            Plantio(id="PL2", nome="Milho", talhao=Talhao(id="T4", nome="Talhão 04", area_ha=30.0), propriedade=FAZENDA),
+        ]
+
+    def buscar_propriedades_do_produtor(self, base_url: str, id_produtor: str) -> List[Propriedade]:
+        return [FAZENDA]
+
+
+class RepoRemetenteMemoria(RepositorioRemetente):
+    def buscar_remetente_por_telefone(self, telefone: str) -> Optional[DadosRemetente]:
+        return DadosRemetente(base_url="https://benchmark.local", numero_telefone=telefone, produtor_id=["1"])
+
+
+class RepoResponsavelMemoria(RepositorioResponsavel):
+    def _buscar_responsaveis_do_produtor(self, base_url: str, id_produtor: str) -> List[Responsavel]:
+        return [Responsavel(id="R1", nome="Operador", nome_fantasia=None, telefone=None)]
+
+    def buscar_responsavel_por_telefone(self, base_url: str, id_produtor: str, telefone: str) -> Optional[Responsavel]:
+        return self._buscar_responsaveis_do_produtor(base_url, id_produtor)[0]
+
+
+class RepoConsumoMemoria(RepositorioConsumo):
+    def enviar(self, base_url: str, produtor_id: str, consumo) -> RespostaApi:
+        return RespostaApi(status=200, mensagem="Consumo registrado.")
+
+
+class WhatsappMemoria(Whatsapp):
+    """Recebe payloads de texto no formato do webhook da Z-API e guarda a última resposta enviada a cada telefone."""
+    def __init__(self):
+        self.respostas: Dict[str, str] = {}
+
+    def enviar(self, telefone: str, mensagem: str) -> None:
+        self.respostas[telefone] = mensagem
+
+    def receber(self, payload_webhook: Dict[str, Any]) -> MensagemRecebida:
+        telefone = payload_webhook.get("phone")
+        texto = (payload_webhook.get("text") or {}).get("message")
+        if not telefone or not texto:
+            raise ValueError("O benchmark só processa mensagens de texto com telefone.")
+        return MensagemRecebida(telefone_remetente=telefone, telefone_formatado=telefone, tipo="TEXTO", texto_conteudo=texto)
+
+
+def montar_servico(roteiro: str, modo_extracao: str, caminho_rapido: bool, instrumentacao: InstrumentacaoLLM):
+    repo_ferramentas = RepoFerramentasMemoria()
+    whatsapp = WhatsappMemoria()
+    llm = AdaptadorLLMRoteirizado.de_arquivo(
+        roteiro,
+        servico_ferramentas=UtilizarFerramenta(repositorio_ferramentas=repo_ferramentas),
+        instrumentacao=instrumentacao
+    )
+    servico = ServicoConversa(
+        memoria=AdaptadorMemoriaLocal(),
+        llm=llm,
+        obter_remetente_service=ObterRemetente(repo_remetente=RepoRemetenteMemoria()),
+        obter_responsavel_service=ObterResponsavel(repo_responsavel=RepoResponsavelMemoria()),
+        salvar_consumo_service=SalvarConsumo(repositorio=RepoConsumoMemoria()),
+        pre_processador=PreProcessamentoService(servico_transcricao=None, extrair_texto_imagem=None),
+        whatsapp=whatsapp,
+        agriwin_cliente=None,
+        caminho_rapido_consumo=CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas)) if caminho_rapido else None,
+        modo_extracao=modo_extracao
+    )
+    return servico, whatsapp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roteiro", default=ROTEIRO_PADRAO)
+    parser.add_argument("--mensagens", type=int, default=50)
+    parser.add_argument("--concorrencia", type=int, default=10)
+    parser.add_argument("--modo-extracao", default="combinada", choices=["combinada", "paralela", "separada"])
+    parser.add_argument("--caminho-rapido", action="store_true")
+    argumentos = parser.parse_args()
+
+    instrumentacao = InstrumentacaoLLM()
+    servico, whatsapp = montar_servico(argumentos.roteiro, argumentos.modo_extracao, argumentos.caminho_rapido, instrumentacao)
+
+    def processar(indice: int) -> float:
+        telefone = f"55119{indice:08d}"
+        mensagem = whatsapp.receber({"phone": telefone, "text": {"message": MENSAGEM}})
+        inicio = time.perf_counter()
+        servico.processar_mensagem_recebida(mensagem)
+        return (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=argumentos.concorrencia) as executor:
+        latencias = list(executor.map(processar, range(argumentos.mensagens)))
+    duracao = time.perf_counter() - inicio
+
+    salvos = sum(1 for resposta in whatsapp.respostas.values() if resposta == RESPOSTA_SUCESSO)
+    print(f"\nFluxo completo offline: {argumentos.mensagens} mensagens, concorrência {argumentos.concorrencia}, "
+          f"modo '{argumentos.modo_extracao}', caminho rápido {'ligado' if argumentos.caminho_rapido else 'desligado'}")
+    print(f"Consumos salvos: {salvos}/{argumentos.mensagens}   vazão: {argumentos.mensagens / duracao:.2f} mensagens/s")
+    print(f"Ponta a ponta    média={statistics.mean(latencias):8.1f} ms  p50={EstatisticaUtilidade.percentil(latencias, 0.50):8.1f} ms  "
+          f"p95={EstatisticaUtilidade.percentil(latencias, 0.95):8.1f} ms  p99={EstatisticaUtilidade.percentil(latencias, 0.99):8.1f} ms")
+    print("\nPor etapa:")
+    for etapa, estatisticas in instrumentacao.obter_estatisticas().items():
+        print(f"  {etapa:<18} execuções={estatisticas['execucoes']:<5} p50={estatisticas['p50_ms']:8.1f} ms  p95={estatisticas['p95_ms']:8.1f} ms  "
+              f"iterações={estatisticas['iteracoes_media']:<5} tokens={estatisticas['tokens_prompt']}+{estatisticas['tokens_completion']}  "
+              f"ferramentas={estatisticas['chamadas_ferramentas']}")
+
+
+if __name__ == "__main__":
+    main()
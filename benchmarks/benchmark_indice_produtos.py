@@ -0,0 +1,90 @@
+"""
+Benchmark da busca de produtos por similaridade (IndiceProdutos) em catálogos sintéticos de 1k, 10k e 50k produtos.
+Compara a varredura completa com o pré-filtro por trigramas: tempo de construção do índice, latência por consulta
+(média e p95) e a cobertura do pré-filtro (fração dos resultados da varredura completa que ele também encontra).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.benchmark_indice_produtos
+"""
+import random
+import statistics
+import time
+from typing import List, Tuple
+
+from src.comunicacao_wpp_ia.dominio.modelos.produto import Produto
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_produtos import IndiceProdutos
+from src.comunicacao_wpp_ia.dominio.utilitarios.estatistica import EstatisticaUtilidade
+
+TAMANHOS = [1000, 10000, 50000]
+CONSULTAS_POR_TAMANHO = 200
+
+PREFIXOS = ["roundup", "glifosato", "atrazina", "mancozeb", "ureia", "cloreto", "super", "fox", "elatus", "priori", "engeo", "ampligo", "verdict", "nativo", "opera", "fertilizante", "adubo", "semente", "oleo", "espalhante"]
+SUFIXOS = ["original", "ultra", "max", "wg", "sc", "ec", "plus", "xtra", "gold", "premium", "nitro", "top", "forte", "agro", "dry"]
+INGREDIENTES = ["glifosato", "atrazina", "mancozebe", "azoxistrobina", "ciproconazol", "tiametoxam", "lambda cialotrina", "clorpirifos", "trifloxistrobina", "protioconazol"]
+
+
+def _palavra_aleatoria(gerador: random.Random) -> str:
+    return "".join(gerador.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(gerador.randint(4, 9)))
+
+
+def gerar_catalogo(tamanho: int, gerador: random.Random) -> List[Produto]:
+    produtos = []
+    for indice in range(tamanho):
+        nome = f"{gerador.choice(PREFIXOS)} {_palavra_aleatoria(gerador)} {gerador.choice(SUFIXOS)}"
+        ingredientes = gerador.sample(INGREDIENTES, gerador.randint(0, 2))
+        produtos.append(Produto(id=str(indice), nome=nome, ingredientes_ativos=ingredientes))
+    return produtos
+
+
+def gerar_consulta(produtos: List[Produto], gerador: random.Random) -> str:
+    # Nome de um produto existente com um erro de digitação (troca, remoção ou inserção de uma letra)
+    nome = list(gerador.choice(produtos).nome)
+    posicao = gerador.randrange(len(nome))
+    operacao = gerador.choice(["troca", "remocao", "insercao"])
+    if operacao == "troca":
+        nome[posicao] = gerador.choice("abcdefghijklmnopqrstuvwxyz")
+    elif operacao == "remocao":
+        del nome[posicao]
+    else:
+        nome.insert(posicao, gerador.choice("abcdefghijklmnopqrstuvwxyz"))
+    return "".join(nome)
+
+
+def medir(indice: IndiceProdutos, consultas: List[str]) -> Tuple[List[float], List[set]]:
+    tempos, resultados = [], []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        encontrados = indice.buscar(consulta)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        resultados.append({produto.id for produto, _ in encontrados})
+    return tempos, resultados
+
+
+def executar():
+    gerador = random.Random(42)
+    print(f"{'produtos':>9} | {'modo':<12} | {'construção (ms)':>15} | {'média (ms)':>10} | {'p95 (ms)':>8} | {'cobertura':>9}")
+    print("-" * 80)
+    for tamanho in TAMANHOS:
+        produtos = gerar_catalogo(tamanho, gerador)
+        consultas = [gerar_consulta(produtos, gerador) for _ in range(CONSULTAS_POR_TAMANHO)]
+
+        inicio = time.perf_counter()
+        completo = IndiceProdutos(produtos, limiar_pre_filtro=tamanho + 1)
+        construcao_completo = (time.perf_counter() - inicio) * 1000
+        inicio = time.perf_counter()
+        pre_filtrado = IndiceProdutos(produtos, limiar_pre_filtro=0)
+        construcao_pre_filtro = (time.perf_counter() - inicio) * 1000
+
+        tempos_completo, resultados_completo = medir(completo, consultas)
+        tempos_pre_filtro, resultados_pre_filtro = medir(pre_filtrado, consultas)
+
+        total = sum(len(resultado) for resultado in resultados_completo)
+        encontrados = sum(len(a & b) for a, b in zip(resultados_completo, resultados_pre_filtro))
+        cobertura = encontrados / total if total else 1.0
+
+        print(f"{tamanho:>9} | {'completo':<12} | {construcao_completo:>15.1f} | {statistics.mean(tempos_completo):>10.2f} | {EstatisticaUtilidade.percentil(tempos_completo, 0.95):>8.2f} | {'-':>9}")
+        print(f"{tamanho:>9} | {'trigramas':<12} | {construcao_pre_filtro:>15.1f} | {statistics.mean(tempos_pre_filtro):>10.2f} | {EstatisticaUtilidade.percentil(tempos_pre_filtro, 0.95):>8.2f} | {cobertura:>9.2%}")
+
+
+if __name__ == "__main__":
+    executar()
@@ -1,27 +1,31 @@
-from typing import List
+from typing import List, Optional
 import json
 from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
 from src.comunicacao_wpp_ia.aplicacao.portas.llms import ServicoLLM
 from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
 from src.comunicacao_wpp_ia.dominio.objetos.consumo import Consumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.caminho_rapido_consumo import CaminhoRapidoConsumo
 from pydantic import ValidationError
 
 class ConsumoBuilder:
     """
     Orquestra a COLETA de informações para um consumo, utilizando um agente com ferramentas. Sua responsabilidade termina ao montar o objeto de consumo com todos os IDs encontrados.
+    Quando configurado, tenta antes o caminho rápido, que monta o consumo sem LLM se todas as menções forem únicas.
     """
-    def __init__(self, servico_llm: ServicoLLM):
+    def __init__(self, servico_llm: ServicoLLM, caminho_rapido: Optional[CaminhoRapidoConsumo] = None):
         self._servico_llm = servico_llm
+        self._caminho_rapido = caminho_rapido
 
-    # TODO: receber numero de telefone
-    def _criar_prompt(self, remetente: DadosRemetente) -> str:
+    # O prompt não depende do remetente (o telefone entra como variável), para que o agente compilado seja reutilizado entre as conversas
+    def _criar_prompt(self) -> str:
         return f"""
         Você é um agente especialista em coletar dados agrícolas.
         Sua única missão é usar as ferramentas para encontrar os IDs de todos os itens mencionados pelo usuário e, ao final, montar um objeto JSON estruturado com esses dados.
 
         **Regras:**
         1.  **Colete Primeiro:** Use as ferramentas para buscar IDs para: produtos, talhões/plantios/propriedades (apenas um dos 3 - o informado), máquinas, pontos de estoque, safra etc., com base nos `dados_iniciais`.
-        1.1. **Sempre busque a Safra e o Ponto de Estoque:** Você DEVE obrigatoriamente chamar as ferramentas `buscar_safra_disponivel` e `buscar_pontos_de_estoque_disponiveis`. Se o usuário não especificou nos `dados_iniciais`, invoque as ferramentas sem parâmetros.
+        1.0. **Resolva Tudo de Uma Vez:** Comece SEMPRE chamando `resolver_itens_do_consumo` com os `dados_iniciais`. Os itens com status 'unico' já estão resolvidos (inclusive safra e ponto de estoque); chame as ferramentas específicas apenas para os itens 'nao_encontrado'.
+        1.1. **Sempre obtenha a Safra e o Ponto de Estoque:** Se `resolver_itens_do_consumo` não os retornou com status 'unico', você DEVE obrigatoriamente chamar as ferramentas `buscar_safra_disponivel` e `buscar_pontos_de_estoque_disponiveis`. Se o usuário não especificou nos `dados_iniciais`, invoque as ferramentas sem parâmetros (exceto `data_aplicacao` da safra, que deve receber a `data_mencionada` dos `dados_iniciais`, quando houver).
         2.  **Seja Resiliente:** Se uma busca não retornar um ID (retornar nulo ou vazio), não tem problema. Continue para o próximo item.
         3.  **Ambiguidade (Regra Crítica):** Se uma busca por qualquer item retornar **MÚLTIPLOS resultados possíveis**, sua única ação deve ser usar a ferramenta `solicitar_esclarecimento_ao_usuario`. **NÃO** prossiga com a montagem do JSON. Formule uma pergunta clara listando as opções para o usuário.
             - Exemplo de uso: Se a busca por 'Abacus' retornar 'Abacus HC' e 'Abacus 05' e você nao conseguir definir apenas um, você deve chamar a ferramenta `solicitar_esclarecimento_ao_usuario` com o argumento `pergunta="Encontrei dois produtos similares: 'Abacus HC' e 'Abacus 05'. Qual deles você utilizou?"`.
@@ -40,7 +44,7 @@ class ConsumoBuilder:
 
         **Dados de Entrada:**
             -   Você recebeu estes dados iniciais: {{dados_iniciais}}.
-            -   O telefone do usuário é: `{remetente.numero_telefone}`.
+            -   O telefone do usuário é: `{{telefone}}`.
             -   A mensagem do usuário é: {{input}}
             -   O histórico da conversa é: {{historico}}
         """
@@ -48,15 +52,22 @@ class ConsumoBuilder:
     def executar(self, remetente: DadosRemetente, mensagem_usuario: str, dados_iniciais: ConsumoInformado, historico_conversa: List = None):
         historico_conversa = historico_conversa or []
 
-        prompt_orquestrador = self._criar_prompt(remetente)
+        if self._caminho_rapido:
+            consumo_montado = self._caminho_rapido.tentar(remetente, dados_iniciais)
+            if consumo_montado:
+                return consumo_montado
+
+        prompt_orquestrador = self._criar_prompt()
         agente_com_ferramentas = self._servico_llm.criar_agente_com_ferramentas(
             remetente=remetente,
-            prompt_template=prompt_orquestrador
+            prompt_template=prompt_orquestrador,
+            etapa="construtor"
         )
         entradas_agente = {
             "input": mensagem_usuario,
-            "dados_iniciais": dados_iniciais.dict(),
-            "historico": historico_conversa
+            "dados_iniciais": dados_iniciais.model_dump(mode="json"),
+            "historico": historico_conversa,
+            "telefone": remetente.numero_telefone
         }
 
         resultado_str = agente_com_ferramentas.executar(entradas_agente)
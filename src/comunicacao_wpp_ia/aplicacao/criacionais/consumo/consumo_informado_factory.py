@@ -1,8 +1,12 @@
-from datetime import date
+from typing import Tuple
 from src.comunicacao_wpp_ia.aplicacao.portas.llms import ServicoLLM
+from src.comunicacao_wpp_ia.aplicacao.dtos.validacao_intencao import ValidacaoIntencao
+from src.comunicacao_wpp_ia.aplicacao.dtos.intencao_consumo_informado import IntencaoConsumoInformado
+from src.comunicacao_wpp_ia.aplicacao.servicos.remetente.validador_intencao_usuario import ValidadorIntencaoUsuario
 from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
 from src.comunicacao_wpp_ia.dominio.servicos.consumo.validador_infos_para_consumo import ValidadorInformacoesParaConsumo
 from src.comunicacao_wpp_ia.dominio.utilitarios.string import StringUtilidade
+from src.comunicacao_wpp_ia.dominio.utilitarios.tokens import TokensUtilidade
 
 class FabricaConsumoInformado:
     """
@@ -51,6 +55,22 @@ class FabricaConsumoInformado:
             '{mensagem}'
         """
 
+    @classmethod
+    def __obter_prompt_sistema_com_intencao(cls) -> str:
+        return ValidadorIntencaoUsuario.obter_prompt_sistema() + cls.__obter_prompt_sistema() + """
+            **Resposta Combinada:**
+            - Preencha `intencao_valida` e `justificativa` conforme as regras de intenção acima.
+            - Se a intenção for válida, preencha `consumo_informado` conforme as regras de extração acima.
+            - Se a intenção for inválida, `consumo_informado` deve ser nulo (None).
+        """
+
+    def estimar_tokens_extracao(self, mensagem_usuario: str, historico: list) -> int:
+        """
+        Estima os tokens de entrada da chamada de extração (prompt do sistema, histórico e mensagem).
+        """
+        historico_formatado = "\n".join(f"{m['role']}: {m['content']}" for m in historico)
+        return TokensUtilidade.estimar(self.__obter_prompt_sistema() + self.__obter_mensagem_usuario() + historico_formatado + mensagem_usuario)
+
     def criar_de_mensagem(self, mensagem_usuario: str, historico: list) -> (str | ConsumoInformado):
         """
         Usa o LLM para fazer uma extração estruturada rápida. Se um campo obrigatório não for extraído, formula a pergunta para o usuário.
@@ -62,15 +82,48 @@ class FabricaConsumoInformado:
 
         historico_formatado = "\n".join(f"{m['role']}: {m['content']}" for m in historico)
         
-        agente = self._llm.criar_agente(prompt_sistema, prompt_usuario, ConsumoInformado) 
+        agente = self._llm.criar_agente(prompt_sistema, prompt_usuario, ConsumoInformado, etapa="extracao")
         dados_extraidos = agente.executar({"mensagem": mensagem_usuario, "historico": historico_formatado})
 
         print(f"Dados extraídos na checagem inicial: {dados_extraidos}")
+        return self.__completar_e_validar(dados_extraidos)
+
+    def criar_de_mensagem_validando_intencao(self, mensagem_usuario: str, historico: list) -> Tuple[ValidacaoIntencao, (str | ConsumoInformado | None)]:
+        """
+        Valida a intenção do usuário e extrai o consumo informado em uma única chamada estruturada ao LLM.
+        Retorna a validação da intenção e, se ela for válida, o mesmo resultado de `criar_de_mensagem`.
+        Uma resposta curta em conversa ativa dispensa a validação, como no ValidadorIntencaoUsuario, e só é extraída.
+        """
+        resposta_curta = ValidadorIntencaoUsuario.validar_resposta_curta(mensagem_usuario, historico)
+        if resposta_curta:
+            return resposta_curta, self.criar_de_mensagem(mensagem_usuario, historico)
+
+        print("--- ETAPA 0+1: Validando a intenção e checando informações obrigatórias ---")
 
-        # Converte a data mencionada (string) para um objeto de data completo
-        dados_extraidos.data_mencionada = StringUtilidade.para_data(dados_extraidos.data_mencionada)
-        if not dados_extraidos.data_mencionada:
-            dados_extraidos.data_mencionada = date.today()
+        prompt_sistema = self.__obter_prompt_sistema_com_intencao()
+        prompt_usuario = self.__obter_mensagem_usuario()
+
+        historico_formatado = "\n".join(f"{m['role']}: {m['content']}" for m in historico)
+
+        agente = self._llm.criar_agente(prompt_sistema, prompt_usuario, IntencaoConsumoInformado, etapa="intencao_extracao")
+        resultado = agente.executar({"mensagem": mensagem_usuario, "historico": historico_formatado})
+
+        validacao = resultado.obter_validacao()
+        if not validacao.intencao_valida:
+            print(f"[SECURITY] Intenção inválida detectada. Justificativa: {validacao.justificativa}")
+            return validacao, None
+
+        print("[SECURITY] Intenção do usuário validada com sucesso.")
+        print(f"Dados extraídos na checagem inicial: {resultado.consumo_informado}")
+        return validacao, self.__completar_e_validar(resultado.consumo_informado or ConsumoInformado())
+
+    @staticmethod
+    def __completar_e_validar(dados_extraidos: ConsumoInformado) -> (str | ConsumoInformado):
+        # Converte a data mencionada (string) para um objeto de data completo; sem data, assume hoje e sinaliza
+        if dados_extraidos.data_mencionada:
+            dados_extraidos.data_mencionada = StringUtilidade.para_data(dados_extraidos.data_mencionada)
+        else:
+            dados_extraidos.assumir_data_de_hoje()
 
         eh_valido, perguntas_faltantes = ValidadorInformacoesParaConsumo.validar(dados_extraidos)
 
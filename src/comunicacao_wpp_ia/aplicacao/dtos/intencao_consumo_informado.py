@@ -0,0 +1,13 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from src.comunicacao_wpp_ia.aplicacao.dtos.validacao_intencao import ValidacaoIntencao
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
+
+class IntencaoConsumoInformado(BaseModel):
+    """Modelo para a saída combinada da validação de intenção e da extração do consumo informado."""
+    intencao_valida: bool = Field(description="Indica se a intenção do usuário é válida (apenas registrar um consumo).")
+    justificativa: str = Field(description="Uma justificativa concisa sobre o porquê da intenção ser considerada inválida.")
+    consumo_informado: Optional[ConsumoInformado] = Field(default=None, description="As informações de consumo extraídas. Nulo se a intenção for inválida.")
+
+    def obter_validacao(self) -> ValidacaoIntencao:
+        return ValidacaoIntencao(intencao_valida=self.intencao_valida, justificativa=self.justificativa)
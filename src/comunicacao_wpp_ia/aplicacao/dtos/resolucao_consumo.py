@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, List
+
+StatusResolucao = Literal["unico", "ambiguo", "nao_encontrado"]
+
+class CandidatoResolucao(BaseModel):
+    """Um possível item do catálogo para uma menção ambígua."""
+    id: str
+    nome: str
+    score: Optional[float] = None
+
+class ItemResolvido(BaseModel):
+    """
+    Resultado da busca de uma menção do usuário (produto, máquina, área, ponto de estoque ou safra) nos catálogos.
+    Quando o status é 'unico', `id` e `nome` trazem o item encontrado; quando é 'ambiguo', `candidatos` traz as opções.
+    """
+    mencao: Optional[str] = None
+    status: StatusResolucao
+    id: Optional[str] = None
+    nome: Optional[str] = None
+    candidatos: List[CandidatoResolucao] = Field(default_factory=list)
+
+    # Dados complementares que o usuário informou junto com a menção
+    quantidade: Optional[float] = None
+    horimetro_inicio: Optional[float] = None
+    horimetro_fim: Optional[float] = None
+
+class ResolucaoConsumo(BaseModel):
+    """
+    Resolução de todas as menções de um ConsumoInformado de uma só vez, contra os catálogos do produtor.
+    """
+    produtos: List[ItemResolvido] = Field(default_factory=list)
+    maquinas: List[ItemResolvido] = Field(default_factory=list)
+    plantios: List[ItemResolvido] = Field(default_factory=list)
+    propriedades: List[ItemResolvido] = Field(default_factory=list)
+    ponto_estoque: Optional[ItemResolvido] = None
+    safra: Optional[ItemResolvido] = None
+    tipo_rateio: Optional[str] = None
+    data_aplicacao: Optional[str] = None
+    id_responsavel: Optional[str] = None
+
+    def itens(self) -> List[ItemResolvido]:
+        itens = self.produtos + self.maquinas + self.plantios + self.propriedades
+        return itens + [item for item in (self.ponto_estoque, self.safra) if item is not None]
+
+    def pendencias(self) -> List[ItemResolvido]:
+        """Itens que não foram resolvidos de forma única."""
+        return [item for item in self.itens() if item.status != "unico"]
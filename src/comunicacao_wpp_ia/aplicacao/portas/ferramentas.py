@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
 
 class Ferramentas(ABC):
     """
@@ -13,15 +14,15 @@ class Ferramentas(ABC):
         pass
 
     @abstractmethod
-    def buscar_talhoes_disponiveis(self) -> List[Dict[str, Any]]:
+    def buscar_talhoes_disponiveis(self, nomes_talhoes: Optional[List[str]] = None) -> str:
         pass
 
     @abstractmethod
-    def buscar_propriedades_disponiveis(self) -> List[Dict[str, Any]]:
+    def buscar_propriedades_disponiveis(self, nomes_propriedades: Optional[List[str]] = None) -> str:
         pass
     
     @abstractmethod
-    def buscar_plantios_disponiveis(self) -> List[Dict[str, Any]]:
+    def buscar_plantios_disponiveis(self, nomes_plantios: Optional[List[str]] = None) -> str:
         pass
 
     @abstractmethod
@@ -33,9 +34,13 @@ class Ferramentas(ABC):
         pass
 
     @abstractmethod
-    def buscar_safra_disponivel(self, nome_safra: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def buscar_safra_disponivel(self, nome_safra: Optional[str] = None, data_aplicacao: Optional[str] = None) -> Optional[Dict[str, Any]]:
         pass
     
+    @abstractmethod
+    def resolver_itens_do_consumo(self, consumo_informado: ConsumoInformado) -> Dict[str, Any]:
+        pass
+
     @abstractmethod
     def solicitar_esclarecimento_ao_usuario(self, pergunta: str) -> str:
         pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, List, Any, Dict
+from typing import Type, TypeVar, List, Any, Dict, Optional
 from pydantic import BaseModel
 from src.comunicacao_wpp_ia.aplicacao.portas.agente_com_ferramentas import AgenteComFerramentas
 from src.comunicacao_wpp_ia.aplicacao.portas.agente import Agente
@@ -14,20 +14,21 @@ class ServicoLLM(ABC):
     """
     
     @abstractmethod
-    def criar_agente(self, prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T]) -> Agente[T]:
+    def criar_agente(self, prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T], etapa: Optional[str] = None) -> Agente[T]:
         """
         Método Fábrica: constrói e retorna um Invocador para gerar saídas estruturadas.
+        `etapa` identifica o passo do fluxo (ex: 'intencao') nas métricas e no rastro da mensagem.
         """
         pass
 
     @abstractmethod
-    def criar_agente_com_ferramentas(self, remetente: DadosRemetente, prompt_template: str) -> AgenteComFerramentas:
+    def criar_agente_com_ferramentas(self, remetente: DadosRemetente, prompt_template: str, etapa: Optional[str] = None) -> AgenteComFerramentas:
         """
         Método Fábrica: constrói e retorna uma instância de um Agente executável.
         
         Args:
             prompt_template: O template de prompt do sistema para o agente.
-            ferramentas: A lista de ferramentas que o agente pode usar.
+            etapa: O passo do fluxo (ex: 'construtor') nas métricas e no rastro da mensagem.
 
         Returns:
             Um objeto que implementa a interface Agente.
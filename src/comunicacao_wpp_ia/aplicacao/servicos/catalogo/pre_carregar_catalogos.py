@@ -0,0 +1,43 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_ferramentas import RepositorioFerramentas
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_responsavel import RepositorioResponsavel
+
+class PreCarregarCatalogos:
+    """
+    Caso de uso que dispara, em segundo plano, a carga dos catálogos do produtor assim que o remetente é identificado.
+    As cargas rodam em paralelo às chamadas de LLM (validação de intenção e extração), de modo que as ferramentas
+    do agente encontrem os dados já no cache dos repositórios. Só traz ganho quando os repositórios usam cache.
+    """
+
+    def __init__(self, repositorio_ferramentas: RepositorioFerramentas, repositorio_responsavel: RepositorioResponsavel, max_workers: int = 8):
+        self._repositorio_ferramentas = repositorio_ferramentas
+        self._repositorio_responsavel = repositorio_responsavel
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pre-carga-catalogo")
+
+    def _carregar(self, recurso: str, id_produtor: str, carga: Callable[[], Any]):
+        try:
+            carga()
+            print(f"[PRE-CARGA] Catálogo '{recurso}' do produtor {id_produtor} carregado.")
+        except Exception as e:
+            # A pré-carga é apenas uma otimização: a ferramenta fará a busca normalmente se ela falhar.
+            print(f"[PRE-CARGA WARNING] Falha ao pré-carregar '{recurso}' do produtor {id_produtor}. Erro: {e}")
+
+    def executar(self, remetente: DadosRemetente) -> List[Future]:
+        """
+        Agenda a carga dos catálogos e retorna imediatamente, sem aguardar as respostas da API.
+        """
+        base_url = remetente.base_url
+        id_produtor = remetente.produtor_id[0]
+        repositorio = self._repositorio_ferramentas
+
+        cargas: Dict[str, Callable[[], Any]] = {
+            "produtos": lambda: repositorio.buscar_produtos_do_produtor(base_url, id_produtor),
+            "areas": lambda: repositorio.buscar_plantios_do_produtor(base_url, id_produtor),
+            "pontos_estoque": lambda: repositorio.buscar_pontos_estoque_do_produtor(base_url, id_produtor),
+            "safras": lambda: repositorio.buscar_safras_do_produtor(base_url, id_produtor),
+            "pessoas": lambda: self._repositorio_responsavel.buscar_responsavel_por_telefone(base_url, id_produtor, remetente.numero_telefone),
+        }
+        print(f"[PRE-CARGA] Iniciando pré-carga de {list(cargas)} para o produtor {id_produtor}.")
+        return [self._executor.submit(self._carregar, recurso, id_produtor, carga) for recurso, carga in cargas.items()]
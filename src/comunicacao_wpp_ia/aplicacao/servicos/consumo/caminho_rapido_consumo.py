@@ -0,0 +1,102 @@
+import threading
+from typing import Any, Dict, Optional
+from src.comunicacao_wpp_ia.aplicacao.dtos.resolucao_consumo import ResolucaoConsumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.resolver_consumo_informado import ResolverConsumoInformado
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.objetos.consumo import Consumo, Produto, Maquina
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
+
+class CaminhoRapidoConsumo:
+    """
+    Monta o Consumo sem o agente de ferramentas quando todas as menções do ConsumoInformado são resolvidas
+    de forma única pelos serviços de domínio. Em qualquer ambiguidade ou item não encontrado, devolve None
+    para que o ConsumoBuilder siga com o agente.
+    """
+
+    def __init__(self, resolver_consumo_informado: ResolverConsumoInformado):
+        self._resolver = resolver_consumo_informado
+        self._lock = threading.Lock()
+        self._tentativas = 0
+        self._acertos = 0
+        self._motivos_desvio: Dict[str, int] = {}
+
+    @staticmethod
+    def _motivo_desvio(consumo_informado: ConsumoInformado, resolucao: ResolucaoConsumo) -> Optional[str]:
+        """
+        Retorna o motivo pelo qual o consumo não pode ser montado sem o agente, ou None se puder.
+        """
+        if not resolucao.produtos:
+            return "sem_produtos"
+        if resolucao.pendencias():
+            return "ambiguidade" if any(item.status == "ambiguo" for item in resolucao.pendencias()) else "nao_encontrado"
+        if any(produto.quantidade is None for produto in resolucao.produtos):
+            return "sem_quantidade"
+        if consumo_informado.tipo_rateio is None:
+            return "sem_tipo_rateio"
+        if consumo_informado.tipo_rateio == "plantio" and not resolucao.plantios:
+            return "sem_area"
+        if consumo_informado.tipo_rateio == "propriedade" and not resolucao.propriedades:
+            return "sem_area"
+        if resolucao.ponto_estoque is None or resolucao.safra is None:
+            return "sem_estoque_ou_safra"
+        if consumo_informado.data_assumida or not consumo_informado.data_mencionada:
+            # A data não foi mencionada (a extração assumiu hoje); o agente decide com o histórico da conversa
+            return "sem_data"
+        return None
+
+    @staticmethod
+    def _montar_consumo(resolucao: ResolucaoConsumo) -> Consumo:
+        return Consumo(
+            produtos=[Produto(id=produto.id, quantidade=produto.quantidade) for produto in resolucao.produtos],
+            id_ponto_estoque=resolucao.ponto_estoque.id,
+            id_safra=resolucao.safra.id,
+            data_aplicacao=resolucao.data_aplicacao,
+            tipo_rateio=resolucao.tipo_rateio,
+            ids_plantios=[plantio.id for plantio in resolucao.plantios],
+            ids_propriedades=[propriedade.id for propriedade in resolucao.propriedades],
+            id_responsavel=resolucao.id_responsavel,
+            maquinas=[
+                Maquina(id=maquina.id, horimetro_inicio=maquina.horimetro_inicio, horimetro_fim=maquina.horimetro_fim)
+                for maquina in resolucao.maquinas
+            ]
+        )
+
+    def tentar(self, remetente: DadosRemetente, consumo_informado: ConsumoInformado) -> Optional[Consumo]:
+        """
+        Tenta montar o Consumo diretamente. Retorna None quando é preciso recorrer ao agente.
+        """
+        motivo = None
+        consumo = None
+        try:
+            resolucao = self._resolver.executar(
+                base_url=remetente.base_url, id_produtor=remetente.produtor_id[0], consumo_informado=consumo_informado
+            )
+            motivo = self._motivo_desvio(consumo_informado, resolucao)
+            if motivo is None:
+                consumo = self._montar_consumo(resolucao)
+        except Exception as e:
+            print(f"[CAMINHO RAPIDO ERROR] Falha ao resolver o consumo sem o agente: {e}")
+            motivo = "erro"
+
+        with self._lock:
+            self._tentativas += 1
+            if consumo is not None:
+                self._acertos += 1
+            else:
+                self._motivos_desvio[motivo] = self._motivos_desvio.get(motivo, 0) + 1
+
+        if consumo is not None:
+            print("[CAMINHO RAPIDO] Todas as menções foram resolvidas de forma única. Consumo montado sem o agente.")
+        else:
+            print(f"[CAMINHO RAPIDO] Consumo encaminhado ao agente. Motivo: {motivo}")
+        return consumo
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tentativas": self._tentativas,
+                "caminho_rapido": self._acertos,
+                "agente": self._tentativas - self._acertos,
+                "taxa_acerto": round(self._acertos / self._tentativas, 4) if self._tentativas else 0.0,
+                "motivos_desvio": dict(self._motivos_desvio),
+            }
@@ -0,0 +1,117 @@
+from datetime import date
+from typing import Any, Callable, List, Optional, Tuple
+from src.comunicacao_wpp_ia.aplicacao.dtos.resolucao_consumo import ResolucaoConsumo, ItemResolvido, CandidatoResolucao
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
+from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_ferramentas import RepositorioFerramentas
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_historico_ponto_estoque import RepositorioHistoricoPontoEstoque
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_produtos import IndiceProdutos
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_areas import IndicePlantios, IndicePropriedades
+from src.comunicacao_wpp_ia.dominio.servicos.localizar_maquina import LocalizarMaquinaService
+from src.comunicacao_wpp_ia.dominio.servicos.localizar_ponto_estoque import LocalizarPontoEstoqueService
+from src.comunicacao_wpp_ia.dominio.servicos.localizar_safra import LocalizarSafraService
+from src.comunicacao_wpp_ia.dominio.utilitarios.string import StringUtilidade
+
+class ResolverConsumoInformado:
+    """
+    Caso de uso que resolve, de uma só vez, todas as menções de um ConsumoInformado (produtos, máquinas, áreas,
+    ponto de estoque e safra) contra os catálogos do produtor, indicando para cada uma se o item é único,
+    ambíguo (com os candidatos) ou não foi encontrado.
+    """
+    MAX_CANDIDATOS = 5
+
+    def __init__(self, repositorio_ferramentas: RepositorioFerramentas, historico_ponto_estoque: Optional[RepositorioHistoricoPontoEstoque] = None):
+        self._repositorio = repositorio_ferramentas
+        self._localizar_maquina_service = LocalizarMaquinaService(repositorio_ferramentas)
+        self._localizar_ponto_estoque_service = LocalizarPontoEstoqueService(repositorio_ferramentas, historico_ponto_estoque)
+        self._localizar_safra_service = LocalizarSafraService(repositorio_ferramentas)
+
+    @staticmethod
+    def _nome_plantio(plantio: Plantio) -> str:
+        return f"{plantio.nome} - {plantio.talhao.nome} ({plantio.propriedade.nome})"
+
+    @classmethod
+    def _item(cls, mencao: Optional[str], encontrados: List[Tuple[Any, Optional[float]]], nomear: Callable[[Any], str] = lambda item: item.nome, **dados) -> ItemResolvido:
+        """
+        Monta o resultado de uma menção a partir dos itens encontrados, do mais para o menos similar.
+        É único quando só um item foi encontrado ou quando só um item bate exatamente (score 100) com a menção.
+        """
+        if not encontrados:
+            return ItemResolvido(mencao=mencao, status="nao_encontrado", **dados)
+
+        exatos = [(item, score) for item, score in encontrados if score is not None and score >= 100]
+        unico = encontrados[0] if len(encontrados) == 1 else exatos[0] if len(exatos) == 1 else None
+        if unico:
+            item, _ = unico
+            return ItemResolvido(mencao=mencao, status="unico", id=item.id, nome=nomear(item), **dados)
+
+        candidatos = [CandidatoResolucao(id=item.id, nome=nomear(item), score=round(score, 1) if score is not None else None) for item, score in encontrados[:cls.MAX_CANDIDATOS]]
+        return ItemResolvido(mencao=mencao, status="ambiguo", candidatos=candidatos, **dados)
+
+    def _resolver_produtos(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> List[ItemResolvido]:
+        if not consumo_informado.produtos_mencionados:
+            return []
+        indice = IndiceProdutos.obter(self._repositorio.buscar_produtos_do_produtor(base_url, id_produtor))
+        return [
+            self._item(produto.nome, indice.buscar(produto.nome), quantidade=StringUtilidade.para_numero(produto.quantidade))
+            for produto in consumo_informado.produtos_mencionados
+        ]
+
+    def _resolver_maquinas(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> List[ItemResolvido]:
+        resolvidas = []
+        for maquina in consumo_informado.maquinas_mencionadas or []:
+            encontradas = self._localizar_maquina_service.obter(base_url=base_url, id_produtor=id_produtor, termo_busca=maquina.nome)
+            resolvidas.append(self._item(
+                maquina.nome, [(encontrada, None) for encontrada in encontradas],
+                horimetro_inicio=maquina.horimetro_inicio, horimetro_fim=maquina.horimetro_fim
+            ))
+        return resolvidas
+
+    def _resolver_plantios(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> List[ItemResolvido]:
+        if not (consumo_informado.talhoes_mencionados or consumo_informado.plantios_mencionados):
+            return []
+        indice = IndicePlantios.obter(self._repositorio.buscar_plantios_do_produtor(base_url, id_produtor))
+        resolvidos = [self._item(talhao, indice.buscar_por_talhao(talhao), nomear=self._nome_plantio) for talhao in consumo_informado.talhoes_mencionados or []]
+        resolvidos += [self._item(plantio, indice.buscar_por_plantio(plantio), nomear=self._nome_plantio) for plantio in consumo_informado.plantios_mencionados or []]
+        return resolvidos
+
+    def _resolver_propriedades(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> List[ItemResolvido]:
+        if not consumo_informado.propriedades_mencionadas:
+            return []
+        indice = IndicePropriedades.obter(self._repositorio.buscar_propriedades_do_produtor(base_url, id_produtor))
+        return [self._item(propriedade, indice.buscar(propriedade)) for propriedade in consumo_informado.propriedades_mencionadas]
+
+    def _resolver_ponto_estoque(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> ItemResolvido:
+        mencao = consumo_informado.ponto_estoque_mencionado
+        encontrados = self._localizar_ponto_estoque_service.obter(base_url=base_url, id_produtor=id_produtor, nome_mencionado=mencao)
+        if len(encontrados) > 1 and encontrados[0].empatado:
+            # Empate no score máximo: nenhum é exato o suficiente para ser escolhido sem perguntar
+            return self._item(mencao, [(ponto, None) for ponto in encontrados])
+        if encontrados and encontrados[0].requer_confirmacao:
+            # O mais usado é só um palpite: o usuário confirma, com ele em primeiro entre os pontos ativos
+            return self._item(mencao, [(ponto, None) for ponto in encontrados])
+        return self._item(mencao, [(ponto, 100.0 if ponto.score is None else ponto.score) for ponto in encontrados])
+
+    def _resolver_safra(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado, data_aplicacao: date) -> ItemResolvido:
+        mencao = consumo_informado.safra_mencionada
+        safra = self._localizar_safra_service.obter(base_url=base_url, id_produtor=id_produtor, nome_mencionado=mencao, data_referencia=data_aplicacao)
+        return self._item(mencao, [(safra, None)] if safra else [])
+
+    def executar(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> ResolucaoConsumo:
+        print(f"\n[SERVICE] Resolvendo todas as menções do consumo informado...")
+        data_aplicacao = StringUtilidade.para_data_informada(consumo_informado.data_mencionada) or date.today()
+        tipo_rateio = consumo_informado.tipo_rateio
+
+        resolucao = ResolucaoConsumo(
+            produtos=self._resolver_produtos(base_url, id_produtor, consumo_informado),
+            maquinas=self._resolver_maquinas(base_url, id_produtor, consumo_informado),
+            plantios=self._resolver_plantios(base_url, id_produtor, consumo_informado) if tipo_rateio != "propriedade" else [],
+            propriedades=self._resolver_propriedades(base_url, id_produtor, consumo_informado) if tipo_rateio != "plantio" else [],
+            ponto_estoque=self._resolver_ponto_estoque(base_url, id_produtor, consumo_informado),
+            safra=self._resolver_safra(base_url, id_produtor, consumo_informado, data_aplicacao),
+            tipo_rateio=tipo_rateio,
+            data_aplicacao=data_aplicacao.strftime("%d/%m/%Y"),
+            id_responsavel=consumo_informado.id_responsavel
+        )
+        print(f"[SERVICE] Resolução concluída. Pendências: {[(item.mencao, item.status) for item in resolucao.pendencias()]}")
+        return resolucao
@@ -1,7 +1,8 @@
 import json
-from typing import Tuple
+from typing import Optional, Tuple
 from src.comunicacao_wpp_ia.dominio.objetos.consumo import Consumo
 from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_consumo import RepositorioConsumo
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_historico_ponto_estoque import RepositorioHistoricoPontoEstoque
 
 class SalvarConsumo:
     """
@@ -10,8 +11,9 @@ class SalvarConsumo:
     o resultado bruto da API.
     """
 
-    def __init__(self, repositorio: RepositorioConsumo):
+    def __init__(self, repositorio: RepositorioConsumo, historico_ponto_estoque: Optional[RepositorioHistoricoPontoEstoque] = None):
         self.repositorio = repositorio
+        self.historico_ponto_estoque = historico_ponto_estoque
 
     def executar(self, base_url: str, produtor_id: int, consumo: Consumo) -> Tuple[int, str]:
         """
@@ -51,4 +53,6 @@ class SalvarConsumo:
             mensagem_final = resposta.mensagem
 
         print(f"[SAVER] Resultado da API: StatusCode={resposta.status}, Mensagem='{mensagem_final}'")
+        if resposta.status == 200 and self.historico_ponto_estoque:
+            self.historico_ponto_estoque.registrar_uso(base_url, produtor_id, consumo.id_ponto_estoque)
         return resposta.status, mensagem_final
@@ -9,22 +9,30 @@ from src.comunicacao_wpp_ia.aplicacao.servicos.remetente.validador_intencao_usua
 from src.comunicacao_wpp_ia.aplicacao.portas.pre_processamento_texto import ServicoPreProcessamento
 from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
 from src.comunicacao_wpp_ia.aplicacao.dtos.mensagem_recebida import MensagemRecebida
+from src.comunicacao_wpp_ia.aplicacao.dtos.validacao_intencao import ValidacaoIntencao
 from src.comunicacao_wpp_ia.dominio.objetos.consumo import Consumo
 from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.verificar_consumo_montado import verificar_dados_consumo
 from src.comunicacao_wpp_ia.aplicacao.servicos.remetente.obter_remetente import ObterRemetente
+from src.comunicacao_wpp_ia.aplicacao.servicos.catalogo.pre_carregar_catalogos import PreCarregarCatalogos
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.caminho_rapido_consumo import CaminhoRapidoConsumo
 from src.comunicacao_wpp_ia.dominio.servicos.responsavel.obter_responsavel import ObterResponsavel
 
 from src.comunicacao_wpp_ia.dominio.excecoes.excecoes import MultiplosProdutoresError, NenhumProdutorEncontradoError
 
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_ferramentas import RepoAgriwinFerramentas
 from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.rastro_mensagem import RastroMensagem
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.clientes_api.agriwin_cliente import AgriwinCliente
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
 class ServicoConversa:
     """
     Serviço de aplicação responsável por orquestrar o fluxo de uma conversa.
     """
-    def __init__(self, memoria: ServicoMemoriaConversa, llm: ServicoLLM, obter_remetente_service: ObterRemetente, obter_responsavel_service: ObterResponsavel, salvar_consumo_service: SalvarConsumo, pre_processador: ServicoPreProcessamento, whatsapp: Whatsapp, agriwin_cliente: AgriwinCliente):    
+    def __init__(self, memoria: ServicoMemoriaConversa, llm: ServicoLLM, obter_remetente_service: ObterRemetente, obter_responsavel_service: ObterResponsavel, salvar_consumo_service: SalvarConsumo, pre_processador: ServicoPreProcessamento, whatsapp: Whatsapp, agriwin_cliente: AgriwinCliente, pre_carregar_catalogos: Optional[PreCarregarCatalogos] = None, caminho_rapido_consumo: Optional[CaminhoRapidoConsumo] = None, reescrever_verificacao_com_llm: bool = False, modo_extracao: str = "combinada"):
         self._memoria = memoria
         self._llm = llm
         self._obter_remetente_service = obter_remetente_service
@@ -34,6 +42,17 @@ class ServicoConversa:
         self._whatsapp = whatsapp
         self._agriwin_cliente = agriwin_cliente
         self._obter_responsavel_service = obter_responsavel_service
+        self._pre_carregar_catalogos = pre_carregar_catalogos
+        self._caminho_rapido_consumo = caminho_rapido_consumo
+        self._reescrever_verificacao_com_llm = reescrever_verificacao_com_llm
+        # 'combinada': intenção e extração em uma única chamada ao LLM; 'paralela': as duas chamadas ao mesmo tempo,
+        # descartando a extração se a intenção for rejeitada; 'separada': duas chamadas sequenciais
+        self._modo_extracao = modo_extracao
+        self._executor_especulativo = ThreadPoolExecutor(thread_name_prefix="extracao-especulativa") if modo_extracao == "paralela" else None
+        self._lock_estatisticas = threading.Lock()
+        self._extracoes_especulativas = 0
+        self._extracoes_descartadas = 0
+        self._tokens_descartados_estimados = 0
 
     def _encerrar_conversa(self, telefone: str, mensagem_erro: str):
         """
@@ -46,9 +65,12 @@ class ServicoConversa:
     def processar_mensagem_recebida(self, mensagem_recebida: MensagemRecebida):
         """
         Ponto de entrada principal. Orquestra a busca do remetente, pré-processamento
-        e o fluxo de conversação.
+        e o fluxo de conversação, registrando as chamadas ao LLM no rastro da mensagem.
         """
-        
+        with RastroMensagem.iniciar(mensagem_recebida.telefone_formatado):
+            self._processar_mensagem_recebida(mensagem_recebida)
+
+    def _processar_mensagem_recebida(self, mensagem_recebida: MensagemRecebida):
         try:
             remetente = self._obter_remetente_service.executar(telefone=mensagem_recebida.telefone_formatado)
         except (ValueError, NenhumProdutorEncontradoError):
@@ -71,6 +93,10 @@ class ServicoConversa:
             self._memoria.limpar_memoria_conversa(mensagem_recebida.telefone_formatado)
             self._encerrar_conversa(mensagem_recebida.telefone_remetente, mensagem_final)
             return 
+
+        # Com o produtor conhecido, os catálogos são carregados em segundo plano enquanto o texto é processado pelas LLMs
+        if self._pre_carregar_catalogos:
+            self._pre_carregar_catalogos.executar(remetente)
         
         conteudo_texto = self._pre_processador.processar(mensagem_recebida)
         if not conteudo_texto:
@@ -90,12 +116,24 @@ class ServicoConversa:
         estado_conversa = self._memoria.obter_estado(remetente.numero_telefone)
         historico = estado_conversa["historico"]
 
-        # Etapa 0: Validar intenção
-        if not self._validar_intencao(mensagem, historico, remetente.numero_telefone):
-            return
+        if self._modo_extracao == "combinada":
+            # Etapas 0 e 1 em uma única chamada: validar intenção e extrair dados
+            validacao, resultado_construcao = self._fabrica_consumo_informado.criar_de_mensagem_validando_intencao(mensagem, historico)
+            if not self._tratar_validacao_intencao(validacao, remetente.numero_telefone):
+                return
+        elif self._modo_extracao == "paralela":
+            # Etapas 0 e 1 em paralelo: a extração é especulativa e descartada se a intenção for rejeitada
+            intencao_valida, resultado_construcao = self._validar_e_extrair_em_paralelo(mensagem, historico, remetente.numero_telefone)
+            if not intencao_valida:
+                return
+        else:
+            # Etapa 0: Validar intenção
+            if not self._validar_intencao(mensagem, historico, remetente.numero_telefone):
+                return
+
+            # Etapa 1: Extrair dados e checar se faltam informações
+            resultado_construcao = self._fabrica_consumo_informado.criar_de_mensagem(mensagem, historico)
 
-        # Etapa 1: Extrair dados e checar se faltam informações
-        resultado_construcao = self._fabrica_consumo_informado.criar_de_mensagem(mensagem, historico)
         if isinstance(resultado_construcao, str):
             self._responder_e_salvar_historico(remetente.numero_telefone, mensagem, resultado_construcao, historico)
             return
@@ -119,9 +157,45 @@ class ServicoConversa:
                 consumo_montado = resultado_builder
                 self._salvar_consumo(remetente, mensagem, consumo_montado, historico)
 
+    def _validar_e_extrair_em_paralelo(self, mensagem: str, historico: list, telefone: str) -> Tuple[bool, Any]:
+        """
+        Dispara a extração do consumo em segundo plano enquanto valida a intenção, de modo que a latência
+        seja a da chamada mais lenta e não a soma das duas.
+        """
+        # O contexto é copiado para que a extração seja registrada no rastro desta mensagem
+        futuro_extracao = self._executor_especulativo.submit(
+            contextvars.copy_context().run, self._fabrica_consumo_informado.criar_de_mensagem, mensagem, historico
+        )
+        with self._lock_estatisticas:
+            self._extracoes_especulativas += 1
+
+        if self._validar_intencao(mensagem, historico, telefone):
+            return True, futuro_extracao.result()
+
+        # Se a extração ainda não começou, é cancelada sem custo; senão, seus tokens foram gastos à toa
+        if not futuro_extracao.cancel():
+            tokens_estimados = self._fabrica_consumo_informado.estimar_tokens_extracao(mensagem, historico)
+            with self._lock_estatisticas:
+                self._extracoes_descartadas += 1
+                self._tokens_descartados_estimados += tokens_estimados
+            print(f"[SERVICO CONVERSA] Extração especulativa descartada (~{tokens_estimados} tokens de entrada).")
+        return False, None
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock_estatisticas:
+            return {
+                "modo_extracao": self._modo_extracao,
+                "extracoes_especulativas": self._extracoes_especulativas,
+                "extracoes_descartadas": self._extracoes_descartadas,
+                "tokens_descartados_estimados": self._tokens_descartados_estimados,
+            }
+
     def _validar_intencao(self, mensagem: str, historico: list, telefone: str) -> bool:
         validar_intencao_do_usuario = ValidadorIntencaoUsuario(self._llm)
         resultado_validacao = validar_intencao_do_usuario.executar(mensagem, historico)
+        return self._tratar_validacao_intencao(resultado_validacao, telefone)
+
+    def _tratar_validacao_intencao(self, resultado_validacao: ValidacaoIntencao, telefone: str) -> bool:
         if not resultado_validacao.intencao_valida:
             print("\n--- RESULTADO FINAL (INTENÇÃO MALICIOSA/INVÁLIDA) ---")
             resposta_usuario = resultado_validacao.justificativa or "Desculpe, só posso processar registros de consumo. Para outras solicitações, entre em contato com o suporte."
@@ -135,7 +209,7 @@ class ServicoConversa:
         Invoca o ConsumoBuilder para coletar todos os IDs e montar o objeto final.
         Retorna um Consumo em caso de sucesso ou uma string (pergunta) em caso de ambiguidade.
         """
-        builder_consumo = ConsumoBuilder(self._llm)
+        builder_consumo = ConsumoBuilder(self._llm, caminho_rapido=self._caminho_rapido_consumo)
         return builder_consumo.executar(remetente, mensagem, consumo_informado, historico)
     
     def _responder_e_salvar_historico(self, telefone: str, mensagem_usuario: str, resposta_assistente: str, historico: list):
@@ -145,7 +219,8 @@ class ServicoConversa:
         self._memoria.salvar_estado(telefone, historico)
     
     def _salvar_consumo(self, remetente: DadosRemetente, mensagem: str, consumo_montado: Consumo, historico: list):
-        resultado_verificacao = verificar_dados_consumo(consumo_montado, self._llm)
+        # As regras são verificadas sem LLM; ele só é usado, se habilitado, para redigir a mensagem de reprovação
+        resultado_verificacao = verificar_dados_consumo(consumo_montado, self._llm if self._reescrever_verificacao_com_llm else None)
         if not resultado_verificacao.aprovado:
             print(f"\n--- RESULTADO FINAL (DADOS INCONSISTENTES) ---")
             resposta_usuario = resultado_verificacao.justificativa
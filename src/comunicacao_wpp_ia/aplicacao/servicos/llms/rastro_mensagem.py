@@ -0,0 +1,59 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Rastro da mensagem em processamento; as threads auxiliares precisam copiar o contexto para enxergá-lo
+_rastro_atual: ContextVar[Optional["RastroMensagem"]] = ContextVar("rastro_mensagem_atual", default=None)
+
+class RastroMensagem:
+    """
+    Rastro das chamadas ao LLM feitas durante o processamento de uma mensagem: cada etapa (intenção, extração,
+    agente construtor, verificador) registra latência, tokens, iterações e ferramentas chamadas.
+    O telefone do remetente não entra no rastro: ele é identificado por um hash truncado, suficiente para
+    correlacionar as linhas do log sem expor o número.
+    """
+    def __init__(self, telefone: str):
+        self.remetente = hashlib.sha256(telefone.encode("utf-8")).hexdigest()[:12]
+        self._inicio = time.monotonic()
+        self._iniciado_em = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._lock = threading.Lock()
+        self._etapas: List[Dict[str, Any]] = []
+
+    @classmethod
+    @contextmanager
+    def iniciar(cls, telefone: str):
+        """Abre o rastro da mensagem; ao sair, o resumo é impresso."""
+        rastro = cls(telefone)
+        token = _rastro_atual.set(rastro)
+        try:
+            yield rastro
+        finally:
+            _rastro_atual.reset(token)
+            resumo = rastro.resumo()
+            print(f"[RASTRO LLM] {resumo['remetente']}: {len(resumo['etapas'])} chamadas, {resumo['latencia_llm_ms']} ms no LLM, "
+                  f"{resumo['tokens_prompt']}+{resumo['tokens_completion']} tokens, total {resumo['duracao_ms']} ms.")
+
+    @staticmethod
+    def registrar(**dados: Any):
+        """Acrescenta uma etapa ao rastro da mensagem atual (ignorado fora do processamento de uma mensagem)."""
+        rastro = _rastro_atual.get()
+        if rastro is None:
+            return
+        with rastro._lock:
+            rastro._etapas.append(dados)
+
+    def resumo(self) -> Dict[str, Any]:
+        with self._lock:
+            etapas = list(self._etapas)
+        return {
+            "remetente": self.remetente,
+            "iniciado_em": self._iniciado_em,
+            "duracao_ms": round((time.monotonic() - self._inicio) * 1000, 1),
+            "latencia_llm_ms": round(sum(etapa.get("latencia_ms", 0) for etapa in etapas), 1),
+            "tokens_prompt": sum(etapa.get("tokens_prompt", 0) for etapa in etapas),
+            "tokens_completion": sum(etapa.get("tokens_completion", 0) for etapa in etapas),
+            "etapas": etapas,
+        }
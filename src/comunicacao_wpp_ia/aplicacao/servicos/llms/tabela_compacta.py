@@ -0,0 +1,72 @@
+import threading
+from typing import Any, Dict, List
+from src.comunicacao_wpp_ia.dominio.utilitarios.tokens import TokensUtilidade
+
+class TabelaCompacta:
+    """
+    Codifica as listas devolvidas pelas ferramentas do agente em formato tabular compacto: o cabeçalho uma vez
+    e uma linha por item, com colunas separadas por '|'. A saída respeita um teto de tokens estimados, pois
+    o resultado de cada ferramenta é reenviado ao modelo em todas as iterações seguintes do agente.
+    Mantém contadores dos tokens economizados em relação ao JSON completo que as ferramentas devolviam.
+    """
+    def __init__(self, max_tokens: int = 600):
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._chamadas = 0
+        self._tokens_enviados = 0
+        self._tokens_json_completo = 0
+        self._linhas_omitidas = 0
+
+    @staticmethod
+    def _celula(valor: Any) -> str:
+        if valor is None:
+            return ""
+        if isinstance(valor, float):
+            return f"{valor:g}"
+        return str(valor).replace("|", "/").replace("\n", " ")
+
+    def codificar(self, colunas: List[str], linhas: List[List[Any]], tokens_json_completo: int) -> str:
+        """
+        Monta a tabela com as linhas que couberem no teto de tokens, na ordem recebida (as melhores primeiro).
+
+        Args:
+            colunas: Os nomes das colunas.
+            linhas: Os valores de cada linha, na ordem das colunas.
+            tokens_json_completo: Os tokens estimados da resposta em JSON completo que a ferramenta devolveria,
+                para a contagem da economia (calculados uma vez por catálogo por quem chama).
+        """
+        partes = ["|".join(colunas)]
+        orcamento = TokensUtilidade.caracteres(self.max_tokens) - len(partes[0])
+        for linha in linhas:
+            texto = "|".join(self._celula(valor) for valor in linha)
+            if len(texto) + 1 > orcamento:
+                break
+            partes.append(texto)
+            orcamento -= len(texto) + 1
+
+        omitidas = len(linhas) - (len(partes) - 1)
+        if not linhas:
+            partes.append("(nenhum item encontrado)")
+        elif omitidas:
+            partes.append(f"... +{omitidas} itens omitidos; informe os nomes mencionados para refinar a busca")
+
+        saida = "\n".join(partes)
+        tokens_enviados = TokensUtilidade.estimar(saida)
+        with self._lock:
+            self._chamadas += 1
+            self._tokens_enviados += tokens_enviados
+            self._tokens_json_completo += tokens_json_completo
+            self._linhas_omitidas += omitidas
+        return saida
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        # Os dois lados são contados pela mesma estimativa de caracteres por token, sobre os textos de fato gerados
+        with self._lock:
+            return {
+                "max_tokens": self.max_tokens,
+                "chamadas": self._chamadas,
+                "tokens_enviados_estimados": self._tokens_enviados,
+                "tokens_json_completo_estimados": self._tokens_json_completo,
+                "tokens_economizados_estimados": max(self._tokens_json_completo - self._tokens_enviados, 0),
+                "linhas_omitidas": self._linhas_omitidas,
+            }
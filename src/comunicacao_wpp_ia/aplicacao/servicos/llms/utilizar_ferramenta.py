@@ -1,9 +1,10 @@
 import json
 from datetime import date
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from src.comunicacao_wpp_ia.aplicacao.portas.ferramentas import Ferramentas
 from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_ferramentas import RepositorioFerramentas
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_historico_ponto_estoque import RepositorioHistoricoPontoEstoque
 from src.comunicacao_wpp_ia.dominio.servicos.localizar_produto import LocalizarProdutoService
 from src.comunicacao_wpp_ia.dominio.servicos.localizar_talhao import LocalizarTalhaoService
 from src.comunicacao_wpp_ia.dominio.servicos.localizar_plantio import LocalizarPlantioService
@@ -11,25 +12,36 @@ from src.comunicacao_wpp_ia.dominio.servicos.localizar_propriedade import Locali
 from src.comunicacao_wpp_ia.dominio.servicos.localizar_maquina import LocalizarMaquinaService
 from src.comunicacao_wpp_ia.dominio.servicos.localizar_ponto_estoque import LocalizarPontoEstoqueService
 from src.comunicacao_wpp_ia.dominio.servicos.localizar_safra import LocalizarSafraService
+from src.comunicacao_wpp_ia.dominio.utilitarios.string import StringUtilidade
+from src.comunicacao_wpp_ia.dominio.utilitarios.tokens import TokensUtilidade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import CatalogoIndexado
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.resolver_consumo_informado import ResolverConsumoInformado
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.tabela_compacta import TabelaCompacta
+from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
 
 class UtilizarFerramenta(Ferramentas):
     """
     Esta classe contém a lógica de negócio real de cada ferramenta, orquestrando os serviços de domínio para obter os dados necessários.
     """
-    def __init__(self, repositorio_ferramentas: RepositorioFerramentas):
+    def __init__(self, repositorio_ferramentas: RepositorioFerramentas, historico_ponto_estoque: Optional[RepositorioHistoricoPontoEstoque] = None, tabela_compacta: Optional[TabelaCompacta] = None):
         """
         Inicializa o serviço de ferramentas injetando as dependências necessárias.
 
         Args:
             repositorio_ferramentas: O repositório que provê acesso aos dados.
+            historico_ponto_estoque: O histórico de uso dos pontos de estoque, para sugerir o mais usado (opcional).
+            tabela_compacta: O codificador das respostas das ferramentas de áreas, com o seu teto de tokens (opcional).
         """
+        self._tabela_compacta = tabela_compacta or TabelaCompacta()
         self._localizar_produto_service = LocalizarProdutoService(repositorio_ferramentas)
         self._localizar_talhao_service = LocalizarTalhaoService(repositorio_ferramentas)
         self._localizar_plantio_service = LocalizarPlantioService(repositorio_ferramentas)
         self._localizar_propriedade_service = LocalizarPropriedadeService(repositorio_ferramentas)
         self._localizar_maquina_service = LocalizarMaquinaService(repositorio_ferramentas)
-        self._localizar_ponto_estoque_service = LocalizarPontoEstoqueService(repositorio_ferramentas)
+        self._localizar_ponto_estoque_service = LocalizarPontoEstoqueService(repositorio_ferramentas, historico_ponto_estoque)
         self._localizar_safra_service = LocalizarSafraService(repositorio_ferramentas)
+        self._resolver_consumo_informado = ResolverConsumoInformado(repositorio_ferramentas, historico_ponto_estoque)
 
     def buscar_produto_por_nome(self, base_url: str, id_produtor: str, nome_produto: str) -> Dict[str, Any]:
         """
@@ -43,32 +55,65 @@ class UtilizarFerramenta(Ferramentas):
         )
         return serializar_para_json(resultado)
 
-    def buscar_talhoes_disponiveis(self, base_url: str, id_produtor: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _tokens_json_completo(todos: List[Any]) -> int:
         """
-        Busca todos os plantios através dos talhões disponíveis para o produtor.
+        Tokens estimados do JSON completo que as ferramentas de áreas devolviam (todos os itens, com os objetos
+        aninhados). O catálogo é serializado uma única vez e o resultado fica guardado junto com ele no cache.
+        """
+        return CatalogoIndexado.calcular_uma_vez(
+            todos, "tokens_json_completo", lambda itens: TokensUtilidade.estimar(json.dumps(serializar_para_json(itens))) if itens else 0
+        )
 
-        Invoca o serviço de domínio e retorna a lista de plantios serializada.
+    def _tabela_plantios(self, todos: List[Plantio], candidatos: List[Tuple[Plantio, Optional[float]]]) -> str:
+        linhas = [
+            [plantio.id, plantio.nome, plantio.talhao.nome, plantio.talhao.area_ha, plantio.propriedade.nome, None if score is None else round(score)]
+            for plantio, score in candidatos
+        ]
+        return self._tabela_compacta.codificar(["id", "plantio", "talhao", "area_ha", "propriedade", "score"], linhas, self._tokens_json_completo(todos))
+
+    def buscar_talhoes_disponiveis(self, base_url: str, id_produtor: str, nomes_talhoes: Optional[List[str]] = None) -> str:
         """
-        resultados = self._localizar_talhao_service.obter(base_url=base_url,id_produtor=id_produtor)
-        return serializar_para_json(resultados)
+        Busca os plantios através dos talhões do produtor.
+
+        Com os nomes mencionados, retorna apenas os candidatos mais similares; sem eles, todos os plantios.
+        O resultado é uma tabela compacta limitada pelo teto de tokens.
+        """
+        todos = self._localizar_talhao_service.obter(base_url=base_url, id_produtor=id_produtor)
+        candidatos = (
+            self._localizar_talhao_service.obter_candidatos(base_url=base_url, id_produtor=id_produtor, nomes_mencionados=nomes_talhoes)
+            if nomes_talhoes else [(plantio, None) for plantio in todos]
+        )
+        return self._tabela_plantios(todos, candidatos)
     
-    def buscar_plantios_disponiveis(self, base_url: str, id_produtor: str) -> List[Dict[str, Any]]:
+    def buscar_plantios_disponiveis(self, base_url: str, id_produtor: str, nomes_plantios: Optional[List[str]] = None) -> str:
         """
-        Busca todos os plantios através disponíveis para o produtor.
+        Busca os plantios do produtor.
 
-        Invoca o serviço de domínio e retorna a lista de plantios serializada.
+        Com os nomes mencionados, retorna apenas os candidatos mais similares; sem eles, todos os plantios.
+        O resultado é uma tabela compacta limitada pelo teto de tokens.
         """
-        resultados = self._localizar_plantio_service.obter(base_url=base_url,id_produtor=id_produtor)
-        return serializar_para_json(resultados)
+        todos = self._localizar_plantio_service.obter(base_url=base_url, id_produtor=id_produtor)
+        candidatos = (
+            self._localizar_plantio_service.obter_candidatos(base_url=base_url, id_produtor=id_produtor, nomes_mencionados=nomes_plantios)
+            if nomes_plantios else [(plantio, None) for plantio in todos]
+        )
+        return self._tabela_plantios(todos, candidatos)
     
-    def buscar_propriedades_disponiveis(self, base_url: str, id_produtor: str) -> List[Dict[str, Any]]:
+    def buscar_propriedades_disponiveis(self, base_url: str, id_produtor: str, nomes_propriedades: Optional[List[str]] = None) -> str:
         """
-        Busca todas as propriedades disponíveis para o produtor.
+        Busca as propriedades do produtor.
 
-        Invoca o serviço de domínio e retorna a lista de propriedades serializada.
+        Com os nomes mencionados, retorna apenas os candidatos mais similares; sem eles, todas as propriedades.
+        O resultado é uma tabela compacta limitada pelo teto de tokens.
         """
-        resultados = self._localizar_propriedade_service.obter(base_url=base_url,id_produtor=id_produtor)
-        return serializar_para_json(resultados)
+        todas = self._localizar_propriedade_service.obter(base_url=base_url, id_produtor=id_produtor)
+        candidatos = (
+            self._localizar_propriedade_service.obter_candidatos(base_url=base_url, id_produtor=id_produtor, nomes_mencionados=nomes_propriedades)
+            if nomes_propriedades else [(propriedade, None) for propriedade in todas]
+        )
+        linhas = [[propriedade.id, propriedade.nome, None if score is None else round(score)] for propriedade, score in candidatos]
+        return self._tabela_compacta.codificar(["id", "propriedade", "score"], linhas, self._tokens_json_completo(todas))
 
     def buscar_maquinas_disponiveis(self, base_url: str, id_produtor: str, nome_maquina: str) -> List[Dict[str, Any]]:
         """
@@ -94,19 +139,32 @@ class UtilizarFerramenta(Ferramentas):
         )
         return serializar_para_json(resultado)
     
-    def buscar_safra_disponivel(self, base_url: str, id_produtor: str, nome_safra: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def buscar_safra_disponivel(self, base_url: str, id_produtor: str, nome_safra: Optional[str] = None, data_aplicacao: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Busca uma safra, opcionalmente filtrando por um nome.
+        Sem nome, usa a data da aplicação (quando informada) para encontrar a safra ativa.
 
         Invoca o serviço de domínio para localizar a safra e retorna o resultado
         serializado.
         """
         resultado = self._localizar_safra_service.obter(
-            base_url=base_url,id_produtor=id_produtor, nome_mencionado=nome_safra
+            base_url=base_url,id_produtor=id_produtor, nome_mencionado=nome_safra,
+            data_referencia=StringUtilidade.para_data_informada(data_aplicacao)
         )
         return json.dumps(resultado.model_dump() if resultado else None, default=json_converter)
 
     
+    def resolver_itens_do_consumo(self, base_url: str, id_produtor: str, consumo_informado: ConsumoInformado) -> Dict[str, Any]:
+        """
+        Resolve, em uma única chamada, todas as menções do consumo informado contra os catálogos do produtor.
+
+        Retorna a resolução serializada, sem os campos vazios, para manter a resposta compacta.
+        """
+        resultado = self._resolver_consumo_informado.executar(
+            base_url=base_url, id_produtor=id_produtor, consumo_informado=consumo_informado
+        )
+        return resultado.model_dump(mode='json', exclude_none=True, exclude_defaults=True)
+
     def solicitar_esclarecimento_ao_usuario(self, pergunta: str) -> str:
         """
         Implementação da ferramenta de esclarecimento. Simplesmente retorna a pergunta.
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from src.comunicacao_wpp_ia.aplicacao.dtos.validacao_intencao import ValidacaoIntencao
 from src.comunicacao_wpp_ia.aplicacao.portas.llms import ServicoLLM
 
@@ -6,7 +6,8 @@ class ValidadorIntencaoUsuario:
     def __init__(self, llm: ServicoLLM):
         self._llm = llm
 
-    def __obter_prompt_sistema(self) -> str:
+    @staticmethod
+    def obter_prompt_sistema() -> str:
         prompt_base = """
             Você é um assistente de segurança rigoroso. Sua função é analisar a mensagem de um usuário para determinar se a intenção é válida para o fluxo de **registrar um consumo agrícola**.
 
@@ -31,14 +32,27 @@ class ValidadorIntencaoUsuario:
         
         return prompt_base
 
-    def __obter_mensagem_usuario(self, mensagem_usuario: str, historico: List[Dict]) -> str:
-        historico_formatado = "\n".join(f"{m['role']}: {m['content']}" for m in historico)
-        return f"""
+    @staticmethod
+    def validar_resposta_curta(mensagem_usuario: str, historico: List[Dict]) -> Optional[ValidacaoIntencao]:
+        """
+        Se a mensagem for muito curta e o histórico não estiver vazio, é provável que seja uma resposta
+        a uma pergunta do assistente, e a validação por LLM é pulada para economizar custos e tempo.
+        Retorna None quando a mensagem precisa passar pelo LLM.
+        """
+        if historico and len(mensagem_usuario.split()) <= 5:
+            print("[SECURITY] Mensagem curta recebida em conversa ativa. Assumindo como resposta válida.")
+            return ValidacaoIntencao(intencao_valida=True, justificativa="Resposta curta em conversa existente.")
+        return None
+
+    @staticmethod
+    def __obter_mensagem_usuario() -> str:
+        # Histórico e mensagem entram como variáveis do template, para que a cadeia do LLM seja reaproveitada entre as mensagens
+        return """
             Histórico da Conversa:
-            {historico_formatado}
+            {historico}
             
             Nova Mensagem do Usuário: 
-            '{mensagem_usuario}'
+            '{mensagem}'
         """
 
     def executar(self, mensagem_usuario: str, historico: List[Dict]) -> ValidacaoIntencao:
@@ -50,20 +64,17 @@ class ValidadorIntencaoUsuario:
         Retorna um objeto ValidacaoIntencao.
         """
         print("\n--- ETAPA 0: Validando a Intenção do Usuário (com Contexto) ---")
-        
-        # Se a mensagem for muito curta e o histórico não estiver vazio,
-        # é provável que seja uma resposta. Podemos até pular a validação por LLM aqui para economizar custos e tempo.
-        if historico and len(mensagem_usuario.split()) <= 5:
-            print("[SECURITY] Mensagem curta recebida em conversa ativa. Assumindo como resposta válida.")
-            return ValidacaoIntencao(intencao_valida=True, justificativa="Resposta curta em conversa existente.")
-        
-        prompt_sistema = self.__obter_prompt_sistema()
-        prompt_usuario = self.__obter_mensagem_usuario(mensagem_usuario, historico)
-        dados = {"mensagem": prompt_usuario}
-        if historico:
-            dados["historico"] = historico
 
-        agente = self._llm.criar_agente(prompt_sistema, prompt_usuario, ValidacaoIntencao) 
+        resposta_curta = self.validar_resposta_curta(mensagem_usuario, historico)
+        if resposta_curta:
+            return resposta_curta
+
+        prompt_sistema = self.obter_prompt_sistema()
+        prompt_usuario = self.__obter_mensagem_usuario()
+        historico_formatado = "\n".join(f"{m['role']}: {m['content']}" for m in historico)
+        dados = {"mensagem": mensagem_usuario, "historico": historico_formatado}
+
+        agente = self._llm.criar_agente(prompt_sistema, prompt_usuario, ValidacaoIntencao, etapa="intencao")
         resultado_validacao = agente.executar(dados)
         
         if not resultado_validacao.intencao_valida:
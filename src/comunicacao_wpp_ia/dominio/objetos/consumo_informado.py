@@ -1,5 +1,5 @@
 from typing import Optional, Literal, List, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import date
 
 class ProdutoInformado(BaseModel):
@@ -27,4 +27,16 @@ class ConsumoInformado(BaseModel):
     ponto_estoque_mencionado: Optional[str] = Field(default=None, description="O nome do ponto de estoque de onde os produtos saíram.")
     data_mencionada: Optional[Union[str, date]] = Field(default=None, description="A data da aplicação em texto (ex: 'ontem', 'dia 20', '20/07', 20 de julho).")
     safra_mencionada: Optional[str] = Field(default=None, description="O nome da safra para a qual o consumo deve ser alocado (ex: 'safra de soja').")
-    id_responsavel: Optional[str] = Field(default=None, description="O ID do responsável pelo registro, identificado pelo número de telefone.")
\ No newline at end of file
+    id_responsavel: Optional[str] = Field(default=None, description="O ID do responsável pelo registro, identificado pelo número de telefone.")
+
+    # Fora do schema da extração: indica que a data não foi mencionada e que a data de hoje foi assumida
+    _data_assumida: bool = PrivateAttr(default=False)
+
+    @property
+    def data_assumida(self) -> bool:
+        return self._data_assumida
+
+    def assumir_data_de_hoje(self):
+        """Preenche a data da aplicação com a data de hoje, registrando que ela não foi mencionada."""
+        self.data_mencionada = date.today()
+        self._data_assumida = True
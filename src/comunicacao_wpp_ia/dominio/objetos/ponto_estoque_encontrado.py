@@ -0,0 +1,16 @@
+from typing import Optional
+from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
+
+class PontoEstoqueEncontrado(PontoEstoque):
+    """
+    Ponto de estoque retornado pela busca, com o score e o critério que o selecionou.
+    - criterio: 'similaridade', 'unico', 'unico_ativo', 'mais_usado' ou 'alternativa' (outro ponto ativo oferecido
+      junto com o mais usado).
+    - empatado: True quando outro ponto obteve o mesmo score máximo e o usuário precisa escolher.
+    - requer_confirmacao: True quando o ponto é só uma sugestão (o mais usado e suas alternativas) e o usuário precisa
+      confirmar qual usar.
+    """
+    score: Optional[float] = None
+    criterio: str = "similaridade"
+    empatado: bool = False
+    requer_confirmacao: bool = False
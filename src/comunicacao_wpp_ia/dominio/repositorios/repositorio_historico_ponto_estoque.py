@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class RepositorioHistoricoPontoEstoque(ABC):
+    """
+    Define a interface do repositório que guarda quais pontos de estoque cada produtor usa nos consumos salvos.
+    """
+    @abstractmethod
+    def registrar_uso(self, base_url: str, id_produtor: str, id_ponto_estoque: str):
+        """
+        Contabiliza um consumo salvo com o ponto de estoque informado.
+        """
+        pass
+
+    @abstractmethod
+    def mais_usado(self, base_url: str, id_produtor: str) -> Optional[str]:
+        """
+        Retorna o id do ponto de estoque mais usado pelo produtor, ou None se não houver histórico ou houver empate.
+        """
+        pass
@@ -0,0 +1,67 @@
+from typing import List, Tuple
+from src.comunicacao_wpp_ia.dominio.objetos.consumo import Consumo
+
+class ValidadorConsumoMontado:
+    """
+    Serviço de domínio que valida, sem LLM, se o Consumo montado (com os IDs já encontrados) pode ser salvo.
+    Um ID faltando significa que a informação foi mencionada, mas não foi encontrada na base de dados,
+    por isso as mensagens pedem ao usuário que revise e informe o dado novamente.
+    """
+
+    _mapa_mensagens = {
+        "produtos": "Não foi possível identificar o produto mencionado.",
+        "quantidade": "Não foi possível identificar a quantidade utilizada do produto.",
+        "id_ponto_estoque": "Não foi possível identificar o estoque de onde os produtos saíram.",
+        "id_safra": "Não foi possível identificar a safra do consumo.",
+        "data_aplicacao": "Não foi possível identificar a data da aplicação.",
+        "tipo_rateio": "Não foi possível identificar onde foi feita a aplicação (talhão, plantio ou propriedade).",
+        "plantio": "Não foi possível identificar o plantio mencionado.",
+        "propriedade": "Não foi possível identificar a propriedade mencionada.",
+    }
+
+    _pedido_revisao = "Poderia revisar e me informar novamente?"
+
+    @classmethod
+    def validar(cls, consumo: Consumo) -> Tuple[bool, List[str]]:
+        """
+        Verifica as regras obrigatórias do consumo montado.
+
+        Returns:
+            Uma tupla contendo:
+            - Um booleano (True se válido, False se inválido).
+            - Uma lista com as mensagens correspondentes aos problemas encontrados.
+        """
+        problemas = []
+
+        # 1. Produtos: ao menos um, todos com ID e quantidade maior que zero
+        if not consumo.produtos or any(not produto.id for produto in consumo.produtos):
+            problemas.append(cls._mapa_mensagens["produtos"])
+        elif any(not produto.quantidade for produto in consumo.produtos):
+            problemas.append(cls._mapa_mensagens["quantidade"])
+
+        # 2. Campos obrigatórios
+        for campo in ("id_ponto_estoque", "id_safra", "data_aplicacao"):
+            if not getattr(consumo, campo):
+                problemas.append(cls._mapa_mensagens[campo])
+
+        # 3. Local da aplicação de acordo com o tipo de rateio
+        if consumo.tipo_rateio == "propriedade":
+            if not consumo.ids_propriedades:
+                problemas.append(cls._mapa_mensagens["propriedade"])
+        elif consumo.tipo_rateio in ("plantio", "talhao"):
+            if not consumo.ids_plantios:
+                problemas.append(cls._mapa_mensagens["plantio"])
+        else:
+            problemas.append(cls._mapa_mensagens["tipo_rateio"])
+
+        if problemas:
+            return False, problemas
+
+        return True, []
+
+    @classmethod
+    def montar_mensagem(cls, problemas: List[str]) -> str:
+        """
+        Agrupa os problemas encontrados em uma única mensagem amigável para o usuário.
+        """
+        return " ".join(problemas + [cls._pedido_revisao])
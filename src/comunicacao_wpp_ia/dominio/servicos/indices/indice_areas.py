@@ -0,0 +1,121 @@
+import re
+from typing import Dict, List, Tuple
+from rapidfuzz import fuzz, process, utils
+from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
+from src.comunicacao_wpp_ia.dominio.modelos.propriedade import Propriedade
+from src.comunicacao_wpp_ia.dominio.utilitarios.normalizacao import NormalizacaoUtilidade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import IndiceCatalogo
+
+SCORE_AREA_MINIMO = 80
+# Limite mais baixo para listar candidatos ao agente, que decide ou pergunta ao usuário
+SCORE_AREA_CANDIDATO = 60
+
+# Palavras que o usuário e os cadastros usam antes do nome da área ("talhão 03", "soja do talhão 3", "fazenda boa vista")
+_PADRAO_PREFIXO_AREA = re.compile(r"\b(?:(?:do|da|no|na)\s+)?(?:talhao|talhoes|gleba|lote|plantio|fazenda|propriedade|sitio|area)\s+")
+_PADRAO_ZEROS_A_ESQUERDA = re.compile(r"\b0+(\d)")
+
+def normalizar_nome_area(texto: str) -> str:
+    """
+    Normaliza o nome de uma área e remove os prefixos genéricos e os zeros à esquerda ("Soja do Talhão 03" -> "soja 3").
+    """
+    normalizado = NormalizacaoUtilidade.normalizar(texto)
+    normalizado = _PADRAO_PREFIXO_AREA.sub("", normalizado) or normalizado
+    return _PADRAO_ZEROS_A_ESQUERDA.sub(r"\1", normalizado)
+
+def _buscar_posicoes(nomes: List[str], por_nome: Dict[str, List[int]], mencao: str) -> List[Tuple[int, float]]:
+    """
+    Retorna as posições com nome exatamente igual à menção ou, se não houver, as de maior similaridade (score >= 80).
+    """
+    consulta = normalizar_nome_area(mencao)
+    exatas = por_nome.get(consulta)
+    if exatas:
+        return [(posicao, 100.0) for posicao in exatas]
+
+    matches = process.extract(consulta, nomes, scorer=fuzz.WRatio, processor=utils.default_process, limit=None, score_cutoff=SCORE_AREA_MINIMO)
+    if not matches:
+        return []
+    score_maximo = matches[0][1]
+    return [(posicao, score) for _, score, posicao in matches if score == score_maximo]
+
+def _ranquear_posicoes(nomes: List[str], por_nome: Dict[str, List[int]], mencao: str, limite: int) -> List[Tuple[int, float]]:
+    """
+    Retorna até `limite` posições, do maior para o menor score: primeiro as de nome exato, depois as mais similares.
+    """
+    consulta = normalizar_nome_area(mencao)
+    ranqueadas = [(posicao, 100.0) for posicao in por_nome.get(consulta, [])][:limite]
+    if len(ranqueadas) < limite:
+        exatas = {posicao for posicao, _ in ranqueadas}
+        matches = process.extract(consulta, nomes, scorer=fuzz.WRatio, processor=utils.default_process, limit=limite + len(exatas), score_cutoff=SCORE_AREA_CANDIDATO)
+        ranqueadas += [(posicao, score) for _, score, posicao in matches if posicao not in exatas][:limite - len(ranqueadas)]
+    return ranqueadas
+
+def _melhores_por_posicao(*listas: List[Tuple[int, float]], limite: int) -> List[Tuple[int, float]]:
+    """Une listas de (posição, score) mantendo o maior score de cada posição."""
+    melhores: Dict[int, float] = {}
+    for lista in listas:
+        for posicao, score in lista:
+            melhores[posicao] = max(score, melhores.get(posicao, 0.0))
+    return sorted(melhores.items(), key=lambda item: item[1], reverse=True)[:limite]
+
+def _agrupar_por_nome(nomes: List[str]) -> Dict[str, List[int]]:
+    por_nome: Dict[str, List[int]] = {}
+    for posicao, nome in enumerate(nomes):
+        por_nome.setdefault(nome, []).append(posicao)
+    return por_nome
+
+class IndicePlantios(IndiceCatalogo):
+    """
+    Índice dos plantios de um produtor pelo nome do talhão e pelo nome do plantio (cultura + talhão).
+    A busca devolve todos os plantios empatados no melhor score; mais de um indica ambiguidade.
+    """
+
+    def __init__(self, plantios: List[Plantio]):
+        super().__init__(plantios)
+        self.plantios = plantios
+        self._talhoes = [normalizar_nome_area(plantio.talhao.nome) for plantio in plantios]
+        # Plantio "Soja" no "Talhão 03" vira "soja 3", a mesma forma normalizada de "soja do talhão 3"
+        self._plantios = [f"{normalizar_nome_area(plantio.nome)} {talhao}" for plantio, talhao in zip(plantios, self._talhoes)]
+        self._por_talhao = _agrupar_por_nome(self._talhoes)
+        self._por_plantio = _agrupar_por_nome(self._plantios)
+
+    def buscar_por_talhao(self, mencao: str) -> List[Tuple[Plantio, float]]:
+        return [(self.plantios[posicao], score) for posicao, score in _buscar_posicoes(self._talhoes, self._por_talhao, mencao)]
+
+    def buscar_por_plantio(self, mencao: str) -> List[Tuple[Plantio, float]]:
+        encontrados = _buscar_posicoes(self._plantios, self._por_plantio, mencao)
+        if not encontrados:
+            # "plantio do talhão 3" muitas vezes cita só o talhão
+            encontrados = _buscar_posicoes(self._talhoes, self._por_talhao, mencao)
+        return [(self.plantios[posicao], score) for posicao, score in encontrados]
+
+    def candidatos_por_talhao(self, mencoes: List[str], limite: int) -> List[Tuple[Plantio, float]]:
+        """Os plantios mais prováveis para as menções de talhão, sem repetição, do maior para o menor score."""
+        ranqueadas = [_ranquear_posicoes(self._talhoes, self._por_talhao, mencao, limite) for mencao in mencoes]
+        return [(self.plantios[posicao], score) for posicao, score in _melhores_por_posicao(*ranqueadas, limite=limite * len(mencoes))]
+
+    def candidatos_por_plantio(self, mencoes: List[str], limite: int) -> List[Tuple[Plantio, float]]:
+        """Os plantios mais prováveis para as menções, comparando com "cultura talhão" e com o talhão."""
+        ranqueadas = []
+        for mencao in mencoes:
+            ranqueadas.append(_ranquear_posicoes(self._plantios, self._por_plantio, mencao, limite))
+            ranqueadas.append(_ranquear_posicoes(self._talhoes, self._por_talhao, mencao, limite))
+        return [(self.plantios[posicao], score) for posicao, score in _melhores_por_posicao(*ranqueadas, limite=limite * len(mencoes))]
+
+class IndicePropriedades(IndiceCatalogo):
+    """
+    Índice das propriedades (fazendas) de um produtor pelo nome.
+    """
+
+    def __init__(self, propriedades: List[Propriedade]):
+        super().__init__(propriedades)
+        self.propriedades = propriedades
+        self._nomes = [normalizar_nome_area(propriedade.nome) for propriedade in propriedades]
+        self._por_nome = _agrupar_por_nome(self._nomes)
+
+    def buscar(self, mencao: str) -> List[Tuple[Propriedade, float]]:
+        return [(self.propriedades[posicao], score) for posicao, score in _buscar_posicoes(self._nomes, self._por_nome, mencao)]
+
+    def candidatos(self, mencoes: List[str], limite: int) -> List[Tuple[Propriedade, float]]:
+        """As propriedades mais prováveis para as menções, sem repetição, do maior para o menor score."""
+        ranqueadas = [_ranquear_posicoes(self._nomes, self._por_nome, mencao, limite) for mencao in mencoes]
+        return [(self.propriedades[posicao], score) for posicao, score in _melhores_por_posicao(*ranqueadas, limite=limite * len(mencoes))]
@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Type
+
+class IndiceCatalogo:
+    """
+    Base dos índices construídos sobre um catálogo do produtor (produtos, máquinas, pontos de estoque, safras...).
+    Os índices já construídos ficam guardados no próprio catálogo (CatalogoIndexado), de modo que vivem e expiram
+    junto com ele no cache de catálogos; sobre uma lista comum, o índice é construído a cada chamada.
+    """
+    def __init__(self, itens: List[Any]):
+        self.itens = itens
+
+    @classmethod
+    def obter(cls, itens: List[Any]) -> "IndiceCatalogo":
+        """
+        Retorna o índice do catálogo, reaproveitando o que já estiver guardado nele.
+        """
+        return CatalogoIndexado.calcular_uma_vez(itens, cls, cls)
+
+class CatalogoIndexado(list):
+    """
+    Catálogo do produtor (lista de objetos de domínio) que guarda os índices e demais valores calculados sobre ele.
+    É montado por quem carrega o catálogo, para que esses valores ocupem a mesma entrada do cache que a lista.
+    """
+    def __init__(self, itens: Iterable[Any] = ()):
+        super().__init__(itens)
+        self._derivados: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def calcular_uma_vez(itens: List[Any], chave: Hashable, calcular: Callable[[List[Any]], Any]) -> Any:
+        """
+        Calcula um valor sobre o catálogo, guardando-o nele quando for um CatalogoIndexado; sobre uma lista
+        comum, o valor é calculado a cada chamada.
+        """
+        if isinstance(itens, CatalogoIndexado):
+            return itens.derivado(chave, calcular)
+        return calcular(itens)
+
+    @classmethod
+    def construir(cls, itens: Iterable[Any], *tipos_indice: Type[IndiceCatalogo]) -> "CatalogoIndexado":
+        """Monta o catálogo e já constrói os índices informados, fora do caminho das consultas."""
+        catalogo = cls(itens)
+        for tipo_indice in tipos_indice:
+            catalogo.indice(tipo_indice)
+        return catalogo
+
+    def derivado(self, chave: Hashable, calcular: Callable[[List[Any]], Any]) -> Any:
+        with self._lock:
+            if chave not in self._derivados:
+                self._derivados[chave] = calcular(self)
+            return self._derivados[chave]
+
+    def indice(self, tipo_indice: Type[IndiceCatalogo]) -> IndiceCatalogo:
+        return self.derivado(tipo_indice, tipo_indice)
@@ -0,0 +1,48 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from rapidfuzz import fuzz, process, utils
+from src.comunicacao_wpp_ia.dominio.modelos.imobilizado import Imobilizado
+from src.comunicacao_wpp_ia.dominio.utilitarios.normalizacao import NormalizacaoUtilidade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import IndiceCatalogo
+
+class IndiceMaquinas(IndiceCatalogo):
+    """
+    Índice do catálogo de máquinas de um produtor.
+    - Número de série e nome exato (normalizados) são encontrados por dicionário, em O(1).
+    - A busca por similaridade devolve a própria máquina (pela posição no catálogo), sem reconverter nomes em objetos,
+      então máquinas com o mesmo nome continuam distintas.
+    """
+    SCORE_MINIMO = 80
+    LIMITE_SIMILARES = 5
+    _PADRAO_SEPARADORES_SERIE = re.compile(r"[\s\-./]")
+
+    def __init__(self, maquinas: List[Imobilizado]):
+        super().__init__(maquinas)
+        self.maquinas = maquinas
+        self._nomes = [NormalizacaoUtilidade.normalizar(maquina.nome) for maquina in maquinas]
+        self._por_serie: Dict[str, Imobilizado] = {}
+        self._por_nome: Dict[str, List[Imobilizado]] = {}
+        for maquina, nome in zip(maquinas, self._nomes):
+            if maquina.numero_serie:
+                self._por_serie.setdefault(self._normalizar_serie(maquina.numero_serie), maquina)
+            self._por_nome.setdefault(nome, []).append(maquina)
+
+    @classmethod
+    def _normalizar_serie(cls, numero_serie: str) -> str:
+        return cls._PADRAO_SEPARADORES_SERIE.sub("", numero_serie).lower()
+
+    def buscar_por_serie(self, termo_busca: str) -> Optional[Imobilizado]:
+        return self._por_serie.get(self._normalizar_serie(termo_busca))
+
+    def buscar_por_nome_exato(self, termo_busca: str) -> List[Imobilizado]:
+        return self._por_nome.get(NormalizacaoUtilidade.normalizar(termo_busca), [])
+
+    def buscar_similares(self, termo_busca: str) -> List[Tuple[Imobilizado, float]]:
+        """
+        Retorna as máquinas com nome similar ao termo (score >= 80), da mais para a menos similar.
+        """
+        matches = process.extract(
+            NormalizacaoUtilidade.normalizar(termo_busca), self._nomes,
+            scorer=fuzz.WRatio, processor=utils.default_process, limit=self.LIMITE_SIMILARES, score_cutoff=self.SCORE_MINIMO
+        )
+        return [(self.maquinas[posicao], score) for _, score, posicao in matches]
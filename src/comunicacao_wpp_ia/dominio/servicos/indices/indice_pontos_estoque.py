@@ -0,0 +1,61 @@
+from typing import Dict, List, Optional
+from rapidfuzz import fuzz, process, utils
+from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
+from src.comunicacao_wpp_ia.dominio.objetos.ponto_estoque_encontrado import PontoEstoqueEncontrado
+from src.comunicacao_wpp_ia.dominio.utilitarios.normalizacao import NormalizacaoUtilidade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import IndiceCatalogo
+
+class IndicePontosEstoque(IndiceCatalogo):
+    """
+    Índice do catálogo de pontos de estoque de um produtor.
+    Os nomes são normalizados uma única vez e cada busca pontua o catálogo em uma única passada, devolvendo os pontos
+    já ordenados por score e com os empates no score máximo sinalizados.
+    """
+    SCORE_MINIMO = 80
+
+    def __init__(self, pontos_estoque: List[PontoEstoque]):
+        super().__init__(pontos_estoque)
+        self.pontos_estoque = pontos_estoque
+        self._nomes = [NormalizacaoUtilidade.normalizar(ponto.nome) for ponto in pontos_estoque]
+        self._por_id: Dict[str, PontoEstoque] = {ponto.id: ponto for ponto in pontos_estoque}
+        self._ativos = [ponto for ponto in pontos_estoque if ponto.ativo]
+
+    @staticmethod
+    def _encontrado(ponto: PontoEstoque, score: Optional[float], criterio: str, empatado: bool = False, requer_confirmacao: bool = False) -> PontoEstoqueEncontrado:
+        return PontoEstoqueEncontrado(**ponto.model_dump(), score=score, criterio=criterio, empatado=empatado, requer_confirmacao=requer_confirmacao)
+
+    def buscar(self, nome_mencionado: str) -> List[PontoEstoqueEncontrado]:
+        matches = process.extract(
+            NormalizacaoUtilidade.normalizar(nome_mencionado), self._nomes,
+            scorer=fuzz.WRatio, processor=utils.default_process, limit=None, score_cutoff=self.SCORE_MINIMO
+        )
+        if not matches:
+            return []
+
+        score_maximo = matches[0][1]
+        empate = sum(1 for _, score, _ in matches if score == score_maximo) > 1
+        return [
+            self._encontrado(self.pontos_estoque[posicao], round(score, 1), "similaridade", empatado=empate and score == score_maximo)
+            for _, score, posicao in matches
+        ]
+
+    def padrao(self, id_mais_usado: Optional[str] = None) -> Optional[PontoEstoqueEncontrado]:
+        """
+        Escolhe o ponto de estoque padrão quando o usuário não mencionou nenhum:
+        o único cadastrado, o único ativo ou, por último, o mais usado nos consumos anteriores.
+        """
+        if len(self.pontos_estoque) == 1:
+            return self._encontrado(self.pontos_estoque[0], None, "unico")
+        if len(self._ativos) == 1:
+            return self._encontrado(self._ativos[0], None, "unico_ativo")
+        if id_mais_usado and id_mais_usado in self._por_id:
+            return self._encontrado(self._por_id[id_mais_usado], None, "mais_usado")
+        return None
+
+    def sugestoes(self, sugerido: PontoEstoqueEncontrado) -> List[PontoEstoqueEncontrado]:
+        """
+        Apresenta um ponto padrão que é só um palpite (o mais usado) como sugestão a confirmar: ele em primeiro,
+        seguido dos demais pontos ativos como alternativas, todos sinalizados com 'requer_confirmacao'.
+        """
+        alternativas = [self._encontrado(ponto, None, "alternativa", requer_confirmacao=True) for ponto in self._ativos if ponto.id != sugerido.id]
+        return [sugerido.model_copy(update={"requer_confirmacao": True})] + alternativas
@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Tuple, Union
+from rapidfuzz import fuzz, process
+from src.comunicacao_wpp_ia.dominio.modelos.produto import Produto
+from src.comunicacao_wpp_ia.dominio.utilitarios.normalizacao import NormalizacaoUtilidade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import IndiceCatalogo
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_trigramas import IndiceTrigramas
+
+class IndiceProdutos(IndiceCatalogo):
+    """
+    Índice pré-calculado do catálogo de produtos de um produtor para busca por similaridade.
+    - Os nomes e os ingredientes ativos são normalizados uma única vez, na construção do índice.
+    - Os ingredientes ficam em uma tabela achatada de ingredientes distintos (ingrediente -> posições dos produtos),
+      então cada ingrediente é pontuado uma única vez, mesmo que apareça em centenas de produtos.
+    - Cada consulta pontua o catálogo em uma chamada em lote do rapidfuzz, já com o score mínimo aplicado.
+    - Em catálogos grandes, um índice de trigramas pré-filtra os candidatos antes da pontuação exata.
+    """
+    SCORE_NOME_MINIMO = 75
+    SCORE_INGREDIENTE_MINIMO = 90
+    # Abaixo deste número de produtos a varredura completa é mais rápida que o pré-filtro
+    LIMIAR_PRE_FILTRO = 2000
+
+    def __init__(self, produtos: List[Produto], limiar_pre_filtro: Optional[int] = None):
+        super().__init__(produtos)
+        self.produtos = produtos
+        self._nomes = [self.normalizar(produto.nome) for produto in produtos]
+        posicoes_por_ingrediente: Dict[str, List[int]] = {}
+        for posicao, produto in enumerate(produtos):
+            for ingrediente in produto.ingredientes_ativos or []:
+                posicoes_por_ingrediente.setdefault(self.normalizar(ingrediente), []).append(posicao)
+        self._ingredientes = list(posicoes_por_ingrediente)
+        self._posicoes_ingrediente = list(posicoes_por_ingrediente.values())
+
+        limiar = self.LIMIAR_PRE_FILTRO if limiar_pre_filtro is None else limiar_pre_filtro
+        usa_pre_filtro = len(produtos) >= limiar
+        self._trigramas_nomes = IndiceTrigramas(self._nomes) if usa_pre_filtro else None
+        self._trigramas_ingredientes = IndiceTrigramas(self._ingredientes) if usa_pre_filtro else None
+
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        return NormalizacaoUtilidade.normalizar(texto)
+
+    @staticmethod
+    def _escolhas(consulta: str, textos: List[str], trigramas: Optional[IndiceTrigramas]) -> Union[List[str], Dict[int, str]]:
+        """
+        Retorna os textos que serão pontuados: todos, ou apenas os candidatos do pré-filtro (posição -> texto).
+        """
+        if trigramas is None:
+            return textos
+        return {posicao: textos[posicao] for posicao in trigramas.candidatos(consulta)}
+
+    def buscar(self, nome_mencionado: str, limite: Optional[int] = None) -> List[Tuple[Produto, float]]:
+        """
+        Retorna os produtos cujo nome atinge o score mínimo ou que possuem algum ingrediente ativo que o atinja,
+        ordenados do maior para o menor score, limitados aos `limite` primeiros (top-k).
+        """
+        consulta = self.normalizar(nome_mencionado)
+        scores: Dict[int, float] = {}
+
+        for _, score, posicao in process.extract(consulta, self._escolhas(consulta, self._nomes, self._trigramas_nomes), scorer=fuzz.ratio, limit=None, score_cutoff=self.SCORE_NOME_MINIMO):
+            scores[posicao] = score
+
+        escolhas_ingredientes = self._escolhas(consulta, self._ingredientes, self._trigramas_ingredientes)
+        for _, score, indice_ingrediente in process.extract(consulta, escolhas_ingredientes, scorer=fuzz.ratio, limit=None, score_cutoff=self.SCORE_INGREDIENTE_MINIMO):
+            for posicao in self._posicoes_ingrediente[indice_ingrediente]:
+                scores[posicao] = max(score, scores.get(posicao, 0))
+
+        # Produtos repetidos no catálogo (mesmo id) aparecem uma única vez, com o maior score
+        resultado: Dict[str, Tuple[Produto, float]] = {}
+        for posicao, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            produto = self.produtos[posicao]
+            resultado.setdefault(produto.id, (produto, score))
+
+        ordenados = list(resultado.values())
+        return ordenados[:limite] if limite else ordenados
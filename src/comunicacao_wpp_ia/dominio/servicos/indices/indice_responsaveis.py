@@ -0,0 +1,22 @@
+from typing import Dict, List, Optional
+from src.comunicacao_wpp_ia.dominio.modelos.responsavel import Responsavel
+from src.comunicacao_wpp_ia.dominio.utilitarios.normalizacao import NormalizacaoUtilidade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import IndiceCatalogo
+
+class IndiceResponsaveis(IndiceCatalogo):
+    """
+    Índice dos responsáveis de um produtor pelo telefone normalizado, para busca em O(1).
+    Se mais de um responsável tiver o mesmo telefone, prevalece o primeiro do catálogo.
+    """
+
+    def __init__(self, responsaveis: List[Responsavel]):
+        super().__init__(responsaveis)
+        self._por_telefone: Dict[str, Responsavel] = {}
+        for responsavel in responsaveis:
+            chave = NormalizacaoUtilidade.normalizar_telefone(responsavel.telefone)
+            if chave:
+                self._por_telefone.setdefault(chave, responsavel)
+
+    def buscar_por_telefone(self, telefone: str) -> Optional[Responsavel]:
+        chave = NormalizacaoUtilidade.normalizar_telefone(telefone)
+        return self._por_telefone.get(chave) if chave else None
@@ -0,0 +1,42 @@
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from src.comunicacao_wpp_ia.dominio.modelos.safra import Safra
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import IndiceCatalogo
+
+class IndiceSafras(IndiceCatalogo):
+    """
+    Índice de intervalos das safras de um produtor, construído uma vez por recarga do catálogo.
+    - As safras ficam ordenadas pela data de início; a safra ativa em uma data é encontrada por busca binária.
+    - Como safras podem se sobrepor, guarda-se também o maior término até cada posição, o que permite parar
+      a busca assim que nenhuma safra anterior puder conter a data.
+    - O par (ano_inicio, ano_termino) é encontrado por dicionário.
+    """
+
+    def __init__(self, safras: List[Safra]):
+        super().__init__(safras)
+        self._ordenadas = sorted(safras, key=lambda safra: (safra.data_inicio, safra.data_termino))
+        self._inicios = [safra.data_inicio for safra in self._ordenadas]
+        self._maior_termino: List[date] = []
+        for safra in self._ordenadas:
+            anterior = self._maior_termino[-1] if self._maior_termino else safra.data_termino
+            self._maior_termino.append(max(anterior, safra.data_termino))
+
+        self._por_anos: Dict[Tuple[int, int], Safra] = {}
+        for safra in safras:
+            self._por_anos.setdefault((safra.ano_inicio, safra.ano_termino), safra)
+
+    def ativa_em(self, data: date) -> Optional[Safra]:
+        """
+        Retorna a safra ativa na data. Se houver sobreposição, prefere a que começou mais recentemente.
+        """
+        posicao = bisect_right(self._inicios, data) - 1
+        while posicao >= 0 and self._maior_termino[posicao] >= data:
+            safra = self._ordenadas[posicao]
+            if data <= safra.data_termino:
+                return safra
+            posicao -= 1
+        return None
+
+    def por_anos(self, ano_inicio: int, ano_termino: int) -> Optional[Safra]:
+        return self._por_anos.get((ano_inicio, ano_termino))
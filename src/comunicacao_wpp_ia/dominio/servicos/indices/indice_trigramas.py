@@ -0,0 +1,36 @@
+from collections import defaultdict
+from typing import Dict, List, Set
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas (trigrama -> posições dos textos que o contêm).
+    Serve como pré-filtro: reduz um catálogo grande aos textos que podem compartilhar uma fração mínima dos trigramas
+    da consulta, para que só eles passem pela pontuação fuzzy exata. É uma aproximação: textos muito curtos
+    ou muito alterados podem não compartilhar trigramas suficientes com a consulta.
+    """
+
+    def __init__(self, textos: List[str], fracao_minima: float = 0.3):
+        self._fracao_minima = fracao_minima
+        self._postagens: Dict[str, List[int]] = defaultdict(list)
+        for posicao, texto in enumerate(textos):
+            for trigrama in self.trigramas(texto):
+                self._postagens[trigrama].append(posicao)
+
+    @staticmethod
+    def trigramas(texto: str) -> Set[str]:
+        # O preenchimento nas bordas gera trigramas também para o início e o fim do texto (e para textos curtos)
+        preenchido = f"  {texto} "
+        return {preenchido[i:i + 3] for i in range(len(preenchido) - 2)}
+
+    def candidatos(self, consulta: str) -> List[int]:
+        """
+        Retorna as posições dos textos que podem compartilhar ao menos `fracao_minima` dos trigramas da consulta.
+        Para compartilhar `m` dos `n` trigramas, o texto precisa estar em pelo menos uma das postagens dos `n - m + 1`
+        trigramas mais raros, então só essas postagens (as menores) são percorridas.
+        """
+        postagens = sorted((self._postagens.get(trigrama, []) for trigrama in self.trigramas(consulta)), key=len)
+        minimo = max(1, int(len(postagens) * self._fracao_minima))
+        candidatos: Set[int] = set()
+        for postagem in postagens[:len(postagens) - minimo + 1]:
+            candidatos.update(postagem)
+        return list(candidatos)
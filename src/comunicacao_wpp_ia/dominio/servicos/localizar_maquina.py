@@ -1,6 +1,6 @@
 from typing import List
-from thefuzz import process
 from src.comunicacao_wpp_ia.dominio.modelos.imobilizado import Imobilizado
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_maquinas import IndiceMaquinas
 
 class LocalizarMaquinaService:
     def __init__(self, api_ferramentas):
@@ -10,7 +10,8 @@ class LocalizarMaquinaService:
         """
         Encontra máquinas com base em um termo de busca.
         - Se o termo for um número de série, busca por correspondência exata.
-        - Se for um nome, busca por similaridade (score >= 80).
+        - Se for exatamente o nome de uma ou mais máquinas, retorna-as.
+        - Caso contrário, busca por similaridade no nome (score >= 80).
         """
         print(f"\n[SERVICE] Iniciando busca por Máquina: '{termo_busca}'")
         todas_maquinas = self.api.buscar_maquinas_do_produtor(base_url, id_produtor)
@@ -18,30 +19,27 @@ class LocalizarMaquinaService:
         if not todas_maquinas:
             return []
 
+        indice = IndiceMaquinas.obter(todas_maquinas)
+
         # Etapa 1: Busca por correspondência exata no número de série
-        termo_busca_lower = termo_busca.lower()
-        for maquina in todas_maquinas:
-            if maquina.numero_serie and maquina.numero_serie.lower() == termo_busca_lower:
-                print(f"[SERVICE] Máquina encontrada por número de série exato: {maquina.nome}")
-                return [maquina]
-        
-        # Etapa 2: Se não encontrou por S/N, busca por similaridade no nome
-        print("[SERVICE] Nenhum S/N correspondente. Buscando por similaridade no nome...")
-        nomes_maquinas = {m.id: m.nome for m in todas_maquinas}
-        score_minimo = 80
+        maquina = indice.buscar_por_serie(termo_busca)
+        if maquina:
+            print(f"[SERVICE] Máquina encontrada por número de série exato: {maquina.nome}")
+            return [maquina]
+
+        # Etapa 2: Busca por correspondência exata no nome
+        maquinas_encontradas = indice.buscar_por_nome_exato(termo_busca)
+        if maquinas_encontradas:
+            print(f"[SERVICE] Máquinas encontradas por nome exato: {[maquina.nome for maquina in maquinas_encontradas]}")
+            return maquinas_encontradas
         
-        matches = process.extractBests(termo_busca, [m.nome for m in todas_maquinas], score_cutoff=score_minimo)
+        # Etapa 3: Se não encontrou por S/N nem pelo nome exato, busca por similaridade no nome
+        print("[SERVICE] Nenhum S/N ou nome exato correspondente. Buscando por similaridade no nome...")
+        similares = indice.buscar_similares(termo_busca)
         
-        if not matches:
+        if not similares:
             print("[SERVICE] Nenhuma máquina compatível encontrada.")
             return []
 
-        maquinas_encontradas = []
-        nomes_encontrados = [match[0] for match in matches]
-        
-        print(f"[SERVICE] Máquinas encontradas com similaridade: {nomes_encontrados}")
-        for maquina in todas_maquinas:
-            if maquina.nome in nomes_encontrados:
-                maquinas_encontradas.append(maquina)
-        
-        return maquinas_encontradas
\ No newline at end of file
+        print(f"[SERVICE] Máquinas encontradas com similaridade: {[(maquina.nome, round(score, 1)) for maquina, score in similares]}")
+        return [maquina for maquina, _ in similares]
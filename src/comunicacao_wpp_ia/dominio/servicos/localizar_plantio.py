@@ -1,16 +1,24 @@
-from typing import List
-from thefuzz import process
+from typing import List, Tuple
 from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_areas import IndicePlantios
 
 class LocalizarPlantioService:
     def __init__(self, api_ferramentas):
         self.api = api_ferramentas
 
     def obter(self, base_url: str, id_produtor: int) -> List[Plantio]:
-        """Encontra os plantios mais prováveis com base nos nomes mencionados."""
+        """Retorna todos os plantios do produtor."""
         todos_plantios = self.api.buscar_plantios_do_produtor(base_url, id_produtor)
 
         if not todos_plantios:
             return []
             
-        return todos_plantios
\ No newline at end of file
+        return todos_plantios
+
+    def obter_candidatos(self, base_url: str, id_produtor: int, nomes_mencionados: List[str], limite: int = 5) -> List[Tuple[Plantio, float]]:
+        """Encontra os plantios mais prováveis (até `limite` por nome) com base nos nomes mencionados."""
+        todos_plantios = self.obter(base_url, id_produtor)
+        if not todos_plantios:
+            return []
+
+        return IndicePlantios.obter(todos_plantios).candidatos_por_plantio(nomes_mencionados, limite)
@@ -1,62 +1,54 @@
 from typing import Optional, List
-from thefuzz import process
-from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
+from src.comunicacao_wpp_ia.dominio.objetos.ponto_estoque_encontrado import PontoEstoqueEncontrado
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_pontos_estoque import IndicePontosEstoque
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_historico_ponto_estoque import RepositorioHistoricoPontoEstoque
 
 class LocalizarPontoEstoqueService:
-    def __init__(self, api_ferramentas):
+    def __init__(self, api_ferramentas, historico: Optional[RepositorioHistoricoPontoEstoque] = None):
         self.api = api_ferramentas
+        self.historico = historico
 
-    from typing import Optional
-from thefuzz import process
-from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
-
-class LocalizarPontoEstoqueService:
-    def __init__(self, api_ferramentas):
-        self.api = api_ferramentas
-    
-    def obter(self, base_url: str, id_produtor: int, nome_mencionado: Optional[str] = None) -> List[PontoEstoque]:
+    def obter(self, base_url: str, id_produtor: int, nome_mencionado: Optional[str] = None) -> List[PontoEstoqueEncontrado]:
         """
-        Encontra pontos de estoque com base em um nome mencionado ou retorna o padrão se for o único disponível.
+        Encontra pontos de estoque com base em um nome mencionado ou retorna o padrão.
         - Se houver apenas um ponto de estoque, retorna-o como padrão.
-        - Se um nome for mencionado, retorna todos os pontos com similaridade >= 80.
-        - Se nenhum nome for mencionado e houver múltiplos pontos, retorna uma lista vazia.
+        - Se um nome for mencionado, retorna todos os pontos com similaridade >= 80, do mais para o menos similar,
+          sinalizando com 'empatado' os que dividem o score máximo.
+        - Se nenhum nome for mencionado, retorna o único ponto ativo ou, se houver, o mais usado nos consumos anteriores.
+          O mais usado é só uma sugestão: vem em primeiro, seguido dos demais pontos ativos, todos com 'requer_confirmacao'.
+        - Caso contrário, retorna uma lista vazia.
         """
         print(f"\n[SERVICE] Iniciando busca por Ponto de Estoque: '{nome_mencionado or 'Nenhum'}'")
         todos_pontos_estoque = self.api.buscar_pontos_estoque_do_produtor(base_url,id_produtor)
-        
+
         if not todos_pontos_estoque:
             return []
 
+        indice = IndicePontosEstoque.obter(todos_pontos_estoque)
+
         # Se houver apenas um ponto de estoque, ele é o padrão.
         if len(todos_pontos_estoque) == 1:
             print(f"[SERVICE] Encontrado um único ponto de estoque como padrão: {todos_pontos_estoque[0].nome}")
-            return todos_pontos_estoque
+            return [indice.padrao()]
 
-        # Se o usuário não mencionou um nome e há múltiplos, não há o que fazer.
+        # Se o usuário não mencionou um nome, tenta as heurísticas de ponto padrão.
         if not nome_mencionado:
+            mais_usado = self.historico.mais_usado(base_url, id_produtor) if self.historico else None
+            padrao = indice.padrao(mais_usado)
+            if padrao and padrao.criterio == "mais_usado":
+                print(f"[SERVICE] Ponto de estoque sugerido (mais_usado), a confirmar com o usuário: {padrao.nome}")
+                return indice.sugestoes(padrao)
+            if padrao:
+                print(f"[SERVICE] Ponto de estoque padrão ({padrao.criterio}): {padrao.nome}")
+                return [padrao]
             print("[SERVICE] Nenhum nome de ponto de estoque foi mencionado e existem múltiplos disponíveis.")
             return []
 
         # Se mencionou, busca por similaridade
-        nomes_pontos_estoque = [p.nome for p in todos_pontos_estoque]
-        score_minimo = 80
-        
-        # Usamos extractBests para pegar todos os resultados acima de um score
-        matches = process.extractBests(nome_mencionado, nomes_pontos_estoque, score_cutoff=score_minimo)
-        print(matches)
-        melhor_match, score = process.extractOne(nome_mencionado, nomes_pontos_estoque)
-        print(melhor_match)
-        
-        if not matches:
+        pontos_encontrados = indice.buscar(nome_mencionado)
+        if not pontos_encontrados:
             print("[SERVICE] Nenhum ponto de estoque compatível encontrado.")
             return []
 
-        pontos_encontrados = []
-        nomes_encontrados = [match[0] for match in matches]
-        
-        print(f"[SERVICE] Pontos de estoque encontrados com similaridade: {nomes_encontrados}")
-        for ponto in todos_pontos_estoque:
-            if ponto.nome in nomes_encontrados:
-                pontos_encontrados.append(ponto)
-        
-        return pontos_encontrados
\ No newline at end of file
+        print(f"[SERVICE] Pontos de estoque encontrados com similaridade: {[(ponto.nome, ponto.score, ponto.empatado) for ponto in pontos_encontrados]}")
+        return pontos_encontrados
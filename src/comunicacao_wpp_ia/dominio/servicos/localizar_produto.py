@@ -1,36 +1,19 @@
 from typing import List, Optional, Dict, Any
-from thefuzz import fuzz
 from src.comunicacao_wpp_ia.dominio.modelos.produto import Produto
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_produtos import IndiceProdutos
 
 class LocalizarProdutoService:
     def __init__(self, api_ferramentas):
         self.api = api_ferramentas
 
-    def __obter_candidatos(self, nome_mencionado: str, lista_produtos: List[dict], limite: Optional[int] = None) -> List[dict]:
+    def __obter_candidatos(self, nome_mencionado: str, lista_produtos: List[Produto], limite: Optional[int] = None) -> List[Produto]:
         """
-        Encontra produtos candidatos com base na similaridade do nome ou dos ingredientes ativos
+        Encontra produtos candidatos com base na similaridade do nome ou dos ingredientes ativos, do mais para o menos similar
         """
-        candidatos_encontrados = {}  # Usar um dicionário para evitar duplicatas, com ID como chave
-        nome_mencionado_lower = nome_mencionado.lower()
-        score_nome_minimo = 75
-        score_ingrediente_minimo = 90
-
-        for produto in lista_produtos:
-            # 1. Compara com o nome do produto
-            score_nome = fuzz.ratio(nome_mencionado_lower, produto.nome.lower())
-            if score_nome >= score_nome_minimo:
-                candidatos_encontrados[produto.id] = produto
-                continue  # Pula para o próximo produto, pois a condição já foi atendida
-
-            # 2. Se não encontrou pelo nome, compara com os ingredientes ativos
-            if produto.ingredientes_ativos:
-                for ingrediente in produto.ingredientes_ativos:
-                    score_ingrediente = fuzz.ratio(nome_mencionado_lower, ingrediente.lower())
-                    if score_ingrediente >= score_ingrediente_minimo:
-                        candidatos_encontrados[produto.id] = produto
-                        break  # Sai do loop de ingredientes, pois já adicionou o produto
-        
-        return list(candidatos_encontrados.values())
+        indice = IndiceProdutos.obter(lista_produtos)
+        candidatos = indice.buscar(nome_mencionado, limite=limite)
+        print(f"[SERVICE] Candidatos para '{nome_mencionado}': {[(produto.nome, round(score, 1)) for produto, score in candidatos]}")
+        return [produto for produto, _ in candidatos]
 
     def obterPossiveisProdutos(self, base_url: str, nome_produto_mencionado: str, id_produtor: int) -> Dict[str, Any]:
         """
@@ -1,15 +1,23 @@
-from typing import List, Optional
-from thefuzz import process
+from typing import List, Tuple
 from src.comunicacao_wpp_ia.dominio.modelos.propriedade import Propriedade
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_areas import IndicePropriedades
 
 class LocalizarPropriedadeService:
     def __init__(self, api_ferramentas):
         self.api = api_ferramentas
 
     def obter(self, base_url: str, id_produtor: int) -> List[Propriedade]:
-        """Encontra as propriedades mais prováveis com base nos nomes mencionados."""
+        """Retorna todas as propriedades do produtor."""
         todas_propriedades = self.api.buscar_propriedades_do_produtor(base_url, id_produtor)
         if not todas_propriedades:
             return []
 
-        return todas_propriedades
\ No newline at end of file
+        return todas_propriedades
+
+    def obter_candidatos(self, base_url: str, id_produtor: int, nomes_mencionados: List[str], limite: int = 5) -> List[Tuple[Propriedade, float]]:
+        """Encontra as propriedades mais prováveis (até `limite` por nome) com base nos nomes mencionados."""
+        todas_propriedades = self.obter(base_url, id_produtor)
+        if not todas_propriedades:
+            return []
+
+        return IndicePropriedades.obter(todas_propriedades).candidatos(nomes_mencionados, limite)
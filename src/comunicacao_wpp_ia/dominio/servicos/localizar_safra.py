@@ -2,15 +2,18 @@ import re
 from typing import List, Optional
 from datetime import date
 from src.comunicacao_wpp_ia.dominio.modelos.safra import Safra
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_safras import IndiceSafras
 
 class LocalizarSafraService:
+    # Padrões como 24/25, 2024/2025, 2024 / 25, etc.
+    _PADRAO_ANOS = re.compile(r'(\d{2,4})\s*/\s*(\d{2,4})')
+
     def __init__(self, api_ferramentas):
         self.api = api_ferramentas
 
     def _extrair_anos(self, texto: str) -> Optional[tuple[int, int]]:
         """Extrai um padrão de ano como '24/25' ou '2024/2025' do texto."""
-        # Procura por padrões como 24/25, 2024/2025, 2024 / 25, etc.
-        match = re.search(r'(\d{2,4})\s*/\s*(\d{2,4})', texto)
+        match = self._PADRAO_ANOS.search(texto)
         if not match:
             return None
 
@@ -22,10 +25,10 @@ class LocalizarSafraService:
 
         return sorted((ano1, ano2))
     
-    def obter(self, base_url: str, id_produtor: int, nome_mencionado: Optional[str] = None) -> Optional[Safra]:
+    def obter(self, base_url: str, id_produtor: int, nome_mencionado: Optional[str] = None, data_referencia: Optional[date] = None) -> Optional[Safra]:
         """
         Encontra a safra. Se um nome for mencionado, busca por ele.
-        Caso contrário, busca a safra que corresponde à data atual.
+        Caso contrário, busca a safra ativa na data de referência (a data da aplicação) ou, sem ela, na data atual.
         """
         print(f"\n[SERVICE] Iniciando busca por Safra...")
         todas_safras = self.api.buscar_safras_do_produtor(base_url, id_produtor)
@@ -33,15 +36,17 @@ class LocalizarSafraService:
         if not todas_safras:
             return None
 
-        # Se o usuário NÃO mencionou um nome, busca pela data atual
+        indice = IndiceSafras.obter(todas_safras)
+
+        # Se o usuário NÃO mencionou um nome, busca pela data da aplicação (ou pela data atual)
         if not nome_mencionado:
-            hoje = date.today()
-            print(f"[SERVICE] Buscando safra atual para a data: {hoje}")
-            for safra in todas_safras:
-                if safra.data_inicio <= hoje <= safra.data_termino:
-                    print(f"[SERVICE] Safra atual encontrada: {safra.nome}")
-                    return safra
-            print("[SERVICE] Nenhuma safra ativa encontrada para a data atual.")
+            data_busca = data_referencia or date.today()
+            print(f"[SERVICE] Buscando safra ativa para a data: {data_busca}")
+            safra = indice.ativa_em(data_busca)
+            if safra:
+                print(f"[SERVICE] Safra ativa encontrada: {safra.nome}")
+                return safra
+            print(f"[SERVICE] Nenhuma safra ativa encontrada para a data {data_busca}.")
             return None
 
         # Se o usuário mencionou um nome, tenta extrair os anos
@@ -53,10 +58,10 @@ class LocalizarSafraService:
         ano_inicio_mencionado, ano_termino_mencionado = anos_extraidos
         print(f"[SERVICE] Buscando safra para o período: {ano_inicio_mencionado}/{ano_termino_mencionado}")
 
-        for safra in todas_safras:
-            if safra.ano_inicio == ano_inicio_mencionado and safra.ano_termino == ano_termino_mencionado:
-                print(f"[SERVICE] Safra encontrada por ano: {safra.nome}")
-                return safra
+        safra = indice.por_anos(ano_inicio_mencionado, ano_termino_mencionado)
+        if safra:
+            print(f"[SERVICE] Safra encontrada por ano: {safra.nome}")
+            return safra
         
         print(f"[SERVICE] Nenhuma safra encontrada para o período {ano_inicio_mencionado}/{ano_termino_mencionado}.")
         return None
\ No newline at end of file
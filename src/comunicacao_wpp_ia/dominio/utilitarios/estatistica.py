@@ -0,0 +1,16 @@
+import math
+from typing import Iterable, Optional
+
+class EstatisticaUtilidade:
+    @staticmethod
+    def percentil(valores: Iterable[float], p: float) -> Optional[float]:
+        """
+        Percentil pelo método do posto mais próximo: o menor valor que tem ao menos `p` (0 a 1) das amostras
+        abaixo dele ou iguais a ele (ex: p95 de 100 amostras é a 95ª menor). Retorna None sem amostras.
+        """
+        ordenados = sorted(valores)
+        if not ordenados:
+            return None
+        # O arredondamento evita que erros de ponto flutuante (ex: 0.07 * 100 = 7.000000000000001) subam um posto
+        posto = math.ceil(round(p * len(ordenados), 9))
+        return ordenados[min(max(posto, 1), len(ordenados)) - 1]
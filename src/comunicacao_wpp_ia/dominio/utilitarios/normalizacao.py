@@ -0,0 +1,80 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+class NormalizacaoUtilidade:
+    """
+    Normalização de textos usada na comparação por similaridade entre o que o usuário escreveu e os cadastros do produtor.
+    Ex: "Depósito Sede" -> "deposito sede", "Roundup 1,5L" -> "roundup", "Dep. Faz. Sta. Rita" -> "deposito fazenda santa rita".
+    """
+
+    # Quantidades e concentrações (ex: "1,5L", "20 kg", "500ml", "2 sacos", "480 g/L", "50%") não fazem parte do nome do item
+    _PADRAO_QUANTIDADE = re.compile(
+        r"\b\d+(?:[.,]\d+)?\s*(?:%|(?:l|lt|lts|litro|litros|ml|kg|kgs|g|gr|grs|quilo|quilos|ton|sc|saco|sacos|un|und|unid|cx|caixa|caixas|gl|galao|galoes)(?:\s*/\s*(?:l|kg|ha))?\b)"
+    )
+    _PADRAO_PONTUACAO = re.compile(r"[^\w\s]|_")
+    _PADRAO_ESPACOS = re.compile(r"\s+")
+    _PADRAO_NAO_DIGITOS = re.compile(r"\D")
+
+    # Abreviações comuns nas mensagens e nos cadastros do agro
+    ABREVIACOES = {
+        "dep": "deposito",
+        "depo": "deposito",
+        "arm": "armazem",
+        "armz": "armazem",
+        "galp": "galpao",
+        "faz": "fazenda",
+        "sta": "santa",
+        "sto": "santo",
+        "herb": "herbicida",
+        "fung": "fungicida",
+        "inset": "inseticida",
+        "fert": "fertilizante",
+        "adub": "adubo",
+        "trat": "trator",
+        "pulv": "pulverizador",
+        "colh": "colheitadeira",
+    }
+
+    @staticmethod
+    def remover_acentos(texto: str) -> str:
+        decomposto = unicodedata.normalize("NFKD", texto)
+        return "".join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+
+    @staticmethod
+    @lru_cache(maxsize=100000)
+    def normalizar(texto: str) -> str:
+        """
+        Remove acentos, caixa, quantidades com unidade e pontuação, expande abreviações e colapsa os espaços.
+        O resultado é memorizado, então cada nome do catálogo é normalizado uma única vez.
+        Se sobrar apenas a quantidade (ex: "20 kg"), ela é mantida para não devolver um texto vazio.
+        """
+        if not texto:
+            return ""
+
+        base = NormalizacaoUtilidade.remover_acentos(texto).lower()
+        sem_quantidade = NormalizacaoUtilidade._PADRAO_QUANTIDADE.sub(" ", base)
+        if sem_quantidade.strip():
+            base = sem_quantidade
+
+        # Vírgula/ponto decimal já foram tratados acima; o restante da pontuação vira espaço
+        tokens = NormalizacaoUtilidade._PADRAO_PONTUACAO.sub(" ", base).split()
+        tokens = [NormalizacaoUtilidade.ABREVIACOES.get(token, token) for token in tokens]
+        return NormalizacaoUtilidade._PADRAO_ESPACOS.sub(" ", " ".join(tokens)).strip()
+
+    @staticmethod
+    def normalizar_telefone(telefone: str) -> str:
+        """
+        Gera uma chave canônica para telefones brasileiros, para comparar números escritos em formatos diferentes.
+        Ex: "+55 (45) 99999-8888", "045999998888" e "4599998888" -> "4599998888".
+        Remove o que não é dígito, o código do país, o zero do prefixo de operadora e o nono dígito de celulares.
+        """
+        numeros = NormalizacaoUtilidade._PADRAO_NAO_DIGITOS.sub("", telefone or "")
+        if len(numeros) >= 12 and numeros.startswith("55"):
+            numeros = numeros[2:]
+        numeros = numeros.lstrip("0")
+        if len(numeros) == 11 and numeros[2] == "9":
+            numeros = numeros[:2] + numeros[3:]
+        elif len(numeros) == 9 and numeros[0] == "9":
+            numeros = numeros[1:]
+        return numeros
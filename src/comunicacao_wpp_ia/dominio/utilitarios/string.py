@@ -1,7 +1,60 @@
 import re
 from datetime import date, timedelta
+from typing import Any, Optional
 
 class StringUtilidade:
+    _PADRAO_NUMERO = re.compile(r"\d[\d.,]*")
+    _PADRAO_MILHAR_DECIMAL = re.compile(r"\d{1,3}(?:\.\d{3})+,\d+")
+    _PADRAO_MILHAR = re.compile(r"\d{1,3}(?:\.\d{3})+")
+    _PADRAO_DECIMAL_VIRGULA = re.compile(r"\d+,\d+")
+    _PADRAO_DECIMAL_PONTO = re.compile(r"\d+\.\d{1,2}")
+
+    @classmethod
+    def para_numero(cls, texto: Any) -> Optional[float]:
+        """
+        Converte uma quantidade em pt-BR (ex: '12', '10,5', '1.500', '1.500,75 litros') em número.
+        O '.' seguido de exatamente três dígitos é separador de milhar e a ',' é a marca decimal;
+        um '.' seguido de um ou dois dígitos ('10.5') só pode ser decimal.
+        Retorna None quando não há número ou a forma é ambígua (ex: '1,500.5', '2 x 20'), para que a dúvida
+        seja tratada pelo agente ou pelo usuário em vez de gravar um valor errado.
+        """
+        if isinstance(texto, bool):
+            return None
+        if isinstance(texto, (int, float)):
+            return float(texto)
+
+        numeros = [numero.rstrip(".,") for numero in cls._PADRAO_NUMERO.findall(str(texto or ""))]
+        if len(numeros) != 1:
+            return None
+        numero = numeros[0]
+
+        if numero.isdigit():
+            return float(numero)
+        if cls._PADRAO_MILHAR_DECIMAL.fullmatch(numero):
+            return float(numero.replace(".", "").replace(",", "."))
+        if cls._PADRAO_MILHAR.fullmatch(numero):
+            return float(numero.replace(".", ""))
+        if cls._PADRAO_DECIMAL_VIRGULA.fullmatch(numero):
+            return float(numero.replace(",", "."))
+        if cls._PADRAO_DECIMAL_PONTO.fullmatch(numero):
+            return float(numero)
+        return None
+
+    @staticmethod
+    def para_data_informada(valor: Any) -> Optional[date]:
+        """
+        Converte a data recebida do agente ou do extrator: já como date, em YYYY-MM-DD ou em texto livre
+        (DD/MM/YYYY, 'ontem', ...). Retorna None se não houver data.
+        """
+        if not valor:
+            return None
+        if isinstance(valor, date):
+            return valor
+        try:
+            return date.fromisoformat(str(valor).strip())
+        except ValueError:
+            return StringUtilidade.para_data(str(valor))
+
     @staticmethod
     def para_data(texto_data: str) -> date:
         """
@@ -0,0 +1,16 @@
+class TokensUtilidade:
+    """
+    Estimativa de tokens de um texto, usada onde o tokenizador do modelo não está disponível
+    (orçamento das respostas das ferramentas, escolha do modo de extração e tokens simulados dos benchmarks).
+    """
+    # Aproximação usual de ~4 caracteres por token para textos em português
+    CARACTERES_POR_TOKEN = 4
+
+    @staticmethod
+    def estimar(texto: str) -> int:
+        return len(texto or "") // TokensUtilidade.CARACTERES_POR_TOKEN
+
+    @staticmethod
+    def caracteres(tokens: int) -> int:
+        """O tamanho aproximado, em caracteres, de um texto com `tokens` tokens."""
+        return tokens * TokensUtilidade.CARACTERES_POR_TOKEN
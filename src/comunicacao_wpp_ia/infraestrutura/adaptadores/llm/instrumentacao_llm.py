@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.rastro_mensagem import RastroMensagem
+from src.comunicacao_wpp_ia.dominio.utilitarios.estatistica import EstatisticaUtilidade
+
+class _CallbackInstrumentacao(BaseCallbackHandler):
+    """Coleta, de uma execução de agente, as chamadas ao modelo (iterações), os tokens e as ferramentas usadas."""
+    def __init__(self):
+        self.chamadas_llm = 0
+        self.tokens_prompt = 0
+        self.tokens_completion = 0
+        self.ferramentas: List[str] = []
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], **kwargs: Any) -> None:
+        self.chamadas_llm += 1
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        self.chamadas_llm += 1
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        # Preferimos o usage_metadata das mensagens (padrão dos chat models); o llm_output fica como alternativa
+        encontrou_uso = False
+        for geracoes in response.generations:
+            for geracao in geracoes:
+                uso = getattr(getattr(geracao, "message", None), "usage_metadata", None)
+                if uso:
+                    self.tokens_prompt += uso.get("input_tokens", 0)
+                    self.tokens_completion += uso.get("output_tokens", 0)
+                    encontrou_uso = True
+        if not encontrou_uso and response.llm_output:
+            uso = response.llm_output.get("token_usage") or response.llm_output.get("usage") or {}
+            self.tokens_prompt += uso.get("prompt_tokens", 0)
+            self.tokens_completion += uso.get("completion_tokens", 0)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        self.ferramentas.append((serialized or {}).get("name", "desconhecida"))
+
+class _MetricasEtapa:
+    JANELA = 500
+
+    def __init__(self):
+        self.latencias: deque = deque(maxlen=self.JANELA)
+        self.contadores = {"execucoes": 0, "erros": 0, "chamadas_llm": 0, "tokens_prompt": 0, "tokens_completion": 0, "chamadas_ferramentas": 0}
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        estatisticas = dict(self.contadores)
+        for nome, p in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+            valor = EstatisticaUtilidade.percentil(self.latencias, p)
+            estatisticas[nome] = round(valor * 1000, 1) if valor is not None else None
+        execucoes = estatisticas["execucoes"]
+        estatisticas["iteracoes_media"] = round(estatisticas["chamadas_llm"] / execucoes, 2) if execucoes else 0.0
+        return estatisticas
+
+class InstrumentacaoLLM:
+    """
+    Instrumentação das execuções dos agentes, agregada por etapa do fluxo (intenção, extração, construtor, verificador).
+    Cada execução é medida com um callback do LangChain e registrada também no rastro da mensagem em processamento.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._etapas: Dict[str, _MetricasEtapa] = {}
+
+    @contextmanager
+    def medir(self, etapa: str, modelo: str):
+        """Entrega o callback a ser passado na execução e, ao final, contabiliza a latência e o que ele coletou."""
+        callback = _CallbackInstrumentacao()
+        inicio = time.monotonic()
+        erro: Optional[BaseException] = None
+        try:
+            yield callback
+        except BaseException as e:
+            erro = e
+            raise
+        finally:
+            self._registrar(etapa, modelo, time.monotonic() - inicio, callback, erro)
+
+    def _registrar(self, etapa: str, modelo: str, segundos: float, callback: _CallbackInstrumentacao, erro: Optional[BaseException]):
+        with self._lock:
+            metricas = self._etapas.setdefault(etapa, _MetricasEtapa())
+            metricas.latencias.append(segundos)
+            metricas.contadores["execucoes"] += 1
+            metricas.contadores["erros"] += 1 if erro is not None else 0
+            metricas.contadores["chamadas_llm"] += callback.chamadas_llm
+            metricas.contadores["tokens_prompt"] += callback.tokens_prompt
+            metricas.contadores["tokens_completion"] += callback.tokens_completion
+            metricas.contadores["chamadas_ferramentas"] += len(callback.ferramentas)
+
+        RastroMensagem.registrar(
+            etapa=etapa,
+            modelo=modelo,
+            latencia_ms=round(segundos * 1000, 1),
+            iteracoes=callback.chamadas_llm,
+            tokens_prompt=callback.tokens_prompt,
+            tokens_completion=callback.tokens_completion,
+            ferramentas=list(callback.ferramentas),
+            erro=type(erro).__name__ if erro is not None else None,
+        )
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {etapa: metricas.obter_estatisticas() for etapa, metricas in self._etapas.items()}
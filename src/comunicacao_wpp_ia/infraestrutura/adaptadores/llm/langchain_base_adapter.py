@@ -0,0 +1,204 @@
+import json
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Type, TypeVar, Any, Dict, Optional, Tuple
+from pydantic import BaseModel
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain.agents import AgentExecutor
+from langchain.agents.format_scratchpad.tools import format_to_tool_messages
+from langchain.agents.output_parsers.tools import ToolsAgentOutputParser
+from src.comunicacao_wpp_ia.aplicacao.portas.llms import ServicoLLM
+from src.comunicacao_wpp_ia.aplicacao.portas.agente_com_ferramentas import AgenteComFerramentas
+from src.comunicacao_wpp_ia.aplicacao.portas.agente import Agente
+
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.langchain_ferramentas_adapter import AdaptadorLangChainFerramentas
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.resposta_llm_cache import CacheRespostasLLM
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.instrumentacao_llm import InstrumentacaoLLM
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.prazo_llm import PrazoLLM
+
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+
+T = TypeVar('T', bound=BaseModel)
+
+def _medir(instrumentacao: Optional[InstrumentacaoLLM], etapa: str, modelo: str):
+    return instrumentacao.medir(etapa, modelo) if instrumentacao else nullcontext()
+
+def _configuracao(callback: Any) -> Optional[Dict[str, Any]]:
+    return {"callbacks": [callback]} if callback else None
+
+class _ExecutorAgente(Agente[T]):
+    """
+    Renderiza o prompt e invoca o LLM estruturado. Com cache, procura antes a resposta pela chave da chamada
+    e só invoca o LLM em caso de falta. Havendo prazo (PrazoLLM), o que resta dele vai como timeout da requisição.
+    """
+    def __init__(self, prompt: ChatPromptTemplate, llm_estruturado: Any, modelo_saida: Type[T], identificador_modelo: str, cache: Optional[CacheRespostasLLM] = None, etapa: str = "", nome_modelo: str = "", instrumentacao: Optional[InstrumentacaoLLM] = None):
+        self._prompt = prompt
+        self._llm_estruturado = llm_estruturado
+        self._modelo_saida = modelo_saida
+        self._identificador_modelo = identificador_modelo
+        self._schema_saida = modelo_saida.__qualname__ + json.dumps(modelo_saida.model_json_schema(), sort_keys=True)
+        self._cache = cache
+        self._etapa = etapa
+        self._nome_modelo = nome_modelo
+        self._instrumentacao = instrumentacao
+
+    def executar(self, entrada: Any) -> T:
+        with _medir(self._instrumentacao, self._etapa, self._nome_modelo) as callback:
+            return self._executar(entrada, _configuracao(callback))
+
+    def _invocar(self, prompt_renderizado: Any, configuracao: Optional[Dict[str, Any]]) -> T:
+        # Argumentos extras do invoke chegam à requisição do chat model, e o cliente HTTP aceita 'timeout' por requisição
+        restante = PrazoLLM.restante()
+        argumentos = {"timeout": restante} if restante is not None else {}
+        return self._llm_estruturado.invoke(prompt_renderizado, config=configuracao, **argumentos)
+
+    def _executar(self, entrada: Any, configuracao: Optional[Dict[str, Any]]) -> T:
+        prompt_renderizado = self._prompt.invoke(entrada)
+        if self._cache is None:
+            return self._invocar(prompt_renderizado, configuracao)
+
+        chave = self._cache.gerar_chave(
+            self._identificador_modelo,
+            self._schema_saida,
+            [(mensagem.type, mensagem.content) for mensagem in prompt_renderizado.to_messages()]
+        )
+        resultado = self._cache.obter(chave, self._modelo_saida)
+        if resultado is not None:
+            return resultado
+
+        resultado = self._invocar(prompt_renderizado, configuracao)
+        if resultado is not None:
+            self._cache.gravar(chave, resultado)
+        return resultado
+
+class _ExecutorAgenteComFerramentas(AgenteComFerramentas):
+    """
+    Executa o AgentExecutor compartilhado com o remetente desta conversa definido no contexto das ferramentas.
+    Havendo prazo (PrazoLLM), o agente para de iterar quando ele se esgota (max_execution_time).
+    """
+    def __init__(self, executor_langchain: AgentExecutor, remetente: DadosRemetente, etapa: str = "", nome_modelo: str = "", instrumentacao: Optional[InstrumentacaoLLM] = None):
+        self._executor = executor_langchain
+        self._remetente = remetente
+        self._etapa = etapa
+        self._nome_modelo = nome_modelo
+        self._instrumentacao = instrumentacao
+
+    def _executor_no_prazo(self) -> AgentExecutor:
+        restante = PrazoLLM.restante()
+        if restante is None:
+            return self._executor
+        # Cópia rasa, pois o executor compilado é compartilhado entre as conversas
+        return self._executor.model_copy(update={"max_execution_time": restante})
+
+    def executar(self, entradas: Dict[str, Any]) -> str:
+        with _medir(self._instrumentacao, self._etapa, self._nome_modelo) as callback, AdaptadorLangChainFerramentas.com_remetente(self._remetente):
+            resultado = self._executor_no_prazo().invoke(entradas, config=_configuracao(callback))
+        return resultado.get("output", "Não foi possível determinar a resposta final do agente.")
+
+class AdaptadorLangChainBase(ServicoLLM):
+    """
+    Base dos adaptadores da porta ServicoLLM construídos sobre um chat model do LangChain.
+    O que não depende da mensagem é montado uma única vez e reutilizado entre as conversas:
+    - Na inicialização: as ferramentas do agente, sobre o `servico_ferramentas` montado pela aplicação, e o modelo
+      com as ferramentas vinculadas (bind_tools).
+    - Na primeira vez que são pedidos: o modelo com saída estruturada de cada modelo de saída, o agente de
+      cada par de prompts e o AgentExecutor de cada prompt de agente.
+    O remetente é injetado a cada execução pela variável de contexto das ferramentas, e não mais por closures.
+    Com `cache_respostas`, as respostas estruturadas (sem ferramentas) são reaproveitadas para chamadas idênticas.
+    Com `instrumentacao`, cada execução registra latência, tokens, iterações e ferramentas por etapa.
+    """
+    MAX_AGENTES = 128
+    MAX_EXECUTORES = 16
+
+    def __init__(self, llm: BaseChatModel, servico_ferramentas: UtilizarFerramenta, cache_respostas: Optional[CacheRespostasLLM] = None, instrumentacao: Optional[InstrumentacaoLLM] = None):
+        self._llm = llm
+        self._identificador_modelo = json.dumps(llm._identifying_params, sort_keys=True, default=str)
+        self._nome_modelo = getattr(llm, "model_name", None) or llm._llm_type
+        self._cache_respostas = cache_respostas
+        self._instrumentacao = instrumentacao
+        self._ferramentas = AdaptadorLangChainFerramentas(servico_ferramentas).obter_ferramentas()
+        self._llm_com_ferramentas = self._llm.bind_tools(self._ferramentas)
+
+        self._lock = threading.Lock()
+        self._llms_estruturados: Dict[Type[BaseModel], Any] = {}
+        self._agentes: "OrderedDict[Tuple[str, str, Type[BaseModel], str], _ExecutorAgente]" = OrderedDict()
+        self._executores: "OrderedDict[str, AgentExecutor]" = OrderedDict()
+
+    @staticmethod
+    def _obter_ou_criar(cache: "OrderedDict", chave: Any, maximo: int, criar) -> Any:
+        """Busca no cache LRU (o chamador segura o lock) ou cria e guarda o valor."""
+        if chave in cache:
+            cache.move_to_end(chave)
+            return cache[chave]
+        valor = criar()
+        cache[chave] = valor
+        if len(cache) > maximo:
+            cache.popitem(last=False)
+        return valor
+
+    def _criar_agente_estruturado(self, prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T], etapa: str) -> _ExecutorAgente[T]:
+        llm_estruturado = self._llms_estruturados.get(modelo_saida)
+        if llm_estruturado is None:
+            llm_estruturado = self._llm.with_structured_output(modelo_saida, include_raw=False)
+            self._llms_estruturados[modelo_saida] = llm_estruturado
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", prompt_sistema),
+            ("human", prompt_usuario)
+        ])
+        return _ExecutorAgente(
+            prompt, llm_estruturado, modelo_saida, self._identificador_modelo, self._cache_respostas,
+            etapa=etapa, nome_modelo=self._nome_modelo, instrumentacao=self._instrumentacao
+        )
+
+    def _criar_executor(self, prompt_template: str) -> AgentExecutor:
+        print("[ADAPTADOR LLM] Compilando o agente com ferramentas para um novo prompt...")
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", prompt_template),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ])
+
+        cadeia_agente = (
+            {
+                # Mapeia as chaves do dicionário de entrada para as variáveis do prompt
+                "input": lambda x: x.get("input", ""),
+                "dados_iniciais": lambda x: x.get("dados_iniciais", {}),
+                "historico": lambda x: x.get("historico", []),
+                "telefone": lambda x: x.get("telefone", ""),
+                "agent_scratchpad": lambda x: format_to_tool_messages(x.get("intermediate_steps", [])),
+            }
+            | prompt
+            | self._llm_com_ferramentas
+            | ToolsAgentOutputParser()
+        )
+
+        return AgentExecutor(
+            agent=cadeia_agente,
+            tools=self._ferramentas,
+            verbose=True
+        )
+
+    def criar_agente(self, prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T], etapa: Optional[str] = None) -> Agente[T]:
+        etapa = etapa or modelo_saida.__name__
+        with self._lock:
+            return self._obter_ou_criar(
+                self._agentes, (prompt_sistema, prompt_usuario, modelo_saida, etapa), self.MAX_AGENTES,
+                lambda: self._criar_agente_estruturado(prompt_sistema, prompt_usuario, modelo_saida, etapa)
+            )
+
+    def criar_agente_com_ferramentas(self, remetente: DadosRemetente, prompt_template: str, etapa: Optional[str] = None) -> AgenteComFerramentas:
+        """
+        Retorna o agente compilado para o prompt, vinculado ao remetente desta conversa.
+        """
+        with self._lock:
+            executor_langchain = self._obter_ou_criar(
+                self._executores, prompt_template, self.MAX_EXECUTORES,
+                lambda: self._criar_executor(prompt_template)
+            )
+        return _ExecutorAgenteComFerramentas(
+            executor_langchain, remetente,
+            etapa=etapa or "agente_ferramentas", nome_modelo=self._nome_modelo, instrumentacao=self._instrumentacao
+        )
@@ -1,61 +1,65 @@
 import json
+from contextlib import contextmanager
+from contextvars import ContextVar
 from langchain.tools import tool
-from functools import partial
-from typing import List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from src.comunicacao_wpp_ia.aplicacao.portas.ferramentas import Ferramentas
 from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_ferramentas import RepoAgriwinFerramentas
+
+# Remetente da conversa em execução. Cada mensagem é processada em sua própria thread, então o valor
+# definido em `com_remetente` é visto apenas pelas ferramentas chamadas durante aquela execução do agente.
+_remetente_atual: ContextVar[Optional[DadosRemetente]] = ContextVar("remetente_atual", default=None)
 
 class AdaptadorLangChainFerramentas:
     """
     Adaptador que expõe as funcionalidades do ServicoFerramentas no formato
     que a biblioteca LangChain espera.
     
-    Este adaptador agora é responsável por criar ferramentas dinamicamente
-    com o contexto do usuário (remetente) embutido.
+    As ferramentas são criadas uma única vez; o contexto do usuário (remetente) é lido,
+    a cada chamada, da variável de contexto definida por `com_remetente`.
     """
     def __init__(self, servico_ferramentas: Ferramentas):
         self._servico = servico_ferramentas
+        self._ferramentas: Optional[List[Any]] = None
 
-        # O decorador @tool precisa ser aplicado a funções que o LangChain possa inspecionar.
-        # Definimos estas funções dentro do construtor para capturar a instância `_servico`
-        # do nosso serviço de aplicação (closure).
+    @staticmethod
+    @contextmanager
+    def com_remetente(remetente: DadosRemetente) -> Iterator[None]:
+        """
+        Define o remetente usado pelas ferramentas durante o bloco, que também delimita o escopo
+        em que as áreas do produtor são buscadas uma única vez.
+        """
+        token = _remetente_atual.set(remetente)
+        try:
+            with RepoAgriwinFerramentas.escopo_da_mensagem():
+                yield
+        finally:
+            _remetente_atual.reset(token)
 
-    def obter_ferramentas_com_contexto(self, remetente: DadosRemetente) -> List[Any]:
+    @staticmethod
+    def _contexto() -> Dict[str, str]:
         """
-        Retorna a lista de ferramentas prontas para LangChain, com o contexto
-        do remetente (id_produtor, base_url) já injetado via functools.partial.
-        O LLM não verá esses parâmetros, mas eles serão usados na execução.
+        Retorna os parâmetros de contexto (base_url, id_produtor) do remetente em execução.
+        O LLM não vê esses parâmetros, mas eles são usados na execução das ferramentas.
         """
-        # Cria funções parciais, pré-preenchendo os parâmetros de contexto
-        buscar_produto_com_contexto = partial(self._servico.buscar_produto_por_nome, 
-                                            base_url=remetente.base_url, 
-                                            id_produtor=remetente.produtor_id[0])
-        
-        buscar_talhoes_com_contexto = partial(self._servico.buscar_talhoes_disponiveis,
-                                            base_url=remetente.base_url,
-                                            id_produtor=remetente.produtor_id[0])
-        
-        buscar_plantios_com_contexto = partial(self._servico.buscar_plantios_disponiveis,
-                                            base_url=remetente.base_url,
-                                            id_produtor=remetente.produtor_id[0])
-        
-        buscar_propriedades_com_contexto = partial(self._servico.buscar_propriedades_disponiveis,
-                                                base_url=remetente.base_url,
-                                                id_produtor=remetente.produtor_id[0])
-        
-        buscar_maquinas_com_contexto = partial(self._servico.buscar_maquinas_disponiveis,
-                                            base_url=remetente.base_url,
-                                            id_produtor=remetente.produtor_id[0])
-        
-        buscar_pontos_estoque_com_contexto = partial(self._servico.buscar_pontos_de_estoque_disponiveis,
-                                                    base_url=remetente.base_url,
-                                                id_produtor=remetente.produtor_id[0])
-        
-        buscar_safra_com_contexto = partial(self._servico.buscar_safra_disponivel,
-                                            base_url=remetente.base_url,
-                                        id_produtor=remetente.produtor_id[0])
-        
-        solicitar_esclarecimento_com_contexto = partial(self._servico.solicitar_esclarecimento_ao_usuario)
+        remetente = _remetente_atual.get()
+        if remetente is None:
+            raise RuntimeError("Ferramenta chamada fora do contexto de um remetente. Use AdaptadorLangChainFerramentas.com_remetente.")
+        return {"base_url": remetente.base_url, "id_produtor": remetente.produtor_id[0]}
+
+    def obter_ferramentas(self) -> List[Any]:
+        """
+        Retorna a lista de ferramentas prontas para LangChain, criando-as na primeira chamada.
+        """
+        if self._ferramentas is None:
+            self._ferramentas = self._criar_ferramentas()
+        return self._ferramentas
+
+    def _criar_ferramentas(self) -> List[Any]:
+        servico = self._servico
+        contexto = self._contexto
 
         @tool
         def buscar_produto_por_nome(nome_produto: str) -> str:
@@ -70,38 +74,38 @@ class AdaptadorLangChainFerramentas:
             if not nome_produto or not isinstance(nome_produto, str):
                 return json.dumps({"produtos_similares": [], "produtos_em_estoque": [], "produtos_mais_usados": []})
             
-            resultado = buscar_produto_com_contexto(nome_produto=nome_produto)
+            resultado = servico.buscar_produto_por_nome(nome_produto=nome_produto, **contexto())
             return json.dumps(resultado)
 
         @tool
-        def buscar_talhoes_disponiveis() -> str:
+        def buscar_talhoes_disponiveis(nomes_talhoes: Optional[List[str]] = None) -> str:
             """
-            Use esta ferramenta para obter uma lista de TODOS os plantios disponíveis na fazenda do produtor.
-            A IA deve então usar esta lista para encontrar o(s) ID(s) dos plantios que correspondem ao talhão que o usuário mencionou (pode ser mais de um).
-            Retorna um JSON string com a lista de TODOS os plantios disponíveis.
+            Use esta ferramenta para encontrar os plantios dos talhões que o usuário mencionou. Passe em 'nomes_talhoes' os nomes mencionados (ex: ['talhão 3', 'gleba sul']).
+            Retorna uma tabela compacta (colunas separadas por '|') com os plantios mais similares a cada nome, do maior para o menor 'score' (100 = nome exato).
+            A IA deve usar esta tabela para encontrar o(s) ID(s) dos plantios que correspondem ao talhão mencionado (pode ser mais de um).
+            Sem 'nomes_talhoes', lista os plantios do produtor até o limite de tamanho da resposta.
             """
-            resultados = buscar_talhoes_com_contexto()
-            return json.dumps(resultados)
+            return servico.buscar_talhoes_disponiveis(nomes_talhoes=nomes_talhoes, **contexto())
         
         @tool
-        def buscar_plantios_disponiveis() -> str:
+        def buscar_plantios_disponiveis(nomes_plantios: Optional[List[str]] = None) -> str:
             """
-            Use esta ferramenta para obter uma lista de TODOS os plantios disponíveis na fazenda do produtor. 
-            A IA deve então usar esta lista para encontrar o(s) ID(s) do plantio(s) que o usuário mencionou (pode ser mais de um).
-            Retorna um JSON string com a lista de TODOS os plantios disponíveis.
+            Use esta ferramenta para encontrar os plantios que o usuário mencionou. Passe em 'nomes_plantios' os nomes mencionados (ex: ['soja do talhão 3']).
+            Retorna uma tabela compacta (colunas separadas por '|') com os plantios mais similares a cada nome, do maior para o menor 'score' (100 = nome exato).
+            A IA deve usar esta tabela para encontrar o(s) ID(s) do plantio(s) que o usuário mencionou (pode ser mais de um).
+            Sem 'nomes_plantios', lista os plantios do produtor até o limite de tamanho da resposta.
             """
-            resultados = buscar_plantios_com_contexto()
-            return json.dumps(resultados)
+            return servico.buscar_plantios_disponiveis(nomes_plantios=nomes_plantios, **contexto())
 
         @tool
-        def buscar_propriedades_disponiveis() -> str:
+        def buscar_propriedades_disponiveis(nomes_propriedades: Optional[List[str]] = None) -> str:
             """
-            Use esta ferramenta para obter uma lista de TODAS as propriedades (fazendas) disponíveis para o produtor.
-            A IA deve usar esta lista para encontrar o(s) ID(s) da(s) propriedade(s) que o usuário mencionou (pode ser mais de uma).
-            Retorna um JSON string com a lista de TODAS as propriedades disponíveis.
+            Use esta ferramenta para encontrar as propriedades (fazendas) que o usuário mencionou. Passe em 'nomes_propriedades' os nomes mencionados (ex: ['fazenda boa vista']).
+            Retorna uma tabela compacta (colunas separadas por '|') com as propriedades mais similares a cada nome, do maior para o menor 'score' (100 = nome exato).
+            A IA deve usar esta tabela para encontrar o(s) ID(s) da(s) propriedade(s) que o usuário mencionou (pode ser mais de uma).
+            Sem 'nomes_propriedades', lista as propriedades do produtor até o limite de tamanho da resposta.
             """
-            resultados = buscar_propriedades_com_contexto()
-            return json.dumps(resultados)
+            return servico.buscar_propriedades_disponiveis(nomes_propriedades=nomes_propriedades, **contexto())
 
         @tool
         def buscar_maquinas_disponiveis(nome_maquina: str) -> str:
@@ -115,7 +119,7 @@ class AdaptadorLangChainFerramentas:
             """
             if not nome_maquina or not isinstance(nome_maquina, str):
                 return json.dumps([])
-            resultado = buscar_maquinas_com_contexto(nome_maquina=nome_maquina)
+            resultado = servico.buscar_maquinas_disponiveis(nome_maquina=nome_maquina, **contexto())
             return json.dumps(resultado)
 
         @tool
@@ -124,22 +128,40 @@ class AdaptadorLangChainFerramentas:
             Use esta ferramenta para encontrar o ID do ponto de estoque (depósito) que o usuário mencionou. Forneça o nome mencionado para encontrar o melhor candidato.
             - Se o usuário mencionou um nome (ex: 'depósito da sede'), passe a string para o parâmetro 'nome_ponto_estoque'. A ferramenta retornará uma lista de pontos de estoque com nome similar ou vazia.
             - Se o usuário NÃO mencionou um ponto de estoque, chame a ferramenta sem nenhum parâmetro (deixe como None).
+            - Cada ponto retornado traz 'score', 'criterio' e 'empatado'. Se mais de um vier com 'empatado' = true, pergunte ao usuário qual deles usar.
+            - Se os pontos vierem com 'requer_confirmacao' = true, o primeiro ('criterio' = 'mais_usado') é só uma sugestão e os demais são alternativas: confirme com o usuário qual usar antes de prosseguir.
             """
-            resultado = buscar_pontos_estoque_com_contexto(nome_ponto_estoque=nome_ponto_estoque)
+            resultado = servico.buscar_pontos_de_estoque_disponiveis(nome_ponto_estoque=nome_ponto_estoque, **contexto())
             return json.dumps(resultado)
 
         @tool
-        def buscar_safra_disponivel(nome_safra: Optional[str] = None) -> str:
+        def buscar_safra_disponivel(nome_safra: Optional[str] = None, data_aplicacao: Optional[str] = None) -> str:
             """
             Use esta ferramenta para encontrar a safra. 
             - Se o usuário mencionou um período (ex: 'safra 24/25', '2023/2024'), passe a string para o parâmetro 'nome_safra'.
-            - Se o usuário NÃO mencionou um período de safra, chame a ferramenta sem nenhum parâmetro para obter a safra atual com base na data de hoje.
+            - Se o usuário NÃO mencionou um período de safra, não passe 'nome_safra'. Passe em 'data_aplicacao' a data da aplicação dos `dados_iniciais` (formato YYYY-MM-DD), para obter a safra ativa naquela data. Sem data, a ferramenta usa a data de hoje.
 
             Retorna um JSON string com a safra encontrada (pelo nome ou a safra ativa).
             """
-            resultado = buscar_safra_com_contexto(nome_safra=nome_safra)
+            resultado = servico.buscar_safra_disponivel(nome_safra=nome_safra, data_aplicacao=data_aplicacao, **contexto())
             return resultado
         
+        @tool
+        def resolver_itens_do_consumo(consumo_informado: ConsumoInformado) -> str:
+            """
+            Use esta ferramenta PRIMEIRO, passando os `dados_iniciais` completos (atualizados com o que o usuário respondeu no histórico).
+            Ela busca de uma só vez todos os produtos, máquinas, talhões/plantios/propriedades, o ponto de estoque e a safra.
+            Para cada menção retorna 'status':
+            - 'unico': use o 'id' retornado diretamente, sem chamar outras ferramentas para esse item.
+            - 'ambiguo': há mais de um candidato em 'candidatos'; use `solicitar_esclarecimento_ao_usuario` listando as opções.
+            - 'nao_encontrado': tente a ferramenta específica do item com outro termo, ou pergunte ao usuário.
+            Retorna um JSON string com a resolução de todos os itens, a 'data_aplicacao' e o 'tipo_rateio'.
+            """
+            if isinstance(consumo_informado, dict):
+                consumo_informado = ConsumoInformado.model_validate(consumo_informado)
+            resultado = servico.resolver_itens_do_consumo(consumo_informado=consumo_informado, **contexto())
+            return json.dumps(resultado)
+
         @tool
         def solicitar_esclarecimento_ao_usuario(pergunta: str) -> str:
             """
@@ -147,7 +169,7 @@ class AdaptadorLangChainFerramentas:
             A sua resposta final para o usuário será o texto que você passar para o parâmetro 'pergunta'.
             NÃO use esta ferramenta para pedir informações que estão faltando; use-a apenas para resolver ambiguidades.
             """
-            return solicitar_esclarecimento_com_contexto(pergunta=pergunta)
+            return servico.solicitar_esclarecimento_ao_usuario(pergunta=pergunta)
 
         ferramentas: List[Any] = [
             buscar_produto_por_nome,
@@ -157,6 +179,7 @@ class AdaptadorLangChainFerramentas:
             buscar_maquinas_disponiveis,
             buscar_pontos_de_estoque_disponiveis,
             buscar_safra_disponivel,
+            resolver_itens_do_consumo,
             solicitar_esclarecimento_ao_usuario
         ]
 
@@ -0,0 +1,31 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Instante (time.monotonic) em que a chamada ao LLM em andamento deixa de interessar a quem a pediu
+_limite_atual: ContextVar[Optional[float]] = ContextVar("prazo_llm_limite", default=None)
+
+class PrazoLLM:
+    """
+    Prazo da chamada ao LLM em andamento, definido por quem a aplica (ex: o AdaptadorLLMResiliente) e lido pelos
+    adaptadores, que o repassam ao provedor (timeout da requisição, tempo máximo do agente). Assim a chamada
+    abandonada por estourar o prazo também termina do lado do provedor, em vez de seguir ocupando uma thread.
+    """
+    @staticmethod
+    @contextmanager
+    def definir(limite: float):
+        """Define o instante limite (time.monotonic) das chamadas feitas dentro do bloco."""
+        token = _limite_atual.set(limite)
+        try:
+            yield
+        finally:
+            _limite_atual.reset(token)
+
+    @staticmethod
+    def restante(minimo: float = 0.1) -> Optional[float]:
+        """Segundos que faltam para o prazo (nunca menos que `minimo`), ou None se não houver prazo."""
+        limite = _limite_atual.get()
+        if limite is None:
+            return None
+        return max(limite - time.monotonic(), minimo)
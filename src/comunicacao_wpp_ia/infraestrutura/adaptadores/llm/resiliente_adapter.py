@@ -0,0 +1,227 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Type, TypeVar, Any, Dict, List, Optional, Callable, Set, Tuple
+from pydantic import BaseModel
+from src.comunicacao_wpp_ia.aplicacao.portas.llms import ServicoLLM
+from src.comunicacao_wpp_ia.aplicacao.portas.agente import Agente
+from src.comunicacao_wpp_ia.aplicacao.portas.agente_com_ferramentas import AgenteComFerramentas
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.utilitarios.estatistica import EstatisticaUtilidade
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.prazo_llm import PrazoLLM
+
+T = TypeVar('T', bound=BaseModel)
+
+class _MetricasProvedor:
+    """Contadores e janela das latências recentes de um provedor, para os percentis de cauda."""
+    JANELA = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencias: deque = deque(maxlen=self.JANELA)
+        self._contadores = {"chamadas": 0, "sucessos": 0, "falhas": 0, "prazos_estourados": 0, "hedges_lancados": 0, "hedges_vencedores": 0, "failovers": 0, "abandonadas": 0}
+        # Chamadas abandonadas (prazo estourado ou hedge perdedor) que ainda ocupam uma thread do provedor
+        self._abandonadas_em_andamento = 0
+
+    def incrementar(self, contador: str):
+        with self._lock:
+            self._contadores[contador] += 1
+
+    def registrar_abandono(self, futuro: Future):
+        """Conta a chamada abandonada que não pôde ser cancelada (já em execução) até ela terminar."""
+        with self._lock:
+            self._contadores["abandonadas"] += 1
+            self._abandonadas_em_andamento += 1
+        futuro.add_done_callback(lambda _: self._finalizar_abandonada())
+
+    def _finalizar_abandonada(self):
+        with self._lock:
+            self._abandonadas_em_andamento -= 1
+
+    def registrar_latencia(self, segundos: float):
+        with self._lock:
+            self._latencias.append(segundos)
+
+    def percentil(self, p: float, minimo_amostras: int = 1) -> Optional[float]:
+        with self._lock:
+            latencias = list(self._latencias)
+        if len(latencias) < minimo_amostras:
+            return None
+        return EstatisticaUtilidade.percentil(latencias, p)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            estatisticas = dict(self._contadores)
+            estatisticas["amostras_latencia"] = len(self._latencias)
+            estatisticas["abandonadas_em_andamento"] = self._abandonadas_em_andamento
+        for nome, p in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+            valor = self.percentil(p)
+            estatisticas[nome] = round(valor * 1000, 1) if valor is not None else None
+        return estatisticas
+
+class _AgenteResiliente(Agente[T]):
+    """Agente de saída estruturada que delega ao AdaptadorLLMResiliente o prazo, o hedge e o failover."""
+    def __init__(self, adaptador: "AdaptadorLLMResiliente", prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T], etapa: Optional[str]):
+        self._adaptador = adaptador
+        self._argumentos = (prompt_sistema, prompt_usuario, modelo_saida, etapa)
+
+    def executar(self, entrada: Any) -> T:
+        return self._adaptador._executar(
+            "estruturado",
+            lambda provedor: provedor.criar_agente(*self._argumentos).executar(entrada),
+            permitir_hedge=True
+        )
+
+class _AgenteComFerramentasResiliente(AgenteComFerramentas):
+    """Agente com ferramentas que delega ao AdaptadorLLMResiliente o prazo e o failover (sem hedge)."""
+    def __init__(self, adaptador: "AdaptadorLLMResiliente", remetente: DadosRemetente, prompt_template: str, etapa: Optional[str]):
+        self._adaptador = adaptador
+        self._remetente = remetente
+        self._prompt_template = prompt_template
+        self._etapa = etapa
+
+    def executar(self, entradas: Dict[str, Any]) -> str:
+        return self._adaptador._executar(
+            "ferramentas",
+            lambda provedor: provedor.criar_agente_com_ferramentas(self._remetente, self._prompt_template, self._etapa).executar(entradas),
+            permitir_hedge=False
+        )
+
+class AdaptadorLLMResiliente(ServicoLLM):
+    """
+    Decorador da porta ServicoLLM sobre uma lista ordenada de provedores (ex: OpenAI e, como reserva, Groq).
+    - Prazo por operação: cada tentativa de um provedor tem `prazo_estruturado` ou `prazo_ferramentas` segundos;
+      estourado o prazo, a resposta é abandonada e a chamada segue para o próximo provedor (failover).
+      O prazo é repassado ao provedor (PrazoLLM), para que a chamada abandonada também termine do lado dele.
+    - Cada provedor tem o seu pool de threads (`max_workers_por_provedor`): chamadas presas num provedor lento
+      não esgotam as threads do provedor reserva.
+    - Hedge (opcional, só para saídas estruturadas, que não têm efeitos colaterais): se a resposta não chega
+      até o p95 observado do provedor, uma segunda requisição é disparada no próximo provedor que ainda não
+      falhou na operação e vale a primeira que responder; sem um provedor assim, não há hedge. O agente com
+      ferramentas não é duplicado, pois cada execução faz várias chamadas ao modelo e à API do Agriwin.
+    - Métricas por provedor: chamadas, falhas, prazos estourados, hedges, failovers, chamadas abandonadas
+      (total e ainda em andamento) e latências p50/p95/p99.
+    """
+    MINIMO_AMOSTRAS_HEDGE = 20
+
+    def __init__(self, provedores: List[Tuple[str, ServicoLLM]], prazo_estruturado: float = 30.0, prazo_ferramentas: float = 90.0, hedge: bool = False, hedge_minimo_segundos: float = 2.0, max_workers_por_provedor: int = 16):
+        if not provedores:
+            raise ValueError("É necessário informar ao menos um provedor de LLM.")
+        self._provedores = provedores
+        self._prazos = {"estruturado": prazo_estruturado, "ferramentas": prazo_ferramentas}
+        self._hedge = hedge
+        self._hedge_minimo_segundos = hedge_minimo_segundos
+        self._metricas = {nome: _MetricasProvedor() for nome, _ in provedores}
+        # As chamadas rodam em threads próprias para que o prazo possa ser aplicado sem bloquear quem chamou
+        self._executores = {nome: ThreadPoolExecutor(max_workers=max_workers_por_provedor, thread_name_prefix=f"llm-{nome}") for nome, _ in provedores}
+        nomes = " -> ".join(nome for nome, _ in provedores)
+        print(f"[INFRA] Adaptador LLM resiliente inicializado (provedores={nomes}, prazos={self._prazos}, hedge={hedge}).")
+
+    def criar_agente(self, prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T], etapa: Optional[str] = None) -> Agente[T]:
+        return _AgenteResiliente(self, prompt_sistema, prompt_usuario, modelo_saida, etapa)
+
+    def criar_agente_com_ferramentas(self, remetente: DadosRemetente, prompt_template: str, etapa: Optional[str] = None) -> AgenteComFerramentas:
+        return _AgenteComFerramentasResiliente(self, remetente, prompt_template, etapa)
+
+    def _submeter(self, nome: str, provedor: ServicoLLM, chamada: Callable[[ServicoLLM], Any], limite: float) -> Future:
+        metricas = self._metricas[nome]
+        metricas.incrementar("chamadas")
+
+        def executar():
+            inicio = time.monotonic()
+            try:
+                with PrazoLLM.definir(limite):
+                    resultado = chamada(provedor)
+            except Exception:
+                metricas.incrementar("falhas")
+                raise
+            # A latência é registrada mesmo quando a resposta chega tarde demais, para refletir o provedor
+            metricas.registrar_latencia(time.monotonic() - inicio)
+            metricas.incrementar("sucessos")
+            return resultado
+
+        # Copia o contexto para que a chamada enxergue o rastro da mensagem em processamento
+        return self._executores[nome].submit(contextvars.copy_context().run, executar)
+
+    def _abandonar(self, futuro: Future, nome: str):
+        # cancel() só impede as chamadas que ainda não começaram; as demais seguem até o prazo repassado ao provedor
+        if not futuro.cancel():
+            self._metricas[nome].registrar_abandono(futuro)
+
+    def _limite_hedge(self, nome: str) -> Optional[float]:
+        p95 = self._metricas[nome].percentil(0.95, minimo_amostras=self.MINIMO_AMOSTRAS_HEDGE)
+        if p95 is None:
+            return None
+        return max(p95, self._hedge_minimo_segundos)
+
+    def _provedor_hedge(self, indice: int, indisponiveis: Set[str]) -> Optional[Tuple[str, ServicoLLM]]:
+        """O próximo provedor depois do atual que ainda não falhou nem estourou o prazo na operação, se houver."""
+        for nome, provedor in self._provedores[indice + 1:]:
+            if nome not in indisponiveis:
+                return nome, provedor
+        return None
+
+    def _executar(self, operacao: str, chamada: Callable[[ServicoLLM], Any], permitir_hedge: bool) -> Any:
+        prazo = self._prazos[operacao]
+        ultimo_erro: Optional[BaseException] = None
+        # Provedores que falharam ou estouraram o prazo nesta operação, que não recebem o hedge
+        indisponiveis: Set[str] = set()
+
+        for indice, (nome, provedor) in enumerate(self._provedores):
+            if indice > 0:
+                print(f"[LLM RESILIENTE] Failover da operação '{operacao}' para o provedor '{nome}'.")
+                self._metricas[nome].incrementar("failovers")
+
+            inicio = time.monotonic()
+            limite = inicio + prazo
+            pendentes: Dict[Future, str] = {self._submeter(nome, provedor, chamada, limite): nome}
+            futuro_hedge: Optional[Future] = None
+
+            alvo_hedge = self._provedor_hedge(indice, indisponiveis) if self._hedge and permitir_hedge else None
+            limite_hedge = self._limite_hedge(nome) if alvo_hedge is not None else None
+            if limite_hedge is not None and limite_hedge < prazo:
+                concluidos, _ = wait(list(pendentes), timeout=limite_hedge)
+                if not concluidos:
+                    nome_hedge, provedor_hedge = alvo_hedge
+                    print(f"[LLM RESILIENTE] '{nome}' passou do p95 ({limite_hedge:.2f}s). Disparando hedge em '{nome_hedge}'.")
+                    self._metricas[nome].incrementar("hedges_lancados")
+                    futuro_hedge = self._submeter(nome_hedge, provedor_hedge, chamada, limite)
+                    pendentes[futuro_hedge] = nome_hedge
+
+            while pendentes:
+                restante = limite - time.monotonic()
+                concluidos, _ = wait(list(pendentes), timeout=max(restante, 0), return_when=FIRST_COMPLETED)
+                if not concluidos:
+                    break
+                for futuro in concluidos:
+                    nome_futuro = pendentes.pop(futuro)
+                    if futuro.exception() is not None:
+                        ultimo_erro = futuro.exception()
+                        indisponiveis.add(nome_futuro)
+                        print(f"[LLM RESILIENTE WARNING] Provedor '{nome_futuro}' falhou na operação '{operacao}': {ultimo_erro}")
+                        continue
+                    # A requisição que perdeu a corrida é abandonada (cancelada, se ainda não começou)
+                    for outro_futuro, nome_outro in pendentes.items():
+                        self._abandonar(outro_futuro, nome_outro)
+                    if futuro is futuro_hedge:
+                        self._metricas[nome].incrementar("hedges_vencedores")
+                    return futuro.result()
+
+            for futuro, nome_futuro in pendentes.items():
+                self._abandonar(futuro, nome_futuro)
+                self._metricas[nome_futuro].incrementar("prazos_estourados")
+                indisponiveis.add(nome_futuro)
+            if pendentes:
+                ultimo_erro = TimeoutError(f"O provedor '{nome}' não respondeu a operação '{operacao}' em {prazo:g}s.")
+                print(f"[LLM RESILIENTE WARNING] {ultimo_erro}")
+
+        raise ultimo_erro or RuntimeError(f"Nenhum provedor de LLM respondeu a operação '{operacao}'.")
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        return {
+            "prazos_segundos": dict(self._prazos),
+            "hedge": self._hedge,
+            "provedores": {nome: metricas.obter_estatisticas() for nome, metricas in self._metricas.items()},
+        }
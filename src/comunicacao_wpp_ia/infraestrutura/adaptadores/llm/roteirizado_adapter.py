@@ -0,0 +1,184 @@
+import json
+import math
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Type, TypeVar, Any, Dict, List, Optional
+from pydantic import BaseModel
+from langchain_core.outputs import LLMResult
+from src.comunicacao_wpp_ia.aplicacao.portas.llms import ServicoLLM
+from src.comunicacao_wpp_ia.aplicacao.portas.agente import Agente
+from src.comunicacao_wpp_ia.aplicacao.portas.agente_com_ferramentas import AgenteComFerramentas
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.langchain_ferramentas_adapter import AdaptadorLangChainFerramentas
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.instrumentacao_llm import InstrumentacaoLLM
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.utilitarios.tokens import TokensUtilidade
+
+T = TypeVar('T', bound=BaseModel)
+
+class DistribuicaoLatencia:
+    """
+    Latência injetada em cada chamada simulada ao modelo, em milissegundos.
+    Tipos: 'fixa' (ms), 'uniforme' (min_ms, max_ms), 'normal' (media_ms, desvio_ms) e
+    'lognormal' (mediana_ms, sigma), esta última a mais próxima da cauda longa das APIs de LLM.
+    """
+    def __init__(self, tipo: str = "fixa", **parametros: float):
+        if tipo not in ("fixa", "uniforme", "normal", "lognormal"):
+            raise ValueError(f"Tipo de distribuição de latência desconhecido: '{tipo}'.")
+        self.tipo = tipo
+        self.parametros = parametros
+
+    @classmethod
+    def de_dict(cls, dados: Optional[Dict[str, Any]]) -> "DistribuicaoLatencia":
+        if not dados:
+            return cls("fixa", ms=0)
+        dados = dict(dados)
+        return cls(dados.pop("tipo", "fixa"), **dados)
+
+    def amostrar(self, gerador: random.Random) -> float:
+        """Retorna uma latência em segundos."""
+        p = self.parametros
+        if self.tipo == "fixa":
+            ms = p.get("ms", 0)
+        elif self.tipo == "uniforme":
+            ms = gerador.uniform(p["min_ms"], p["max_ms"])
+        elif self.tipo == "normal":
+            ms = gerador.gauss(p["media_ms"], p["desvio_ms"])
+        else:
+            ms = gerador.lognormvariate(math.log(p["mediana_ms"]), p.get("sigma", 0.5))
+        return max(ms, 0) / 1000
+
+class _EtapaRoteiro:
+    """As respostas gravadas de uma etapa, entregues em ordem e de forma cíclica, e a latência da etapa."""
+    def __init__(self, nome: str, dados: Dict[str, Any], latencia_padrao: DistribuicaoLatencia):
+        if not dados.get("respostas"):
+            raise ValueError(f"A etapa '{nome}' do roteiro não tem respostas.")
+        self.nome = nome
+        self.respostas: List[Any] = dados["respostas"]
+        self.latencia = DistribuicaoLatencia.de_dict(dados["latencia"]) if "latencia" in dados else latencia_padrao
+        self._proxima = 0
+        self._lock = threading.Lock()
+
+    def proxima_resposta(self) -> Any:
+        with self._lock:
+            resposta = self.respostas[self._proxima % len(self.respostas)]
+            self._proxima += 1
+        return resposta
+
+def _simular_chamada_llm(callback: Any, etapa: _EtapaRoteiro, gerador: random.Random, lock_gerador: threading.Lock, entrada: str, saida: str):
+    """Espera a latência sorteada e emite os mesmos eventos de callback de uma chamada real ao modelo."""
+    with lock_gerador:
+        latencia = etapa.latencia.amostrar(gerador)
+    if callback:
+        callback.on_llm_start({}, [entrada])
+    time.sleep(latencia)
+    if callback:
+        callback.on_llm_end(LLMResult(generations=[], llm_output={"token_usage": {
+            "prompt_tokens": TokensUtilidade.estimar(entrada),
+            "completion_tokens": TokensUtilidade.estimar(saida),
+        }}))
+
+class _AgenteRoteirizado(Agente[T]):
+    def __init__(self, adaptador: "AdaptadorLLMRoteirizado", etapa: _EtapaRoteiro, prompt: str, modelo_saida: Type[T]):
+        self._adaptador = adaptador
+        self._etapa = etapa
+        self._prompt = prompt
+        self._modelo_saida = modelo_saida
+
+    def executar(self, entrada: Any) -> T:
+        resposta = self._etapa.proxima_resposta()
+        with self._adaptador._medir(self._etapa.nome) as callback:
+            _simular_chamada_llm(callback, self._etapa, self._adaptador._gerador, self._adaptador._lock_gerador,
+                                 self._prompt + json.dumps(entrada, ensure_ascii=False, default=str), json.dumps(resposta, ensure_ascii=False))
+            return self._modelo_saida.model_validate(resposta)
+
+class _AgenteComFerramentasRoteirizado(AgenteComFerramentas):
+    """
+    Reproduz uma sequência gravada de chamadas de ferramentas: cada item de 'iteracoes' é uma chamada ao modelo
+    que pede uma ou mais ferramentas; a última chamada devolve a 'resposta_final'.
+    """
+    def __init__(self, adaptador: "AdaptadorLLMRoteirizado", etapa: _EtapaRoteiro, remetente: DadosRemetente, prompt: str):
+        self._adaptador = adaptador
+        self._etapa = etapa
+        self._remetente = remetente
+        self._prompt = prompt
+
+    def executar(self, entradas: Dict[str, Any]) -> str:
+        resposta = self._etapa.proxima_resposta()
+        resposta_final = resposta.get("resposta_final", "")
+        if not isinstance(resposta_final, str):
+            resposta_final = json.dumps(resposta_final, ensure_ascii=False)
+
+        contexto = self._prompt + json.dumps(entradas, ensure_ascii=False, default=str)
+        with self._adaptador._medir(self._etapa.nome) as callback, AdaptadorLangChainFerramentas.com_remetente(self._remetente):
+            for chamadas in resposta.get("iteracoes", []):
+                _simular_chamada_llm(callback, self._etapa, self._adaptador._gerador, self._adaptador._lock_gerador,
+                                     contexto, json.dumps(chamadas, ensure_ascii=False))
+                for chamada in chamadas:
+                    # Os resultados voltam ao modelo na próxima iteração, como no AgentExecutor
+                    contexto += self._adaptador._executar_ferramenta(callback, chamada["ferramenta"], chamada.get("argumentos", {}))
+            _simular_chamada_llm(callback, self._etapa, self._adaptador._gerador, self._adaptador._lock_gerador, contexto, resposta_final)
+        return resposta_final
+
+class AdaptadorLLMRoteirizado(ServicoLLM):
+    """
+    Implementação da porta ServicoLLM que responde a partir de um roteiro de respostas gravadas, sem rede,
+    para testes de carga e benchmarks do fluxo completo do ServicoConversa.
+    - Saídas estruturadas: cada etapa (ex: 'intencao_extracao') tem uma lista de respostas, validadas no modelo de saída.
+    - Agente com ferramentas (ex: 'construtor'): as sequências de chamadas de ferramentas são executadas de fato
+      sobre o `servico_ferramentas` informado (ex: um repositório em memória); sem ele, só a latência é simulada.
+    - Cada chamada simulada ao modelo espera uma latência sorteada da distribuição da etapa, com semente fixa,
+      e emite os eventos de callback de tokens e ferramentas para a InstrumentacaoLLM.
+
+    Formato do roteiro (dict ou arquivo JSON):
+        {
+            "semente": 42,
+            "latencia_padrao": {"tipo": "lognormal", "mediana_ms": 800, "sigma": 0.4},
+            "etapas": {
+                "intencao_extracao": {"respostas": [{"intencao_valida": true, "justificativa": "", "consumo_informado": {...}}]},
+                "construtor": {
+                    "latencia": {"tipo": "uniforme", "min_ms": 600, "max_ms": 1500},
+                    "respostas": [{"iteracoes": [[{"ferramenta": "resolver_itens_do_consumo", "argumentos": {...}}]], "resposta_final": {...}}]
+                }
+            }
+        }
+    """
+    def __init__(self, roteiro: Dict[str, Any], servico_ferramentas: Optional[UtilizarFerramenta] = None, instrumentacao: Optional[InstrumentacaoLLM] = None):
+        latencia_padrao = DistribuicaoLatencia.de_dict(roteiro.get("latencia_padrao"))
+        self._etapas = {nome: _EtapaRoteiro(nome, dados, latencia_padrao) for nome, dados in roteiro.get("etapas", {}).items()}
+        self._gerador = random.Random(roteiro.get("semente", 0))
+        self._lock_gerador = threading.Lock()
+        self._instrumentacao = instrumentacao
+        self._ferramentas = {}
+        if servico_ferramentas:
+            self._ferramentas = {ferramenta.name: ferramenta for ferramenta in AdaptadorLangChainFerramentas(servico_ferramentas).obter_ferramentas()}
+        print(f"[INFRA] Adaptador LLM roteirizado inicializado (etapas={list(self._etapas)}, ferramentas={'reais' if self._ferramentas else 'simuladas'}).")
+
+    @classmethod
+    def de_arquivo(cls, caminho: str, **kwargs: Any) -> "AdaptadorLLMRoteirizado":
+        with open(caminho, encoding="utf-8") as arquivo:
+            return cls(json.load(arquivo), **kwargs)
+
+    def _obter_etapa(self, etapa: str) -> _EtapaRoteiro:
+        if etapa not in self._etapas:
+            raise ValueError(f"O roteiro não tem respostas para a etapa '{etapa}'.")
+        return self._etapas[etapa]
+
+    def _medir(self, etapa: str):
+        return self._instrumentacao.medir(etapa, "roteiro") if self._instrumentacao else nullcontext()
+
+    def _executar_ferramenta(self, callback: Any, nome: str, argumentos: Dict[str, Any]) -> str:
+        if callback:
+            callback.on_tool_start({"name": nome}, json.dumps(argumentos, ensure_ascii=False))
+        ferramenta = self._ferramentas.get(nome)
+        if ferramenta is None:
+            return ""
+        return str(ferramenta.invoke(argumentos))
+
+    def criar_agente(self, prompt_sistema: str, prompt_usuario: str, modelo_saida: Type[T], etapa: Optional[str] = None) -> Agente[T]:
+        return _AgenteRoteirizado(self, self._obter_etapa(etapa or modelo_saida.__name__), prompt_sistema + prompt_usuario, modelo_saida)
+
+    def criar_agente_com_ferramentas(self, remetente: DadosRemetente, prompt_template: str, etapa: Optional[str] = None) -> AgenteComFerramentas:
+        return _AgenteComFerramentasRoteirizado(self, self._obter_etapa(etapa or "agente_ferramentas"), remetente, prompt_template)
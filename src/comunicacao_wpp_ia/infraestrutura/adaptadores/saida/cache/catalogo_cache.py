@@ -0,0 +1,191 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+ChaveCatalogo = Tuple[str, str, str]
+
+class _EntradaCatalogo:
+    __slots__ = ("valor", "tamanho", "expira_em")
+
+    def __init__(self, valor: Any, tamanho: int, expira_em: float):
+        self.valor = valor
+        self.tamanho = tamanho
+        self.expira_em = expira_em
+
+class CacheCatalogo:
+    """
+    Cache em memória dos catálogos de um produtor (produtos, máquinas, áreas, etc.), já mapeados para objetos de domínio.
+    - A chave é (base_url, id_produtor, recurso) e cada recurso tem seu próprio TTL.
+    - O total de itens guardados é limitado; ao ultrapassar o limite, os catálogos usados há mais tempo são descartados (LRU).
+      O limite conta itens de catálogo (objetos de domínio), não memória: os índices e demais valores guardados junto com
+      um CatalogoIndexado crescem com o número de itens, mas não são contados à parte.
+    - Após o TTL, o catálogo ainda é servido (obsoleto) por uma janela limitada enquanto é recarregado em segundo plano.
+    - Cargas concorrentes da mesma chave são unificadas (single-flight): apenas uma requisição à API é feita e as demais aguardam seu resultado.
+    - Os valores retornados são compartilhados entre as chamadas e não devem ser alterados por quem os consome.
+    """
+    TTLS_PADRAO = {
+        "produtos": 600,
+        "maquinas": 1800,
+        "pontos_estoque": 1800,
+        "safras": 3600,
+        "areas": 1800,
+        "pessoas": 1800,
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, int]] = None, ttl_padrao: int = 600, max_itens: Optional[int] = None, janela_obsoleto: Optional[int] = None):
+        # TTL por recurso: parâmetro explícito > variável de ambiente (ex: CATALOGO_TTL_PRODUTOS) > padrão
+        self._ttls = {recurso: int(os.getenv(f"CATALOGO_TTL_{recurso.upper()}", ttl)) for recurso, ttl in self.TTLS_PADRAO.items()}
+        self._ttls.update(ttls or {})
+        self._ttl_padrao = ttl_padrao
+        self._max_itens = max_itens if max_itens is not None else int(os.getenv("CATALOGO_CACHE_MAX_ITENS", 200000))
+        self._janela_obsoleto = janela_obsoleto if janela_obsoleto is not None else int(os.getenv("CATALOGO_JANELA_OBSOLETO", 600))
+
+        self._entradas: "OrderedDict[ChaveCatalogo, _EntradaCatalogo]" = OrderedDict()
+        self._total_itens = 0
+        self._lock = threading.Lock()
+        self._acertos: Dict[str, int] = {}
+        self._faltas: Dict[str, int] = {}
+        self._descartes = 0
+        self._obsoletos_servidos = 0
+        self._recargas_segundo_plano = 0
+        self._esperas_compartilhadas = 0
+
+        self._em_andamento: Dict[ChaveCatalogo, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="recarga-catalogo")
+        print(f"[INFRA] Cache de catálogos inicializado (max_itens={self._max_itens}, janela_obsoleto={self._janela_obsoleto}s).")
+
+    @staticmethod
+    def _calcular_tamanho(valor: Any) -> int:
+        """Quantidade de itens do catálogo, usada no limite do cache; não é uma medida de memória."""
+        if isinstance(valor, dict):
+            return max(sum(CacheCatalogo._calcular_tamanho(item) for item in valor.values()), 1)
+        if isinstance(valor, (list, tuple, set)):
+            return max(len(valor), 1)
+        return 1
+
+    def _ttl(self, recurso: str) -> int:
+        return self._ttls.get(recurso, self._ttl_padrao)
+
+    def _remover(self, chave: ChaveCatalogo):
+        entrada = self._entradas.pop(chave, None)
+        if entrada is not None:
+            self._total_itens -= entrada.tamanho
+
+    def _gravar(self, chave: ChaveCatalogo, valor: Any):
+        tamanho = self._calcular_tamanho(valor)
+        if tamanho > self._max_itens:
+            print(f"[CACHE CATALOGO WARNING] Catálogo {chave} tem {tamanho} itens, acima do limite do cache. Não será armazenado.")
+            return
+
+        self._remover(chave)
+        self._entradas[chave] = _EntradaCatalogo(valor, tamanho, time.monotonic() + self._ttl(chave[2]))
+        self._total_itens += tamanho
+        while self._total_itens > self._max_itens:
+            chave_antiga, _ = next(iter(self._entradas.items()))
+            self._remover(chave_antiga)
+            self._descartes += 1
+
+    def obter(self, base_url: str, id_produtor: str, recurso: str, carregar: Callable[[], Any]) -> Any:
+        """
+        Retorna o catálogo do cache. Se estiver obsoleto (dentro da janela), retorna-o e agenda a recarga em segundo plano.
+        Se estiver ausente ou expirado além da janela, executa `carregar` (ou aguarda a carga já em andamento) e armazena o resultado.
+        """
+        chave = (base_url, str(id_produtor), recurso)
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and agora < entrada.expira_em + self._janela_obsoleto:
+                self._entradas.move_to_end(chave)
+                self._acertos[recurso] = self._acertos.get(recurso, 0) + 1
+                if agora >= entrada.expira_em:
+                    self._obsoletos_servidos += 1
+                    self._agendar_recarga(chave, carregar)
+                    print(f"[CACHE CATALOGO] Servindo '{recurso}' obsoleto do produtor {id_produtor} enquanto recarrega.")
+                else:
+                    print(f"[CACHE CATALOGO] Acerto para '{recurso}' do produtor {id_produtor}.")
+                return entrada.valor
+
+            if entrada is not None:
+                self._remover(chave)
+            self._faltas[recurso] = self._faltas.get(recurso, 0) + 1
+
+            futuro = self._em_andamento.get(chave)
+            executa_carga = futuro is None
+            if executa_carga:
+                futuro = Future()
+                self._em_andamento[chave] = futuro
+            else:
+                self._esperas_compartilhadas += 1
+
+        if not executa_carga:
+            print(f"[CACHE CATALOGO] Aguardando carga já em andamento de '{recurso}' do produtor {id_produtor}.")
+            return futuro.result()
+        return self._executar_carga(chave, carregar, futuro)
+
+    def _executar_carga(self, chave: ChaveCatalogo, carregar: Callable[[], Any], futuro: Future) -> Any:
+        try:
+            valor = carregar()
+        except Exception as e:
+            with self._lock:
+                self._em_andamento.pop(chave, None)
+            futuro.set_exception(e)
+            raise
+
+        with self._lock:
+            self._gravar(chave, valor)
+            self._em_andamento.pop(chave, None)
+        futuro.set_result(valor)
+        return valor
+
+    def _agendar_recarga(self, chave: ChaveCatalogo, carregar: Callable[[], Any]):
+        """
+        Agenda a recarga da chave em segundo plano, caso ainda não exista uma em andamento. Deve ser chamado com o lock adquirido.
+        """
+        if chave in self._em_andamento:
+            return
+        futuro = Future()
+        self._em_andamento[chave] = futuro
+        self._recargas_segundo_plano += 1
+        self._executor.submit(self._recarregar_em_segundo_plano, chave, carregar, futuro)
+
+    def _recarregar_em_segundo_plano(self, chave: ChaveCatalogo, carregar: Callable[[], Any], futuro: Future):
+        try:
+            self._executar_carga(chave, carregar, futuro)
+            print(f"[CACHE CATALOGO] Recarga em segundo plano de {chave} concluída.")
+        except Exception as e:
+            print(f"[CACHE CATALOGO WARNING] Falha ao recarregar {chave} em segundo plano. O valor obsoleto será mantido até o fim da janela. Erro: {e}")
+
+    def invalidar(self, base_url: str, id_produtor: str, recurso: Optional[str] = None):
+        """
+        Remove um recurso (ou todos os recursos) de um produtor do cache.
+        """
+        with self._lock:
+            chaves = [chave for chave in self._entradas if chave[0] == base_url and chave[1] == str(id_produtor) and (recurso is None or chave[2] == recurso)]
+            for chave in chaves:
+                self._remover(chave)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            recursos = sorted(set(self._acertos) | set(self._faltas))
+            por_recurso = {}
+            for recurso in recursos:
+                acertos = self._acertos.get(recurso, 0)
+                faltas = self._faltas.get(recurso, 0)
+                por_recurso[recurso] = {
+                    "acertos": acertos,
+                    "faltas": faltas,
+                    "taxa_acerto": round(acertos / (acertos + faltas), 4) if acertos + faltas else 0.0,
+                }
+            return {
+                "entradas": len(self._entradas),
+                "itens": self._total_itens,
+                "max_itens": self._max_itens,
+                "descartes_lru": self._descartes,
+                "obsoletos_servidos": self._obsoletos_servidos,
+                "recargas_segundo_plano": self._recargas_segundo_plano,
+                "esperas_compartilhadas": self._esperas_compartilhadas,
+                "recursos": por_recurso,
+            }
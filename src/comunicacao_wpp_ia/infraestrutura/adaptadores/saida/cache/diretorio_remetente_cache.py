@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import threading
+import redis
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_remetente import RepositorioRemetente
+
+class DiretorioRemetenteCache(RepositorioRemetente):
+    """
+    Decorador do repositório de remetentes que mantém um diretório telefone -> (base_url, produtores).
+    - Telefones encontrados ficam em cache pelo TTL positivo.
+    - Telefones desconhecidos também são guardados (cache negativo, TTL menor), evitando consultar todas as bases a cada mensagem.
+    - Opcionalmente usa o Redis como segunda camada, compartilhada entre as réplicas da aplicação.
+    """
+    _PREFIXO_CHAVE = "diretorio_remetente:"
+
+    def __init__(self, repositorio: RepositorioRemetente, ttl_segundos: Optional[int] = None, ttl_negativo_segundos: Optional[int] = None, max_entradas: int = 10000, usar_redis: bool = False):
+        self._repositorio = repositorio
+        self._ttl = ttl_segundos if ttl_segundos is not None else int(os.getenv("DIRETORIO_REMETENTE_TTL", 1800))
+        self._ttl_negativo = ttl_negativo_segundos if ttl_negativo_segundos is not None else int(os.getenv("DIRETORIO_REMETENTE_TTL_NEGATIVO", 300))
+        self._max_entradas = max_entradas
+        self._entradas: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._estatisticas = {"acertos_memoria": 0, "acertos_redis": 0, "acertos_negativos": 0, "faltas": 0}
+
+        self._cliente_redis = None
+        if usar_redis:
+            host = os.getenv('REDIS_HOST', 'localhost')
+            port = int(os.getenv('REDIS_PORT', 6379))
+            self._cliente_redis = redis.Redis(host=host, port=port, db=0, decode_responses=True)
+        print(f"[INFRA] Diretório de remetentes inicializado (ttl={self._ttl}s, ttl_negativo={self._ttl_negativo}s, redis={usar_redis}).")
+
+    def _incrementar(self, estatistica: str):
+        with self._lock:
+            self._estatisticas[estatistica] += 1
+
+    def _ler_memoria(self, telefone: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        with self._lock:
+            entrada = self._entradas.get(telefone)
+            if entrada is None:
+                return False, None
+            expira_em, dados = entrada
+            if expira_em <= time.monotonic():
+                del self._entradas[telefone]
+                return False, None
+            self._entradas.move_to_end(telefone)
+            return True, dados
+
+    def _gravar_memoria(self, telefone: str, dados: Optional[Dict[str, Any]], ttl: float):
+        with self._lock:
+            self._entradas[telefone] = (time.monotonic() + ttl, dados)
+            self._entradas.move_to_end(telefone)
+            while len(self._entradas) > self._max_entradas:
+                self._entradas.popitem(last=False)
+
+    def _ler_redis(self, telefone: str) -> Tuple[bool, Optional[Dict[str, Any]], int]:
+        if not self._cliente_redis:
+            return False, None, 0
+        try:
+            pipeline = self._cliente_redis.pipeline()
+            pipeline.get(self._PREFIXO_CHAVE + telefone)
+            pipeline.ttl(self._PREFIXO_CHAVE + telefone)
+            valor_json, ttl_restante = pipeline.execute()
+        except redis.exceptions.RedisError as e:
+            print(f"[DIRETORIO REMETENTE WARNING] Falha ao ler do Redis. Seguindo sem a camada compartilhada. Erro: {e}")
+            return False, None, 0
+        if not valor_json:
+            return False, None, 0
+        try:
+            valor = json.loads(valor_json)
+            dados = None if valor.get("desconhecido") else {"base_url": valor["base_url"], "produtor_id": list(valor["produtor_id"])}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Entrada corrompida ou de um formato antigo: tratada como falta e descartada
+            print(f"[DIRETORIO REMETENTE WARNING] Entrada inválida no Redis para {telefone}. Descartando. Erro: {e}")
+            self._remover_redis(telefone)
+            return False, None, 0
+        return True, dados, ttl_restante
+
+    def _gravar_redis(self, telefone: str, dados: Optional[Dict[str, Any]], ttl: int):
+        # Com TTL zero (cache desligado) não há o que gravar; o Redis também rejeitaria o SETEX com expiração <= 0
+        if not self._cliente_redis or ttl <= 0:
+            return
+        valor = dados if dados is not None else {"desconhecido": True}
+        try:
+            self._cliente_redis.setex(self._PREFIXO_CHAVE + telefone, ttl, json.dumps(valor))
+        except redis.exceptions.RedisError as e:
+            print(f"[DIRETORIO REMETENTE WARNING] Falha ao gravar no Redis. Erro: {e}")
+
+    def _remover_redis(self, telefone: str):
+        if not self._cliente_redis:
+            return
+        try:
+            self._cliente_redis.delete(self._PREFIXO_CHAVE + telefone)
+        except redis.exceptions.RedisError as e:
+            print(f"[DIRETORIO REMETENTE WARNING] Falha ao remover do Redis. Erro: {e}")
+
+    def _para_remetente(self, telefone: str, dados: Optional[Dict[str, Any]]) -> Optional[DadosRemetente]:
+        if dados is None:
+            return None
+        return DadosRemetente(numero_telefone=telefone, base_url=dados["base_url"], produtor_id=list(dados["produtor_id"]))
+
+    def buscar_remetente_por_telefone(self, telefone: str) -> Optional[DadosRemetente]:
+        encontrado, dados = self._ler_memoria(telefone)
+        if encontrado:
+            self._incrementar("acertos_memoria" if dados is not None else "acertos_negativos")
+            print(f"[DIRETORIO REMETENTE] Telefone {telefone} resolvido pela memória local.")
+            return self._para_remetente(telefone, dados)
+
+        encontrado, dados, ttl_restante = self._ler_redis(telefone)
+        if encontrado:
+            self._incrementar("acertos_redis" if dados is not None else "acertos_negativos")
+            print(f"[DIRETORIO REMETENTE] Telefone {telefone} resolvido pelo Redis.")
+            self._gravar_memoria(telefone, dados, ttl_restante if ttl_restante and ttl_restante > 0 else self._ttl_negativo)
+            return self._para_remetente(telefone, dados)
+
+        self._incrementar("faltas")
+        remetente = self._repositorio.buscar_remetente_por_telefone(telefone)
+        if remetente:
+            dados = {"base_url": remetente.base_url, "produtor_id": list(remetente.produtor_id or [])}
+            ttl = self._ttl
+        else:
+            dados = None
+            ttl = self._ttl_negativo
+
+        self._gravar_memoria(telefone, dados, ttl)
+        self._gravar_redis(telefone, dados, ttl)
+        return remetente
+
+    def invalidar(self, telefone: str):
+        """
+        Remove o telefone do diretório (ex: após um cadastro novo no Agriwin).
+        """
+        with self._lock:
+            self._entradas.pop(telefone, None)
+        self._remover_redis(telefone)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            estatisticas = dict(self._estatisticas)
+            estatisticas["entradas_memoria"] = len(self._entradas)
+        consultas = estatisticas["acertos_memoria"] + estatisticas["acertos_redis"] + estatisticas["acertos_negativos"] + estatisticas["faltas"]
+        estatisticas["taxa_acerto"] = round((consultas - estatisticas["faltas"]) / consultas, 4) if consultas else 0.0
+        return estatisticas
@@ -0,0 +1,72 @@
+import os
+import threading
+import redis
+from collections import Counter, OrderedDict
+from typing import Optional, Dict, Tuple
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_historico_ponto_estoque import RepositorioHistoricoPontoEstoque
+
+class HistoricoPontoEstoqueCache(RepositorioHistoricoPontoEstoque):
+    """
+    Contagem dos pontos de estoque usados nos consumos salvos de cada produtor, para sugerir o mais usado.
+    - Com Redis, a contagem fica num hash por produtor (HINCRBY), compartilhada entre as réplicas e preservada
+      entre reinícios; o hash expira após `ttl_segundos` sem novos consumos.
+    - Sem Redis (desenvolvimento), fica em memória, limitada aos `max_produtores` usados mais recentemente.
+    """
+    _PREFIXO_CHAVE = "historico_ponto_estoque:"
+
+    def __init__(self, ttl_segundos: Optional[int] = None, max_produtores: int = 5000, usar_redis: bool = False):
+        self._ttl = ttl_segundos if ttl_segundos is not None else int(os.getenv("HISTORICO_PONTO_ESTOQUE_TTL", 90 * 24 * 3600))
+        self._max_produtores = max_produtores
+        self._usos: "OrderedDict[Tuple[str, str], Counter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._cliente_redis = None
+        if usar_redis:
+            host = os.getenv('REDIS_HOST', 'localhost')
+            port = int(os.getenv('REDIS_PORT', 6379))
+            self._cliente_redis = redis.Redis(host=host, port=port, db=0, decode_responses=True)
+        print(f"[INFRA] Histórico de pontos de estoque inicializado (ttl={self._ttl}s, redis={usar_redis}).")
+
+    def _chave(self, base_url: str, id_produtor: str) -> str:
+        return f"{self._PREFIXO_CHAVE}{base_url}:{id_produtor}"
+
+    def registrar_uso(self, base_url: str, id_produtor: str, id_ponto_estoque: str):
+        if not id_ponto_estoque:
+            return
+        if self._cliente_redis:
+            chave = self._chave(base_url, str(id_produtor))
+            try:
+                pipeline = self._cliente_redis.pipeline()
+                pipeline.hincrby(chave, id_ponto_estoque, 1)
+                pipeline.expire(chave, self._ttl)
+                pipeline.execute()
+            except redis.exceptions.RedisError as e:
+                print(f"[HISTORICO PONTO ESTOQUE WARNING] Falha ao gravar no Redis. Erro: {e}")
+            return
+
+        with self._lock:
+            chave = (base_url, str(id_produtor))
+            self._usos.setdefault(chave, Counter())[id_ponto_estoque] += 1
+            self._usos.move_to_end(chave)
+            while len(self._usos) > self._max_produtores:
+                self._usos.popitem(last=False)
+
+    def _ler_usos(self, base_url: str, id_produtor: str) -> Dict[str, int]:
+        if self._cliente_redis:
+            try:
+                usos = self._cliente_redis.hgetall(self._chave(base_url, str(id_produtor)))
+            except redis.exceptions.RedisError as e:
+                print(f"[HISTORICO PONTO ESTOQUE WARNING] Falha ao ler do Redis. Seguindo sem sugestão. Erro: {e}")
+                return {}
+            return {id_ponto: int(quantidade) for id_ponto, quantidade in usos.items()}
+
+        with self._lock:
+            return dict(self._usos.get((base_url, str(id_produtor)), {}))
+
+    def mais_usado(self, base_url: str, id_produtor: str) -> Optional[str]:
+        mais_comuns = Counter(self._ler_usos(base_url, id_produtor)).most_common(2)
+        if not mais_comuns:
+            return None
+        if len(mais_comuns) > 1 and mais_comuns[0][1] == mais_comuns[1][1]:
+            return None
+        return mais_comuns[0][0]
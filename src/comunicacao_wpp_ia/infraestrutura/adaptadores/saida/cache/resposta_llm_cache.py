@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import redis
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar('T', bound=BaseModel)
+
+class CacheRespostasLLM:
+    """
+    Cache das respostas estruturadas do LLM, endereçado pelo conteúdo da chamada.
+    - A chave é o hash do modelo (nome e parâmetros), do schema de saída e das mensagens já renderizadas,
+      então só se repete quando a chamada é exatamente a mesma (ex: o usuário reenvia a mensagem após uma resposta lenta).
+    - As respostas ficam na memória local (LRU) pelo TTL e, opcionalmente, no Redis, compartilhado entre as réplicas.
+    - Os valores são guardados em JSON e revalidados a cada leitura, para que quem altera o objeto devolvido
+      não altere o que está em cache.
+    Deve ser usado apenas com agentes sem ferramentas, cujas respostas dependem só da entrada.
+    """
+    _PREFIXO_CHAVE = "resposta_llm:"
+
+    def __init__(self, ttl_segundos: Optional[int] = None, max_entradas: Optional[int] = None, usar_redis: bool = False):
+        self._ttl = ttl_segundos if ttl_segundos is not None else int(os.getenv("LLM_CACHE_TTL", 600))
+        self._max_entradas = max_entradas if max_entradas is not None else int(os.getenv("LLM_CACHE_MAX_ENTRADAS", 1000))
+        self._entradas: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._estatisticas = {"acertos_memoria": 0, "acertos_redis": 0, "faltas": 0, "invalidas_redis": 0}
+
+        self._cliente_redis = None
+        if usar_redis:
+            host = os.getenv('REDIS_HOST', 'localhost')
+            port = int(os.getenv('REDIS_PORT', 6379))
+            self._cliente_redis = redis.Redis(host=host, port=port, db=0, decode_responses=True)
+        print(f"[INFRA] Cache de respostas do LLM inicializado (ttl={self._ttl}s, max_entradas={self._max_entradas}, redis={usar_redis}).")
+
+    @staticmethod
+    def gerar_chave(identificador_modelo: str, schema_saida: str, mensagens: List[Tuple[str, Any]]) -> str:
+        conteudo = json.dumps([identificador_modelo, schema_saida, mensagens], ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+    def _incrementar(self, estatistica: str):
+        with self._lock:
+            self._estatisticas[estatistica] += 1
+
+    def _ler_memoria(self, chave: str) -> Optional[str]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            expira_em, valor_json = entrada
+            if expira_em <= time.monotonic():
+                del self._entradas[chave]
+                return None
+            self._entradas.move_to_end(chave)
+            return valor_json
+
+    def _gravar_memoria(self, chave: str, valor_json: str, ttl: float):
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + ttl, valor_json)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self._max_entradas:
+                self._entradas.popitem(last=False)
+
+    def _ler_redis(self, chave: str) -> Tuple[Optional[str], int]:
+        if not self._cliente_redis:
+            return None, 0
+        try:
+            pipeline = self._cliente_redis.pipeline()
+            pipeline.get(self._PREFIXO_CHAVE + chave)
+            pipeline.ttl(self._PREFIXO_CHAVE + chave)
+            valor_json, ttl_restante = pipeline.execute()
+        except redis.exceptions.RedisError as e:
+            print(f"[CACHE LLM WARNING] Falha ao ler do Redis. Seguindo sem a camada compartilhada. Erro: {e}")
+            return None, 0
+        return valor_json, ttl_restante
+
+    def _gravar_redis(self, chave: str, valor_json: str):
+        if not self._cliente_redis:
+            return
+        try:
+            self._cliente_redis.setex(self._PREFIXO_CHAVE + chave, self._ttl, valor_json)
+        except redis.exceptions.RedisError as e:
+            print(f"[CACHE LLM WARNING] Falha ao gravar no Redis. Erro: {e}")
+
+    def _remover_redis(self, chave: str):
+        if not self._cliente_redis:
+            return
+        try:
+            self._cliente_redis.delete(self._PREFIXO_CHAVE + chave)
+        except redis.exceptions.RedisError as e:
+            print(f"[CACHE LLM WARNING] Falha ao remover do Redis. Erro: {e}")
+
+    def _validar_redis(self, chave: str, valor_json: Optional[str], modelo_saida: Type[T]) -> Optional[T]:
+        if valor_json is None:
+            return None
+        try:
+            return modelo_saida.model_validate_json(valor_json)
+        except ValidationError as e:
+            # Entrada corrompida ou gravada por outra versão do modelo de saída: tratada como falta e descartada
+            print(f"[CACHE LLM WARNING] Resposta inválida no Redis. Descartando. Erro: {e}")
+            self._incrementar("invalidas_redis")
+            self._remover_redis(chave)
+            return None
+
+    def obter(self, chave: str, modelo_saida: Type[T]) -> Optional[T]:
+        valor_json = self._ler_memoria(chave)
+        if valor_json is not None:
+            self._incrementar("acertos_memoria")
+            print("[CACHE LLM] Resposta encontrada na memória local.")
+            return modelo_saida.model_validate_json(valor_json)
+
+        valor_json, ttl_restante = self._ler_redis(chave)
+        resposta = self._validar_redis(chave, valor_json, modelo_saida)
+        if resposta is not None:
+            self._incrementar("acertos_redis")
+            print("[CACHE LLM] Resposta encontrada no Redis.")
+            self._gravar_memoria(chave, valor_json, ttl_restante if ttl_restante and ttl_restante > 0 else self._ttl)
+            return resposta
+
+        self._incrementar("faltas")
+        return None
+
+    def gravar(self, chave: str, resposta: BaseModel):
+        valor_json = resposta.model_dump_json()
+        self._gravar_memoria(chave, valor_json, self._ttl)
+        self._gravar_redis(chave, valor_json)
+
+    def obter_estatisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            estatisticas = dict(self._estatisticas)
+            estatisticas["entradas_memoria"] = len(self._entradas)
+        consultas = estatisticas["acertos_memoria"] + estatisticas["acertos_redis"] + estatisticas["faltas"]
+        estatisticas["taxa_acerto"] = round((consultas - estatisticas["faltas"]) / consultas, 4) if consultas else 0.0
+        return estatisticas
@@ -1,11 +1,14 @@
 import os
+import threading
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Tuple
 
 class AgriwinCliente:
     """
     Cliente centralizado para interagir com a API Agriwin.
     Gerencia a autenticação e as requisições HTTP.
+    Mantém uma sessão (pool de conexões keep-alive) por URL base, compartilhada por todos os repositórios que usam esta instância.
     """
     _tokens_cache: Dict[str, str] = {} # Cache de tokens por base_url
     todas_bases_urls = [
@@ -16,12 +19,46 @@ class AgriwinCliente:
         "https://demo.agriwin.com.br",
     ]
 
-    def __init__(self):
+    def __init__(self, tamanho_pool: Optional[int] = None, timeout_conexao: Optional[float] = None, timeout_leitura: Optional[float] = None, manter_conexao: Optional[bool] = None):
         self._usuario = os.getenv("AGRIWIN_USUARIO")
         self._senha = os.getenv("AGRIWIN_SENHA")
         if not self._usuario or not self._senha:
             raise ValueError("As variáveis de ambiente 'AGRIWIN_USUARIO' e 'AGRIWIN_SENHA' não foram configuradas.")
-        print("[INFRA] AgriwinClient inicializado.")
+
+        # Configuração do pool de conexões (parâmetros explícitos têm prioridade sobre as variáveis de ambiente)
+        self._tamanho_pool = tamanho_pool if tamanho_pool is not None else int(os.getenv("AGRIWIN_POOL_TAMANHO", 10))
+        self._timeout: Tuple[float, float] = (
+            timeout_conexao if timeout_conexao is not None else float(os.getenv("AGRIWIN_TIMEOUT_CONEXAO", 5)),
+            timeout_leitura if timeout_leitura is not None else float(os.getenv("AGRIWIN_TIMEOUT_LEITURA", 30)),
+        )
+        if manter_conexao is None:
+            manter_conexao = os.getenv("AGRIWIN_KEEP_ALIVE", "true").lower() != "false"
+        self._manter_conexao = manter_conexao
+
+        self._sessoes: Dict[str, requests.Session] = {}
+        self._lock_sessoes = threading.Lock()
+        print(f"[INFRA] AgriwinClient inicializado (pool={self._tamanho_pool}, timeout={self._timeout}, keep-alive={self._manter_conexao}).")
+
+    def _obter_sessao(self, base_url: str) -> requests.Session:
+        """
+        Retorna a sessão HTTP da URL base, criando-a (com seu pool de conexões) no primeiro uso.
+        """
+        chave = base_url.rstrip('/')
+        sessao = self._sessoes.get(chave)
+        if sessao is not None:
+            return sessao
+
+        with self._lock_sessoes:
+            sessao = self._sessoes.get(chave)
+            if sessao is None:
+                sessao = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self._tamanho_pool)
+                sessao.mount("https://", adaptador)
+                sessao.mount("http://", adaptador)
+                sessao.headers.update({"Connection": "keep-alive" if self._manter_conexao else "close"})
+                self._sessoes[chave] = sessao
+                print(f"[AGRIWIN CLIENT] Pool de conexões criado para {chave}.")
+        return sessao
 
     def _autenticar(self, base_url: str) -> None:
         """
@@ -34,7 +71,7 @@ class AgriwinCliente:
         
         try:
             payload = {"login": self._usuario, "senha": self._senha}
-            response = requests.post(url_completa, json=payload)
+            response = self._obter_sessao(base_url).post(url_completa, json=payload, timeout=self._timeout)
             response.raise_for_status() # Lança exceção para status 4xx/5xx
 
             response_data = response.json()
@@ -83,7 +120,7 @@ class AgriwinCliente:
             url = f"{url}?{query_string}"
 
         print(f"[AGRIWIN CLIENT] Executando GET em: {url}")
-        response = requests.get(url, headers=headers)
+        response = self._obter_sessao(base_url).get(url, headers=headers, timeout=self._timeout)
         
         # Se o token expirou (401), limpa o cache e tenta de novo
         if response.status_code == 401 and base_url in self._tokens_cache:
@@ -105,7 +142,7 @@ class AgriwinCliente:
         headers = self._get_headers(base_url)
         url = f"{base_url.rstrip('/')}{endpoint}"
         print(f"[AGRIWIN CLIENT] Executando POST em: {url}")
-        response = requests.post(url, headers=headers, json=data)
+        response = self._obter_sessao(base_url).post(url, headers=headers, json=data, timeout=self._timeout)
 
         # Se o token expirou (401), limpa o cache e tenta de novo
         if response.status_code == 401 and base_url in self._tokens_cache:
@@ -114,4 +151,31 @@ class AgriwinCliente:
             return self.post(base_url, endpoint, data)
         
         response.raise_for_status()
-        return response
\ No newline at end of file
+        return response
+
+    def obter_estatisticas_pool(self) -> Dict[str, Any]:
+        """
+        Retorna, por URL base, quantas requisições foram feitas e quantas conexões novas precisaram ser abertas.
+        A taxa de reuso indica a fração de requisições que aproveitaram uma conexão já aberta (sem novo handshake TCP/TLS).
+        """
+        estatisticas = {}
+        for base_url, sessao in list(self._sessoes.items()):
+            adaptador = sessao.get_adapter(base_url)
+            pools = adaptador.poolmanager.pools
+            requisicoes = 0
+            conexoes_abertas = 0
+            for chave_pool in pools.keys():
+                pool = pools.get(chave_pool)
+                if pool is None:
+                    continue
+                requisicoes += pool.num_requests
+                conexoes_abertas += pool.num_connections
+
+            estatisticas[base_url] = {
+                "requisicoes": requisicoes,
+                "conexoes_abertas": conexoes_abertas,
+                "conexoes_reaproveitadas": max(requisicoes - conexoes_abertas, 0),
+                "taxa_reuso": round(1 - conexoes_abertas / requisicoes, 4) if requisicoes else 0.0,
+                "tamanho_pool": self._tamanho_pool,
+            }
+        return estatisticas
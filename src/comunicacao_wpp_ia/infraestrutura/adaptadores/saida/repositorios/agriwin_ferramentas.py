@@ -1,4 +1,6 @@
-from typing import List, Optional, Any, Callable, Type
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Any, Callable, Type, Dict, Tuple, Iterator
 from pydantic import ValidationError, BaseModel
 import requests
 
@@ -23,19 +25,54 @@ from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
 from src.comunicacao_wpp_ia.dominio.modelos.safra import Safra
 from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
 from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_ferramentas import RepositorioFerramentas
-
-# --- Cliente HTTP ---
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import CatalogoIndexado
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_produtos import IndiceProdutos
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_maquinas import IndiceMaquinas
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_pontos_estoque import IndicePontosEstoque
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_safras import IndiceSafras
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_areas import IndicePlantios, IndicePropriedades
+
+# --- Cliente HTTP e Cache ---
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.clientes_api.agriwin_cliente import AgriwinCliente
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.catalogo_cache import CacheCatalogo
+
+# Áreas já buscadas durante a execução em curso (uma mensagem), quando não há CacheCatalogo.
+# Definido por `RepoAgriwinFerramentas.escopo_da_mensagem` e descartado ao final dela.
+_areas_da_mensagem: ContextVar[Optional[Dict[Tuple[str, str], Dict[str, List[Any]]]]] = ContextVar("areas_da_mensagem", default=None)
 
 class RepoAgriwinFerramentas(RepositorioFerramentas):
     """
     Adaptador que implementa as interfaces de repositório utilizando a API do Agriwin.
     Utiliza DTOs para validar a estrutura dos dados da API e um Mapeador para traduzi-los em objetos de domínio, protegendo o núcleo da aplicação.
+    Quando recebe um CacheCatalogo, os catálogos do produtor (já mapeados) são reaproveitados entre chamadas e conversas.
+    Os catálogos são carregados já indexados (CatalogoIndexado), e os índices ficam na mesma entrada do cache que a lista.
     """
-    def __init__(self, agriwin_cliente: AgriwinCliente):
+    def __init__(self, agriwin_cliente: AgriwinCliente, cache: Optional[CacheCatalogo] = None):
         self._cliente = agriwin_cliente
+        self._cache = cache
         print("[INFRA] Adaptador do Repositório Agriwin inicializado.")
 
+    @staticmethod
+    @contextmanager
+    def escopo_da_mensagem() -> Iterator[None]:
+        """
+        Abre o escopo em que /api/v1/areas é buscado no máximo uma vez por produtor (sem CacheCatalogo).
+        Escopos aninhados reaproveitam o externo.
+        """
+        if _areas_da_mensagem.get() is not None:
+            yield
+            return
+        token = _areas_da_mensagem.set({})
+        try:
+            yield
+        finally:
+            _areas_da_mensagem.reset(token)
+
+    def _com_cache(self, base_url: str, id_produtor: str, recurso: str, carregar: Callable[[], List[Any]]) -> List[Any]:
+        if self._cache is None:
+            return carregar()
+        return self._cache.obter(base_url, id_produtor, recurso, carregar)
+
     def _processar_resposta(self, response: requests.Response) -> List[Any]:
         if response.status_code != 200:
             return []
@@ -68,6 +105,9 @@ class RepoAgriwinFerramentas(RepositorioFerramentas):
         return objetos_dominio
 
     def buscar_produtos_do_produtor(self, base_url: str, id_produtor: str) -> List[Produto]:
+        return self._com_cache(base_url, id_produtor, "produtos", lambda: self._carregar_produtos(base_url, id_produtor))
+
+    def _carregar_produtos(self, base_url: str, id_produtor: str) -> List[Produto]:
         print(f"\n[API] Buscando todos os produtos para o produtor {id_produtor}...")
         endpoint = "/api/v1/produtos"
         params = {"identificador_produtor": id_produtor}
@@ -91,7 +131,7 @@ class RepoAgriwinFerramentas(RepositorioFerramentas):
             except Exception as e:
                 print(f"[ADAPTER CRITICAL] Erro inesperado durante o mapeamento de estoque. Erro: {e}")
 
-        return produtos
+        return CatalogoIndexado.construir(produtos, IndiceProdutos)
     
     def buscar_produtos_em_estoque(self, base_url: str, id_produtor: str, produtos: List[str]) -> List[Produto]:
         print(f"\n[API] Buscando produtos em estoque para o produtor {id_produtor}...")
@@ -124,45 +164,81 @@ class RepoAgriwinFerramentas(RepositorioFerramentas):
         response = self._cliente.get(base_url, endpoint, params=params)
         return self._processar_e_mapear_resposta(response, ProdutoAgriwinDTO, AgriwinMapeador.para_produto_dominio)
 
-    def buscar_atraves_dos_talhoes_do_produtor(self, base_url: str, id_produtor: str) -> List[Talhao]:
-        print(f"\n[API] Buscando todos os talhões para o produtor {id_produtor}...")
+    def _buscar_areas_do_produtor(self, base_url: str, id_produtor: str) -> Dict[str, List[Any]]:
+        """
+        Busca /api/v1/areas uma única vez por produtor (no cache compartilhado ou, sem ele, no escopo da mensagem)
+        e devolve as projeções de plantios e propriedades usadas pelas ferramentas de talhões, plantios e propriedades.
+        Fora de um escopo e sem cache, cada chamada busca novamente.
+        """
+        if self._cache is not None:
+            return self._cache.obter(base_url, id_produtor, "areas", lambda: self._carregar_areas(base_url, id_produtor))
+
+        areas_da_mensagem = _areas_da_mensagem.get()
+        if areas_da_mensagem is None:
+            return self._carregar_areas(base_url, id_produtor)
+
+        chave = (base_url, str(id_produtor))
+        if chave not in areas_da_mensagem:
+            areas_da_mensagem[chave] = self._carregar_areas(base_url, id_produtor)
+        return areas_da_mensagem[chave]
+
+    def _carregar_areas(self, base_url: str, id_produtor: str) -> Dict[str, List[Any]]:
+        print(f"\n[API] Buscando todas as áreas (talhões, plantios e propriedades) para o produtor {id_produtor}...")
         endpoint = "/api/v1/areas"
         params = {"identificador_produtor": id_produtor}
         response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, AreasAgriwinDTO, AgriwinMapeador.para_plantio_dominio)
+        projecoes = self._processar_e_mapear_resposta(
+            response,
+            AreasAgriwinDTO,
+            lambda dto: (AgriwinMapeador.para_plantio_dominio(dto), AgriwinMapeador.para_propriedade_dominio(dto))
+        )
+
+        plantios = [plantio for plantio, _ in projecoes]
+        propriedades_por_id: Dict[str, Propriedade] = {}
+        for _, propriedade in projecoes:
+            propriedades_por_id.setdefault(propriedade.id, propriedade)
+
+        return {
+            "plantios": CatalogoIndexado.construir(plantios, IndicePlantios),
+            "propriedades": CatalogoIndexado.construir(propriedades_por_id.values(), IndicePropriedades),
+        }
+
+    def buscar_atraves_dos_talhoes_do_produtor(self, base_url: str, id_produtor: str) -> List[Plantio]:
+        return self._buscar_areas_do_produtor(base_url, id_produtor)["plantios"]
     
     def buscar_propriedades_do_produtor(self, base_url: str, id_produtor: str) -> List[Propriedade]:
-        print(f"\n[API] Buscando todas as propriedades para o produtor {id_produtor}...")
-        endpoint = "/api/v1/areas"
-        params = {"identificador_produtor": id_produtor}
-        response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, AreasAgriwinDTO, AgriwinMapeador.para_propriedade_dominio)
+        return self._buscar_areas_do_produtor(base_url, id_produtor)["propriedades"]
     
     def buscar_plantios_do_produtor(self, base_url: str, id_produtor: str) -> List[Plantio]:
-        print(f"\n[API] Buscando todos os plantios para o produtor {id_produtor}...")
-        endpoint = "/api/v1/areas"
-        params = {"identificador_produtor": id_produtor}
-        response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, AreasAgriwinDTO, AgriwinMapeador.para_plantio_dominio)
+        return self._buscar_areas_do_produtor(base_url, id_produtor)["plantios"]
     
     def buscar_maquinas_do_produtor(self, base_url: str, id_produtor: str) -> List[Imobilizado]:
+        return self._com_cache(base_url, id_produtor, "maquinas", lambda: self._carregar_maquinas(base_url, id_produtor))
+
+    def _carregar_maquinas(self, base_url: str, id_produtor: str) -> List[Imobilizado]:
         print(f"\n[API] Buscando todas as máquinas para o produtor {id_produtor}...")
         endpoint = "/api/v1/maquinas"
         params = {"identificador_produtor": id_produtor}
         response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, MaquinaAgriwinDTO, AgriwinMapeador.para_imobilizado_dominio)
+        return CatalogoIndexado.construir(self._processar_e_mapear_resposta(response, MaquinaAgriwinDTO, AgriwinMapeador.para_imobilizado_dominio), IndiceMaquinas)
     
     def buscar_pontos_estoque_do_produtor(self, base_url: str, id_produtor: str) -> List[PontoEstoque]:
+        return self._com_cache(base_url, id_produtor, "pontos_estoque", lambda: self._carregar_pontos_estoque(base_url, id_produtor))
+
+    def _carregar_pontos_estoque(self, base_url: str, id_produtor: str) -> List[PontoEstoque]:
         print(f"\n[API] Buscando pontos de estoque para o produtor {id_produtor}...")
         endpoint = "/api/v1/estoques/locais"
         params = {"identificador_produtor": id_produtor}
         response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, PontoEstoqueAgriwinDTO, AgriwinMapeador.para_ponto_estoque_dominio)
+        return CatalogoIndexado.construir(self._processar_e_mapear_resposta(response, PontoEstoqueAgriwinDTO, AgriwinMapeador.para_ponto_estoque_dominio), IndicePontosEstoque)
        
     def buscar_safras_do_produtor(self, base_url: str, id_produtor: str) -> List[Safra]:
+        return self._com_cache(base_url, id_produtor, "safras", lambda: self._carregar_safras(base_url, id_produtor))
+
+    def _carregar_safras(self, base_url: str, id_produtor: str) -> List[Safra]:
         print(f"\n[API] Buscando safras para o produtor {id_produtor}...")
         endpoint = "/api/v1/safras"
         params = {"identificador_produtor": id_produtor}
         response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, SafraAgriwinDTO, AgriwinMapeador.para_safra_dominio)
+        return CatalogoIndexado.construir(self._processar_e_mapear_resposta(response, SafraAgriwinDTO, AgriwinMapeador.para_safra_dominio), IndiceSafras)
     
\ No newline at end of file
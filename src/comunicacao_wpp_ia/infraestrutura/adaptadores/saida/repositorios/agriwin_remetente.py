@@ -1,4 +1,6 @@
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, List, Dict, Any, Tuple
 from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
 from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_remetente import RepositorioRemetente
 from src.comunicacao_wpp_ia.infraestrutura.dtos.agriwin_dtos import RemetenteAgriwinDTO
@@ -10,30 +12,110 @@ class RepoAgriwinRemetente(RepositorioRemetente):
     Adaptador que implementa as interfaces de repositório para o remetente.
     """
 
-    def __init__(self, agriwin_cliente: AgriwinCliente):
+    def __init__(self, agriwin_cliente: AgriwinCliente, busca_paralela: Optional[bool] = None):
         self._cliente = agriwin_cliente
-        print("[INFRA] Adaptador do Repositório AgriwinRemetente inicializado.")
-    
-    # TODO: Precisa melhorar esse método
-    def buscar_remetente_por_telefone(self, telefone: str) -> Optional[DadosRemetente]:
-        """
-        Busca na API da Agriwin a lista de produtores para um dado responsável.
-        """
+
+        # Modo de busca entre as bases: 'paralela' (padrão) ou 'sequencial'
+        if busca_paralela is None:
+            busca_paralela = os.getenv("AGRIWIN_BUSCA_REMETENTE", "paralela").lower() != "sequencial"
+        self._busca_paralela = busca_paralela
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._cliente.todas_bases_urls) * 2,
+            thread_name_prefix="busca-remetente"
+        ) if busca_paralela else None
+        print(f"[INFRA] Adaptador do Repositório AgriwinRemetente inicializado (busca {'paralela' if busca_paralela else 'sequencial'}).")
+
+    def _consultar_base(self, base_url: str, telefone: str) -> List[Dict[str, Any]]:
         endpoint = "/api/v1/produtores"
         params = {"telefone": telefone}
-        dados_api = []
-        base_correta = None
+        response = self._cliente.get(base_url, endpoint, params=params)
+        if response.status_code != 200:
+            return []
+        return response.json().get("dados", []) or []
+
+    @staticmethod
+    def _ignorar_base(base_url: str, erro: Exception):
+        print(f"[ADAPTER WARNING] Falha ao consultar remetente em {base_url}. Base ignorada. Erro: {erro}")
+
+    def _buscar_sequencial(self, telefone: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Consulta as bases uma a uma, na ordem de prioridade, e para na primeira que retornar dados.
+        Uma base que falhar é ignorada; se nenhuma retornar dados, a última falha é propagada.
+        """
+        ultimo_erro: Optional[Exception] = None
         for base_url in self._cliente.todas_bases_urls:
-            response = self._cliente.get(base_url, endpoint, params=params)
-            if response.status_code == 200:
-                dados_api = response.json().get("dados", [])
+            try:
+                dados_api = self._consultar_base(base_url, telefone)
+            except Exception as e:
+                self._ignorar_base(base_url, e)
+                ultimo_erro = e
+                continue
             if dados_api:
-                base_correta = base_url
-                break
-        
-        if dados_api == []:
+                return base_url, dados_api
+        if ultimo_erro is not None:
+            raise ultimo_erro
+        return None, []
+
+    def _buscar_em_paralelo(self, telefone: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Consulta todas as bases ao mesmo tempo.
+        Retorna assim que a base de maior prioridade com dados for conhecida, ou seja, quando ela respondeu e todas as bases
+        anteriores a ela na lista já responderam vazio. Assim o resultado é o mesmo da busca sequencial, mesmo que o telefone
+        exista em mais de uma base. As consultas ainda pendentes são canceladas (as que já estão em andamento são descartadas).
+        As falhas seguem a mesma regra da busca sequencial: a base é ignorada e, se nenhuma retornar dados, a falha é propagada.
+        """
+        bases = list(self._cliente.todas_bases_urls)
+        futuros = {self._executor.submit(self._consultar_base, base_url, telefone): indice for indice, base_url in enumerate(bases)}
+        resultados: Dict[int, List[Dict[str, Any]]] = {}
+        pendentes = set(futuros)
+        indice_escolhido = None
+        ultimo_erro: Optional[Exception] = None
+
+        while pendentes and indice_escolhido is None:
+            concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                indice = futuros[futuro]
+                try:
+                    resultados[indice] = futuro.result()
+                except Exception as e:
+                    self._ignorar_base(bases[indice], e)
+                    resultados[indice] = []
+                    ultimo_erro = e
+
+            for indice in range(len(bases)):
+                if indice not in resultados:
+                    break
+                if resultados[indice]:
+                    indice_escolhido = indice
+                    break
+
+        for futuro in pendentes:
+            futuro.cancel()
+
+        outras_bases = [bases[indice] for indice, dados in sorted(resultados.items()) if dados and indice != indice_escolhido]
+        if indice_escolhido is not None and outras_bases:
+            print(f"[ADAPTER WARNING] Telefone {telefone} encontrado em mais de uma base. Usando {bases[indice_escolhido]} (prioridade) e ignorando {outras_bases}.")
+
+        if indice_escolhido is None:
+            if ultimo_erro is not None:
+                raise ultimo_erro
+            return None, []
+        return bases[indice_escolhido], resultados[indice_escolhido]
+
+    def buscar_remetente_por_telefone(self, telefone: str) -> Optional[DadosRemetente]:
+        """
+        Busca na API da Agriwin a lista de produtores para um dado responsável.
+        Retorna None quando nenhuma base conhece o telefone; se alguma base falhou e nenhuma retornou dados,
+        a falha é propagada, para que uma indisponibilidade não seja tratada (e guardada em cache) como "não encontrado".
+        """
+        if self._busca_paralela:
+            base_correta, dados_api = self._buscar_em_paralelo(telefone)
+        else:
+            base_correta, dados_api = self._buscar_sequencial(telefone)
+
+        if not dados_api:
             return None
-        
+
         remetente = DadosRemetente(
             base_url=base_correta,
             numero_telefone=telefone
@@ -44,5 +126,5 @@ class RepoAgriwinRemetente(RepositorioRemetente):
                 remetente.produtor_id.append(dto_instance.identificador)
             except ValidationError as e:
                 print(f"[ADAPTER WARNING] Item de remetente inválido ignorado. Erro: {e}")
-            
-        return remetente
\ No newline at end of file
+
+        return remetente
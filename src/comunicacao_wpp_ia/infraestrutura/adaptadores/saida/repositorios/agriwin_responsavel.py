@@ -3,17 +3,21 @@ from pydantic import ValidationError, BaseModel
 import requests
 from src.comunicacao_wpp_ia.dominio.modelos.responsavel import Responsavel
 from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_responsavel import RepositorioResponsavel
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import CatalogoIndexado
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_responsaveis import IndiceResponsaveis
 from src.comunicacao_wpp_ia.infraestrutura.dtos.agriwin_dtos import PessoaAgriwinDTO
 from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.clientes_api.agriwin_cliente import AgriwinCliente
 from src.comunicacao_wpp_ia.infraestrutura.dtos.agriwin_mapeador import AgriwinMapeador
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.catalogo_cache import CacheCatalogo
 
 class RepoAgriwinResponsavel(RepositorioResponsavel):
     """
     Adaptador que implementa as interfaces de repositório para o responsavel.
     """
 
-    def __init__(self, agriwin_cliente: AgriwinCliente):
+    def __init__(self, agriwin_cliente: AgriwinCliente, cache: Optional[CacheCatalogo] = None):
         self._cliente = agriwin_cliente
+        self._cache = cache
         print("[INFRA] Adaptador do Repositório AgriwinRemetente inicializado.")
     
     # TODO: criar uma classe para esses 2 metodos que serão usados em varios lugares
@@ -49,17 +53,20 @@ class RepoAgriwinResponsavel(RepositorioResponsavel):
         return objetos_dominio
     
     def _buscar_responsaveis_do_produtor(self, base_url: str, id_produtor: str) -> List[Responsavel]:
+        if self._cache is None:
+            return self._carregar_responsaveis(base_url, id_produtor)
+        return self._cache.obter(base_url, id_produtor, "pessoas", lambda: self._carregar_responsaveis(base_url, id_produtor))
+
+    def _carregar_responsaveis(self, base_url: str, id_produtor: str) -> List[Responsavel]:
         print(f"\n[API] Buscando responsáveis para o produtor {id_produtor}...")
         endpoint = "/api/v1/pessoas"
         params = {"identificador_produtor": id_produtor}
         response = self._cliente.get(base_url, endpoint, params=params)
-        return self._processar_e_mapear_resposta(response, PessoaAgriwinDTO, AgriwinMapeador.para_responsavel_dominio)
+        return CatalogoIndexado.construir(self._processar_e_mapear_resposta(response, PessoaAgriwinDTO, AgriwinMapeador.para_responsavel_dominio), IndiceResponsaveis)
 
     
     def buscar_responsavel_por_telefone(self, base_url: str, id_produtor: str, telefone: str) -> Optional[Responsavel]:
         print(f"\nBuscando responsável pelo telefone {telefone} para o produtor {id_produtor}...")
         responsaveis = self._buscar_responsaveis_do_produtor(base_url, id_produtor)
-        for responsavel in responsaveis:
-            if responsavel.telefone == telefone:
-                return responsavel
-        return None
\ No newline at end of file
+        # O índice vem pronto no catálogo de pessoas e é reconstruído apenas quando ele é recarregado
+        return IndiceResponsaveis.obter(responsaveis).buscar_por_telefone(telefone)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 # --- Modelos de Domínio (Camada Interna) ---
 from src.comunicacao_wpp_ia.dominio.modelos.produto import Produto
@@ -93,10 +93,21 @@ class AgriwinMapeador:
             nome="Safra " + str(dto.ano_inicio) + " - " + str(dto.ano_termino),
             ano_inicio=dto.ano_inicio,
             ano_termino=dto.ano_termino,
-            data_inicio=datetime.strptime(dto.data_inicio, "%d/%m/%Y").date(),
-            data_termino=datetime.strptime(dto.data_termino, "%d/%m/%Y").date()
+            data_inicio=AgriwinMapeador._para_data(dto.data_inicio),
+            data_termino=AgriwinMapeador._para_data(dto.data_termino)
         )
 
+    @staticmethod
+    def _para_data(texto: str) -> date:
+        """
+        Converte uma data no formato DD/MM/YYYY da API. Mais barato que `datetime.strptime`, que interpreta o formato a cada chamada.
+        """
+        try:
+            dia, mes, ano = texto.split("/")
+            return date(int(ano), int(mes), int(dia))
+        except ValueError:
+            return datetime.strptime(texto, "%d/%m/%Y").date()
+
     @staticmethod
     def para_responsavel_dominio(dto: PessoaAgriwinDTO) -> Responsavel:
         return Responsavel(
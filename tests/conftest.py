@@ -0,0 +1,95 @@
+from datetime import date
+from typing import List
+
+import pytest
+
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.modelos.imobilizado import Imobilizado
+from src.comunicacao_wpp_ia.dominio.modelos.plantio import Plantio
+from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
+from src.comunicacao_wpp_ia.dominio.modelos.produto import Produto
+from src.comunicacao_wpp_ia.dominio.modelos.propriedade import Propriedade
+from src.comunicacao_wpp_ia.dominio.modelos.safra import Safra
+from src.comunicacao_wpp_ia.dominio.modelos.talhao import Talhao
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_ferramentas import RepositorioFerramentas
+
+FAZENDA = Propriedade(id="F1", nome="Fazenda Boa Vista")
+
+
+class RepoFerramentasMemoria(RepositorioFerramentas):
+    """Catálogo fixo de um produtor, para os testes que passam pelos serviços de domínio."""
+    def __init__(self, pontos_estoque: List[PontoEstoque] = None):
+        self.pontos_estoque = pontos_estoque or [
+            PontoEstoque(id="E1", nome="Depósito Central", ativo=True),
+            PontoEstoque(id="E2", nome="Galpão Sede", ativo=True),
+        ]
+
+    def buscar_maquinas_do_produtor(self, base_url: str, id_produtor: str) -> List[Imobilizado]:
+        return [Imobilizado(id="M1", nome="Pulverizador Uniport 3030", ativo=True)]
+
+    def buscar_pontos_estoque_do_produtor(self, base_url: str, id_produtor: str) -> List[PontoEstoque]:
+        return self.pontos_estoque
+
+    def buscar_produtos_do_produtor(self, base_url: str, id_produtor: str) -> List[Produto]:
+        return [
+            Produto(id="P1", nome="Roundup Original", ingredientes_ativos=["glifosato"]),
+            Produto(id="P2", nome="Roundup Transorb", ingredientes_ativos=["glifosato"]),
+            Produto(id="P3", nome="Elatus", ingredientes_ativos=["azoxistrobina"]),
+        ]
+
+    def buscar_produtos_em_estoque(self, base_url: str, id_produtor: str, nomes_produtos: List[str]) -> List[Produto]:
+        return self.buscar_produtos_do_produtor(base_url, id_produtor)
+
+    def buscar_produtos_mais_consumidos(self, base_url: str, id_produtor: str, nomes_produtos: List[str]) -> List[Produto]:
+        return self.buscar_produtos_do_produtor(base_url, id_produtor)
+
+    def buscar_safras_do_produtor(self, base_url: str, id_produtor: str) -> List[Safra]:
+        return [Safra(id="S1", nome="Safra 2025/2026", ano_inicio=2025, ano_termino=2026, data_inicio=date(2025, 7, 1), data_termino=date(2026, 6, 30))]
+
+    def buscar_atraves_dos_talhoes_do_produtor(self, base_url: str, id_produtor: str) -> List[Plantio]:
+        return self.buscar_plantios_do_produtor(base_url, id_produtor)
+
+    def buscar_plantios_do_produtor(self, base_url: str, id_produtor: str) -> List[Plantio]:
+        return [
+            Plantio(id="PL1", nome="Soja", talhao=Talhao(id="T3", nome="Talhão 03", area_ha=42.5), propriedade=FAZENDA),
+            Plantio(id="PL2", nome="Milho", talhao=Talhao(id="T4", nome="Talhão 04", area_ha=30.0), propriedade=FAZENDA),
+        ]
+
+    def buscar_propriedades_do_produtor(self, base_url: str, id_produtor: str) -> List[Propriedade]:
+        return [FAZENDA]
+
+
+class RedisFalso:
+    """O suficiente do cliente Redis para as leituras (pipeline get + ttl), gravações e remoções dos caches."""
+    def __init__(self, valores=None):
+        self.valores = dict(valores or {})
+        self._comandos = []
+
+    def pipeline(self):
+        self._comandos = []
+        return self
+
+    def get(self, chave):
+        self._comandos.append(self.valores.get(chave))
+
+    def ttl(self, chave):
+        self._comandos.append(100 if chave in self.valores else -2)
+
+    def execute(self):
+        return self._comandos
+
+    def setex(self, chave, ttl, valor):
+        self.valores[chave] = valor
+
+    def delete(self, chave):
+        self.valores.pop(chave, None)
+
+
+@pytest.fixture
+def repo_ferramentas():
+    return RepoFerramentasMemoria()
+
+
+@pytest.fixture
+def remetente():
+    return DadosRemetente(base_url="https://teste.local", numero_telefone="5545999998888", produtor_id=["1"])
@@ -0,0 +1,11 @@
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.clientes_api.agriwin_cliente import AgriwinCliente
+
+
+def test_parametros_explicitos_falsy_nao_sao_trocados_pelo_ambiente(monkeypatch):
+    monkeypatch.setenv("AGRIWIN_USUARIO", "teste")
+    monkeypatch.setenv("AGRIWIN_SENHA", "teste")
+    monkeypatch.setenv("AGRIWIN_POOL_TAMANHO", "25")
+    monkeypatch.setenv("AGRIWIN_TIMEOUT_LEITURA", "60")
+    cliente = AgriwinCliente(tamanho_pool=0, timeout_conexao=0.5, timeout_leitura=0)
+    assert cliente._tamanho_pool == 0
+    assert cliente._timeout == (0.5, 0)
@@ -0,0 +1,46 @@
+import pytest
+
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.repositorios.agriwin_remetente import RepoAgriwinRemetente
+
+
+class RespostaFalsa:
+    def __init__(self, dados):
+        self.status_code = 200
+        self._dados = dados
+
+    def json(self):
+        return {"dados": self._dados}
+
+
+class AgriwinClienteFalso:
+    """Cada base responde com a lista de produtores informada ou, se for uma exceção, falha com ela."""
+    def __init__(self, respostas):
+        self._respostas = respostas
+        self.todas_bases_urls = list(respostas)
+
+    def get(self, base_url, endpoint, params=None):
+        resposta = self._respostas[base_url]
+        if isinstance(resposta, Exception):
+            raise resposta
+        return RespostaFalsa(resposta)
+
+
+@pytest.mark.parametrize("busca_paralela", [True, False])
+def test_base_com_falha_e_ignorada_quando_outra_base_tem_dados(busca_paralela):
+    cliente = AgriwinClienteFalso({"https://a.local": ConnectionError("fora do ar"), "https://b.local": [{"identificador": "7", "nome": "Fazenda Teste"}]})
+    remetente = RepoAgriwinRemetente(cliente, busca_paralela=busca_paralela).buscar_remetente_por_telefone("5545999998888")
+    assert remetente.base_url == "https://b.local"
+    assert remetente.produtor_id == ["7"]
+
+
+@pytest.mark.parametrize("busca_paralela", [True, False])
+def test_falha_e_propagada_quando_nenhuma_base_tem_dados(busca_paralela):
+    cliente = AgriwinClienteFalso({"https://a.local": [], "https://b.local": ConnectionError("fora do ar")})
+    with pytest.raises(ConnectionError):
+        RepoAgriwinRemetente(cliente, busca_paralela=busca_paralela).buscar_remetente_por_telefone("5545999998888")
+
+
+@pytest.mark.parametrize("busca_paralela", [True, False])
+def test_telefone_desconhecido_sem_falhas_retorna_none(busca_paralela):
+    cliente = AgriwinClienteFalso({"https://a.local": [], "https://b.local": []})
+    assert RepoAgriwinRemetente(cliente, busca_paralela=busca_paralela).buscar_remetente_por_telefone("5545999998888") is None
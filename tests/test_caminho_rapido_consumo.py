@@ -0,0 +1,98 @@
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.caminho_rapido_consumo import CaminhoRapidoConsumo
+from src.comunicacao_wpp_ia.aplicacao.servicos.consumo.resolver_consumo_informado import ResolverConsumoInformado
+from src.comunicacao_wpp_ia.dominio.modelos.ponto_estoque import PontoEstoque
+from src.comunicacao_wpp_ia.dominio.objetos.consumo_informado import ConsumoInformado, ProdutoInformado
+from src.comunicacao_wpp_ia.dominio.servicos.localizar_ponto_estoque import LocalizarPontoEstoqueService
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.historico_ponto_estoque_cache import HistoricoPontoEstoqueCache
+
+from conftest import RepoFerramentasMemoria
+
+
+def _consumo_informado(**alteracoes) -> ConsumoInformado:
+    dados = {
+        "produtos_mencionados": [ProdutoInformado(nome="roundup original", quantidade="1.500 litros")],
+        "talhoes_mencionados": ["talhão 03"],
+        "tipo_rateio": "plantio",
+        "ponto_estoque_mencionado": "depósito central",
+        "data_mencionada": "10/01/2026",
+    }
+    dados.update(alteracoes)
+    return ConsumoInformado(**dados)
+
+
+def test_monta_o_consumo_quando_todas_as_mencoes_sao_unicas(repo_ferramentas, remetente):
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas))
+
+    consumo = caminho_rapido.tentar(remetente, _consumo_informado())
+
+    assert consumo is not None
+    assert [(produto.id, produto.quantidade) for produto in consumo.produtos] == [("P1", 1500.0)]
+    assert consumo.ids_plantios == ["PL1"]
+    assert consumo.id_ponto_estoque == "E1"
+    assert consumo.id_safra == "S1"
+    assert consumo.data_aplicacao == "10/01/2026"
+    assert caminho_rapido.obter_estatisticas()["caminho_rapido"] == 1
+
+
+def _motivo(caminho_rapido: CaminhoRapidoConsumo, remetente, consumo_informado: ConsumoInformado) -> str:
+    assert caminho_rapido.tentar(remetente, consumo_informado) is None
+    motivos = caminho_rapido.obter_estatisticas()["motivos_desvio"]
+    assert len(motivos) == 1
+    return next(iter(motivos))
+
+
+def test_desvia_para_o_agente_em_produto_ambiguo(repo_ferramentas, remetente):
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas))
+    # O ingrediente ativo bate exatamente com dois produtos
+    consumo_informado = _consumo_informado(produtos_mencionados=[ProdutoInformado(nome="glifosato", quantidade="10")])
+    assert _motivo(caminho_rapido, remetente, consumo_informado) == "ambiguidade"
+
+
+def test_desvia_para_o_agente_quando_a_quantidade_e_ambigua(repo_ferramentas, remetente):
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas))
+    consumo_informado = _consumo_informado(produtos_mencionados=[ProdutoInformado(nome="roundup original", quantidade="2 x 20 litros")])
+    assert _motivo(caminho_rapido, remetente, consumo_informado) == "sem_quantidade"
+
+
+def test_desvia_para_o_agente_sem_data(repo_ferramentas, remetente):
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas))
+    # A extração preenche a data ausente com hoje, mas sinaliza que ela foi assumida
+    consumo_informado = _consumo_informado(data_mencionada=None, safra_mencionada="2025/2026")
+    consumo_informado.assumir_data_de_hoje()
+    assert _motivo(caminho_rapido, remetente, consumo_informado) == "sem_data"
+
+
+def test_desvia_para_o_agente_com_area_nao_encontrada(repo_ferramentas, remetente):
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas))
+    assert _motivo(caminho_rapido, remetente, _consumo_informado(talhoes_mencionados=["pivô 99"])) == "nao_encontrado"
+
+
+def test_ponto_de_estoque_mais_usado_e_confirmado_com_o_usuario(repo_ferramentas, remetente):
+    historico = HistoricoPontoEstoqueCache()
+    historico.registrar_uso(remetente.base_url, remetente.produtor_id[0], "E2")
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas, historico))
+
+    assert _motivo(caminho_rapido, remetente, _consumo_informado(ponto_estoque_mencionado=None)) == "ambiguidade"
+
+    resolucao = ResolverConsumoInformado(repo_ferramentas, historico).executar(
+        remetente.base_url, remetente.produtor_id[0], _consumo_informado(ponto_estoque_mencionado=None)
+    )
+    assert [candidato.id for candidato in resolucao.ponto_estoque.candidatos] == ["E2", "E1"]
+
+
+
+def test_ferramenta_de_pontos_de_estoque_sugere_o_mais_usado_para_confirmacao(repo_ferramentas, remetente):
+    historico = HistoricoPontoEstoqueCache()
+    historico.registrar_uso(remetente.base_url, remetente.produtor_id[0], "E2")
+
+    encontrados = LocalizarPontoEstoqueService(repo_ferramentas, historico).obter(remetente.base_url, remetente.produtor_id[0])
+
+    assert [(ponto.id, ponto.criterio, ponto.requer_confirmacao) for ponto in encontrados] == [
+        ("E2", "mais_usado", True), ("E1", "alternativa", True)
+    ]
+
+def test_unico_ponto_de_estoque_e_usado_sem_mencao(remetente):
+    repo_ferramentas = RepoFerramentasMemoria(pontos_estoque=[PontoEstoque(id="E1", nome="Depósito Central", ativo=True)])
+    caminho_rapido = CaminhoRapidoConsumo(ResolverConsumoInformado(repo_ferramentas))
+    consumo = caminho_rapido.tentar(remetente, _consumo_informado(ponto_estoque_mencionado=None))
+    assert consumo is not None and consumo.id_ponto_estoque == "E1"
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache import catalogo_cache
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.catalogo_cache import CacheCatalogo
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(catalogo_cache.time, "monotonic", relogio)
+    return relogio
+
+
+class Carga:
+    def __init__(self):
+        self.chamadas = 0
+
+    def __call__(self):
+        self.chamadas += 1
+        return [f"produto {self.chamadas}"]
+
+
+def test_acerto_dentro_do_ttl(relogio):
+    cache = CacheCatalogo(ttls={"produtos": 60}, janela_obsoleto=0)
+    carga = Carga()
+    assert cache.obter("b", "1", "produtos", carga) == ["produto 1"]
+    relogio.agora += 59
+    assert cache.obter("b", "1", "produtos", carga) == ["produto 1"]
+    assert carga.chamadas == 1
+
+
+def test_recarrega_apos_ttl_sem_janela_de_obsoleto(relogio):
+    cache = CacheCatalogo(ttls={"produtos": 60}, janela_obsoleto=0)
+    carga = Carga()
+    cache.obter("b", "1", "produtos", carga)
+    relogio.agora += 61
+    assert cache.obter("b", "1", "produtos", carga) == ["produto 2"]
+    assert carga.chamadas == 2
+
+
+def test_serve_obsoleto_enquanto_recarrega_em_segundo_plano(relogio):
+    cache = CacheCatalogo(ttls={"produtos": 60}, janela_obsoleto=300)
+    carga = Carga()
+    cache.obter("b", "1", "produtos", carga)
+    relogio.agora += 61
+    assert cache.obter("b", "1", "produtos", carga) == ["produto 1"]
+
+    cache._executor.shutdown(wait=True)
+    assert carga.chamadas == 2
+    assert cache.obter("b", "1", "produtos", carga) == ["produto 2"]
+    estatisticas = cache.obter_estatisticas()
+    assert estatisticas["obsoletos_servidos"] == 1
+    assert estatisticas["recargas_segundo_plano"] == 1
+
+
+def test_expirado_alem_da_janela_carrega_de_novo(relogio):
+    cache = CacheCatalogo(ttls={"produtos": 60}, janela_obsoleto=300)
+    carga = Carga()
+    cache.obter("b", "1", "produtos", carga)
+    relogio.agora += 361
+    assert cache.obter("b", "1", "produtos", carga) == ["produto 2"]
+
+
+def test_cargas_concorrentes_da_mesma_chave_sao_unificadas():
+    cache = CacheCatalogo(janela_obsoleto=0)
+    liberar = threading.Event()
+    chamadas = []
+
+    def carga_lenta():
+        chamadas.append(1)
+        liberar.wait(timeout=5)
+        return ["produto"]
+
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(cache.obter("b", "1", "produtos", carga_lenta))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while cache.obter_estatisticas()["esperas_compartilhadas"] < 4:
+        time.sleep(0.01)
+    liberar.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(chamadas) == 1
+    assert resultados == [["produto"]] * 5
+
+
+def test_erro_na_carga_chega_a_todos_e_nao_fica_em_cache():
+    cache = CacheCatalogo(janela_obsoleto=0)
+
+    def carga_com_erro():
+        raise RuntimeError("API fora do ar")
+
+    with pytest.raises(RuntimeError):
+        cache.obter("b", "1", "produtos", carga_com_erro)
+    assert cache.obter("b", "1", "produtos", Carga()) == ["produto 1"]
+
+
+def test_descarta_os_catalogos_usados_ha_mais_tempo():
+    cache = CacheCatalogo(max_itens=3, janela_obsoleto=0)
+    cache.obter("b", "1", "produtos", lambda: ["a", "b"])
+    cache.obter("b", "2", "produtos", lambda: ["c", "d"])
+    estatisticas = cache.obter_estatisticas()
+    assert estatisticas["entradas"] == 1
+    assert estatisticas["descartes_lru"] == 1
+
+
+def test_max_itens_zero_explicito_nao_guarda_nada():
+    cache = CacheCatalogo(max_itens=0, janela_obsoleto=0)
+    carga = Carga()
+    cache.obter("b", "1", "produtos", carga)
+    cache.obter("b", "1", "produtos", carga)
+    assert carga.chamadas == 2
+    assert cache.obter_estatisticas()["max_itens"] == 0
@@ -0,0 +1,35 @@
+from datetime import date
+
+from src.comunicacao_wpp_ia.aplicacao.criacionais.consumo.consumo_informado_factory import FabricaConsumoInformado
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.roteirizado_adapter import AdaptadorLLMRoteirizado
+
+EXTRACAO = {"produtos_mencionados": [{"nome": "tordon", "quantidade": "15"}], "talhoes_mencionados": ["talhão da sede"], "tipo_rateio": "plantio", "ponto_estoque_mencionado": "estoque padrão", "data_mencionada": "2026-01-10"}
+HISTORICO = [{"role": "user", "content": "apliquei tordon no talhão da sede"}, {"role": "assistant", "content": "Qual a quantidade de Tordon?"}]
+
+
+def test_resposta_curta_em_conversa_ativa_pula_a_validacao_combinada():
+    # Sem a etapa 'intencao_extracao' no roteiro, uma chamada combinada ao LLM levantaria ValueError
+    llm = AdaptadorLLMRoteirizado({"etapas": {"extracao": {"respostas": [EXTRACAO]}}})
+    validacao, resultado = FabricaConsumoInformado(llm).criar_de_mensagem_validando_intencao("15 litros", HISTORICO)
+    assert validacao.intencao_valida
+    assert resultado is not None
+
+
+def test_mensagem_sem_historico_passa_pela_validacao_combinada():
+    resposta = {"intencao_valida": False, "justificativa": "Pedido de relatório.", "consumo_informado": None}
+    llm = AdaptadorLLMRoteirizado({"etapas": {"intencao_extracao": {"respostas": [resposta]}}})
+    validacao, resultado = FabricaConsumoInformado(llm).criar_de_mensagem_validando_intencao("quais foram meus gastos", [])
+    assert not validacao.intencao_valida
+    assert resultado is None
+
+
+def test_data_nao_mencionada_e_assumida_como_hoje_e_sinalizada():
+    sem_data = {**EXTRACAO, "data_mencionada": None}
+    llm = AdaptadorLLMRoteirizado({"etapas": {"extracao": {"respostas": [sem_data, EXTRACAO]}}})
+    fabrica = FabricaConsumoInformado(llm)
+
+    consumo_informado = fabrica.criar_de_mensagem("apliquei 15 litros de tordon no talhão da sede", [])
+    assert consumo_informado.data_mencionada == date.today()
+    assert consumo_informado.data_assumida
+
+    assert not fabrica.criar_de_mensagem("apliquei 15 litros de tordon no talhão da sede", []).data_assumida
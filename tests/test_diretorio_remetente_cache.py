@@ -0,0 +1,60 @@
+import json
+from typing import Optional
+
+from src.comunicacao_wpp_ia.dominio.modelos.dados_remetente import DadosRemetente
+from src.comunicacao_wpp_ia.dominio.repositorios.repositorio_remetente import RepositorioRemetente
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.diretorio_remetente_cache import DiretorioRemetenteCache
+
+from conftest import RedisFalso
+
+
+class RepoRemetenteContador(RepositorioRemetente):
+    def __init__(self):
+        self.consultas = 0
+
+    def buscar_remetente_por_telefone(self, telefone: str) -> Optional[DadosRemetente]:
+        self.consultas += 1
+        return DadosRemetente(base_url="https://teste.local", numero_telefone=telefone, produtor_id=["1"])
+
+
+def test_ttl_zero_explicito_nao_e_trocado_pelo_padrao():
+    repositorio = RepoRemetenteContador()
+    diretorio = DiretorioRemetenteCache(repositorio, ttl_segundos=0, ttl_negativo_segundos=0)
+    diretorio.buscar_remetente_por_telefone("5545999998888")
+    diretorio.buscar_remetente_por_telefone("5545999998888")
+    assert repositorio.consultas == 2
+
+
+
+def test_ttl_zero_nao_grava_no_redis():
+    repositorio = RepoRemetenteContador()
+    diretorio = DiretorioRemetenteCache(repositorio, ttl_segundos=0, ttl_negativo_segundos=0)
+    diretorio._cliente_redis = RedisFalso()
+
+    diretorio.buscar_remetente_por_telefone("5545999998888")
+
+    assert diretorio._cliente_redis.valores == {}
+
+def test_entrada_corrompida_no_redis_e_falta_e_e_removida():
+    chave = DiretorioRemetenteCache._PREFIXO_CHAVE + "5545999998888"
+    repositorio = RepoRemetenteContador()
+    diretorio = DiretorioRemetenteCache(repositorio)
+    diretorio._cliente_redis = RedisFalso({chave: "{não é json"})
+
+    remetente = diretorio.buscar_remetente_por_telefone("5545999998888")
+
+    assert remetente.base_url == "https://teste.local"
+    assert repositorio.consultas == 1
+    assert json.loads(diretorio._cliente_redis.valores[chave])["base_url"] == "https://teste.local"
+
+
+def test_entrada_valida_no_redis_evita_a_consulta():
+    chave = DiretorioRemetenteCache._PREFIXO_CHAVE + "5545999998888"
+    repositorio = RepoRemetenteContador()
+    diretorio = DiretorioRemetenteCache(repositorio)
+    diretorio._cliente_redis = RedisFalso({chave: json.dumps({"base_url": "https://redis.local", "produtor_id": ["7"]})})
+
+    remetente = diretorio.buscar_remetente_por_telefone("5545999998888")
+
+    assert (remetente.base_url, remetente.produtor_id) == ("https://redis.local", ["7"])
+    assert repositorio.consultas == 0
@@ -0,0 +1,14 @@
+import pytest
+
+from src.comunicacao_wpp_ia.dominio.utilitarios.estatistica import EstatisticaUtilidade
+
+
+@pytest.mark.parametrize("p, esperado", [(0.50, 50), (0.95, 95), (0.99, 99), (1.0, 100), (0.07, 7), (0.0, 1)])
+def test_percentil_pelo_posto_mais_proximo(p, esperado):
+    assert EstatisticaUtilidade.percentil(range(100, 0, -1), p) == esperado
+
+
+def test_percentil_com_poucas_amostras():
+    assert EstatisticaUtilidade.percentil([3.0, 1.0, 2.0], 0.95) == 3.0
+    assert EstatisticaUtilidade.percentil([5.0], 0.5) == 5.0
+    assert EstatisticaUtilidade.percentil([], 0.95) is None
@@ -0,0 +1,59 @@
+from datetime import date
+
+from src.comunicacao_wpp_ia.dominio.modelos.safra import Safra
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import CatalogoIndexado
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_safras import IndiceSafras
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_trigramas import IndiceTrigramas
+
+
+def _safra(id: str, inicio: date, termino: date) -> Safra:
+    return Safra(id=id, nome=f"Safra {id}", ano_inicio=inicio.year, ano_termino=termino.year, data_inicio=inicio, data_termino=termino)
+
+
+SAFRAS = [
+    _safra("longa", date(2024, 1, 1), date(2026, 12, 31)),
+    _safra("24/25", date(2024, 7, 1), date(2025, 6, 30)),
+    _safra("25/26", date(2025, 7, 1), date(2026, 6, 30)),
+    _safra("antiga", date(2020, 7, 1), date(2021, 6, 30)),
+]
+
+
+def test_ativa_em_prefere_a_safra_iniciada_mais_recentemente():
+    indice = IndiceSafras(SAFRAS)
+    assert indice.ativa_em(date(2025, 1, 15)).id == "24/25"
+    assert indice.ativa_em(date(2025, 7, 1)).id == "25/26"
+
+
+def test_ativa_em_encontra_safra_longa_sobreposta():
+    indice = IndiceSafras(SAFRAS)
+    # Depois do término da 25/26, só a safra longa, iniciada antes, ainda contém a data
+    assert indice.ativa_em(date(2026, 8, 1)).id == "longa"
+
+
+def test_ativa_em_inclui_os_limites_e_retorna_none_fora_dos_intervalos():
+    indice = IndiceSafras(SAFRAS)
+    assert indice.ativa_em(date(2020, 7, 1)).id == "antiga"
+    assert indice.ativa_em(date(2021, 6, 30)).id == "antiga"
+    assert indice.ativa_em(date(2022, 1, 1)) is None
+    assert indice.ativa_em(date(2019, 1, 1)) is None
+    assert indice.ativa_em(date(2027, 1, 1)) is None
+
+
+def test_por_anos():
+    indice = IndiceSafras(SAFRAS)
+    assert indice.por_anos(2025, 2026).id == "25/26"
+    assert indice.por_anos(2030, 2031) is None
+
+
+def test_trigramas_pre_filtra_os_textos_parecidos():
+    textos = ["roundup original", "roundup transorb", "elatus", "fox xpro"]
+    indice = IndiceTrigramas(textos)
+    candidatos = {textos[posicao] for posicao in indice.candidatos("roundup")}
+    assert candidatos == {"roundup original", "roundup transorb"}
+
+
+def test_catalogo_indexado_guarda_o_indice_junto_da_lista():
+    catalogo = CatalogoIndexado.construir(SAFRAS, IndiceSafras)
+    assert IndiceSafras.obter(catalogo) is IndiceSafras.obter(catalogo)
+    # Sobre uma lista comum não há memo global: cada chamada constrói o índice da lista recebida
+    assert IndiceSafras.obter(list(SAFRAS)) is not IndiceSafras.obter(list(SAFRAS))
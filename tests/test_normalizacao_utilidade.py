@@ -0,0 +1,19 @@
+import pytest
+
+from src.comunicacao_wpp_ia.dominio.utilitarios.normalizacao import NormalizacaoUtilidade
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("Depósito Sede", "deposito sede"),
+    ("Roundup 1,5L", "roundup"),
+    ("Dep. Faz. Sta. Rita", "deposito fazenda santa rita"),
+    ("20 kg", "20 kg"),
+    ("", ""),
+])
+def test_normalizar(texto, esperado):
+    assert NormalizacaoUtilidade.normalizar(texto) == esperado
+
+
+@pytest.mark.parametrize("telefone", ["+55 (45) 99999-8888", "045999998888", "4599998888", "5545999998888"])
+def test_normalizar_telefone_gera_a_mesma_chave(telefone):
+    assert NormalizacaoUtilidade.normalizar_telefone(telefone) == "4599998888"
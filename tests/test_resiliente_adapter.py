@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.prazo_llm import PrazoLLM
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.llm.resiliente_adapter import AdaptadorLLMResiliente
+
+
+class Saida(BaseModel):
+    provedor: str
+
+
+class ProvedorFalso:
+    """Provedor que responde após `atraso` segundos, ou falha, e guarda o prazo que recebeu."""
+    def __init__(self, nome: str, atraso: float = 0.0, erro: Exception = None):
+        self.nome = nome
+        self.atraso = atraso
+        self.erro = erro
+        self.chamadas = 0
+        self.prazos = []
+        self._lock = threading.Lock()
+
+    def criar_agente(self, prompt_sistema, prompt_usuario, modelo_saida, etapa=None):
+        provedor = self
+
+        class Agente:
+            def executar(self, entrada):
+                with provedor._lock:
+                    provedor.chamadas += 1
+                    provedor.prazos.append(PrazoLLM.restante())
+                time.sleep(provedor.atraso)
+                if provedor.erro:
+                    raise provedor.erro
+                return Saida(provedor=provedor.nome)
+        return Agente()
+
+
+def _executar(adaptador: AdaptadorLLMResiliente) -> str:
+    return adaptador.criar_agente("sistema", "usuario", Saida).executar({}).provedor
+
+
+def test_failover_quando_o_provedor_falha():
+    adaptador = AdaptadorLLMResiliente([("a", ProvedorFalso("a", erro=RuntimeError("503"))), ("b", ProvedorFalso("b"))])
+    assert _executar(adaptador) == "b"
+    estatisticas = adaptador.obter_estatisticas()["provedores"]
+    assert estatisticas["a"]["falhas"] == 1
+    assert estatisticas["b"]["failovers"] == 1
+
+
+def test_failover_quando_o_prazo_estoura_e_o_prazo_chega_ao_provedor():
+    lento = ProvedorFalso("a", atraso=0.5)
+    adaptador = AdaptadorLLMResiliente([("a", lento), ("b", ProvedorFalso("b"))], prazo_estruturado=0.1)
+    assert _executar(adaptador) == "b"
+    assert 0 < lento.prazos[0] <= 0.1
+
+    estatisticas = adaptador.obter_estatisticas()["provedores"]["a"]
+    assert estatisticas["prazos_estourados"] == 1
+    assert estatisticas["abandonadas"] == 1
+    time.sleep(0.6)
+    assert adaptador.obter_estatisticas()["provedores"]["a"]["abandonadas_em_andamento"] == 0
+
+
+def test_erro_do_ultimo_provedor_e_propagado():
+    adaptador = AdaptadorLLMResiliente([("a", ProvedorFalso("a", erro=ValueError("resposta inválida")))])
+    with pytest.raises(ValueError):
+        _executar(adaptador)
+
+
+def test_hedge_dispara_no_reserva_quando_passa_do_p95():
+    principal = ProvedorFalso("a")
+    adaptador = AdaptadorLLMResiliente([("a", principal), ("b", ProvedorFalso("b"))], hedge=True, hedge_minimo_segundos=0.05)
+    for _ in range(AdaptadorLLMResiliente.MINIMO_AMOSTRAS_HEDGE):
+        _executar(adaptador)
+
+    principal.atraso = 0.5
+    assert _executar(adaptador) == "b"
+    estatisticas = adaptador.obter_estatisticas()["provedores"]["a"]
+    assert estatisticas["hedges_lancados"] == 1
+    assert estatisticas["hedges_vencedores"] == 1
+
+
+def test_hedge_nao_volta_ao_provedor_que_ja_falhou():
+    reserva = ProvedorFalso("b")
+    adaptador = AdaptadorLLMResiliente([("a", ProvedorFalso("a", erro=RuntimeError("503"))), ("b", reserva)], hedge=True, hedge_minimo_segundos=0.05)
+    for _ in range(AdaptadorLLMResiliente.MINIMO_AMOSTRAS_HEDGE):
+        _executar(adaptador)
+
+    # Após o failover, o reserva passa do p95, mas o único outro provedor já falhou nesta operação
+    reserva.atraso = 0.2
+    assert _executar(adaptador) == "b"
+    assert adaptador.obter_estatisticas()["provedores"]["b"]["hedges_lancados"] == 0
+    assert adaptador.obter_estatisticas()["provedores"]["a"]["chamadas"] == AdaptadorLLMResiliente.MINIMO_AMOSTRAS_HEDGE + 1
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+
+from src.comunicacao_wpp_ia.infraestrutura.adaptadores.saida.cache.resposta_llm_cache import CacheRespostasLLM
+
+from conftest import RedisFalso
+
+
+class Resposta(BaseModel):
+    intencao_valida: bool
+
+
+def test_acerto_na_memoria_devolve_uma_copia():
+    cache = CacheRespostasLLM()
+    cache.gravar("chave", Resposta(intencao_valida=True))
+    primeira = cache.obter("chave", Resposta)
+    primeira.intencao_valida = False
+    assert cache.obter("chave", Resposta).intencao_valida is True
+
+
+def test_ttl_zero_explicito_nao_guarda_na_memoria():
+    cache = CacheRespostasLLM(ttl_segundos=0)
+    cache.gravar("chave", Resposta(intencao_valida=True))
+    assert cache.obter("chave", Resposta) is None
+
+
+def test_resposta_invalida_no_redis_e_falta_e_e_removida():
+    chave_redis = CacheRespostasLLM._PREFIXO_CHAVE + "chave"
+    cache = CacheRespostasLLM()
+    cache._cliente_redis = RedisFalso({chave_redis: '{"outro_campo": 1}'})
+
+    assert cache.obter("chave", Resposta) is None
+    assert chave_redis not in cache._cliente_redis.valores
+    estatisticas = cache.obter_estatisticas()
+    assert (estatisticas["invalidas_redis"], estatisticas["faltas"], estatisticas["acertos_redis"]) == (1, 1, 0)
+
+
+def test_resposta_valida_no_redis_e_acerto():
+    cache = CacheRespostasLLM()
+    cache._cliente_redis = RedisFalso({CacheRespostasLLM._PREFIXO_CHAVE + "chave": '{"intencao_valida": true}'})
+    assert cache.obter("chave", Resposta).intencao_valida is True
+    assert cache.obter_estatisticas()["acertos_redis"] == 1
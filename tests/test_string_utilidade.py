@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+
+from src.comunicacao_wpp_ia.dominio.utilitarios.string import StringUtilidade
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("12 litros", 12.0),
+    ("1.500 litros", 1500.0),
+    ("1.500,75", 1500.75),
+    ("10,5", 10.5),
+    ("10.5", 10.5),
+    ("12.", 12.0),
+    (3, 3.0),
+    (2.5, 2.5),
+])
+def test_para_numero_le_quantidades_pt_br(texto, esperado):
+    assert StringUtilidade.para_numero(texto) == esperado
+
+
+@pytest.mark.parametrize("texto", ["2 x 20", "1,500.5", "1.5000", "alguns", "", None, True])
+def test_para_numero_retorna_none_quando_ambiguo(texto):
+    assert StringUtilidade.para_numero(texto) is None
+
+
+def test_para_data_informada_aceita_iso_e_data():
+    assert StringUtilidade.para_data_informada("2026-01-10") == date(2026, 1, 10)
+    assert StringUtilidade.para_data_informada(date(2026, 1, 10)) == date(2026, 1, 10)
+    assert StringUtilidade.para_data_informada(None) is None
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.tabela_compacta import TabelaCompacta
+from src.comunicacao_wpp_ia.aplicacao.servicos.llms.utilizar_ferramenta import UtilizarFerramenta
+from src.comunicacao_wpp_ia.dominio.servicos.indices.indice_catalogo import CatalogoIndexado
+from src.comunicacao_wpp_ia.dominio.utilitarios.tokens import TokensUtilidade
+
+
+def test_codifica_cabecalho_e_linhas():
+    tabela = TabelaCompacta(max_tokens=100)
+    saida = tabela.codificar(["id", "nome", "area_ha"], [["1", "Talhão|01", 42.5], ["2", None, 30.0]], 0)
+    assert saida.splitlines() == ["id|nome|area_ha", "1|Talhão/01|42.5", "2||30"]
+
+
+def test_respeita_o_teto_de_tokens_e_conta_as_omitidas():
+    tabela = TabelaCompacta(max_tokens=10)
+    linhas = [[str(i), f"plantio {i}"] for i in range(20)]
+    saida = tabela.codificar(["id", "nome"], linhas, TokensUtilidade.estimar(json.dumps(linhas)))
+    assert saida.splitlines()[-1].startswith("... +")
+    assert tabela.obter_estatisticas()["linhas_omitidas"] > 0
+
+
+def test_economia_vem_da_estimativa_do_json_completo():
+    tabela = TabelaCompacta()
+    tokens_json_completo = TokensUtilidade.estimar(json.dumps([{"id": str(i), "nome": f"plantio {i}"} for i in range(10)]))
+    saida = tabela.codificar(["id", "nome"], [[str(i), f"plantio {i}"] for i in range(10)], tokens_json_completo)
+
+    estatisticas = tabela.obter_estatisticas()
+    assert estatisticas["tokens_json_completo_estimados"] == tokens_json_completo
+    assert estatisticas["tokens_economizados_estimados"] == tokens_json_completo - TokensUtilidade.estimar(saida)
+
+
+def test_instancias_nao_compartilham_configuracao_nem_contadores():
+    pequena, grande = TabelaCompacta(max_tokens=5), TabelaCompacta(max_tokens=500)
+    pequena.codificar(["id"], [["1"]], 0)
+    assert grande.obter_estatisticas()["chamadas"] == 0
+    assert grande.max_tokens == 500
+
+
+def test_json_completo_e_estimado_uma_vez_por_catalogo(repo_ferramentas):
+    catalogo = CatalogoIndexado(repo_ferramentas.buscar_plantios_do_produtor("b", "1"))
+    tokens = UtilizarFerramenta._tokens_json_completo(catalogo)
+    assert tokens > 0
+    assert catalogo.derivado("tokens_json_completo", lambda _: pytest.fail("o catálogo foi serializado de novo")) == tokens
@@ -0,0 +1,37 @@
+from src.comunicacao_wpp_ia.dominio.objetos.consumo import Consumo, Produto
+from src.comunicacao_wpp_ia.dominio.servicos.consumo.validador_consumo_montado import ValidadorConsumoMontado
+
+
+def _consumo(**alteracoes) -> Consumo:
+    dados = {
+        "produtos": [Produto(id="P1", quantidade=12.0)],
+        "id_ponto_estoque": "E1",
+        "id_safra": "S1",
+        "data_aplicacao": "10/01/2026",
+        "tipo_rateio": "plantio",
+        "ids_plantios": ["PL1"],
+    }
+    dados.update(alteracoes)
+    return Consumo(**dados)
+
+
+def test_consumo_completo_e_valido():
+    assert ValidadorConsumoMontado.validar(_consumo()) == (True, [])
+
+
+def test_aponta_quantidade_e_estoque_faltando():
+    valido, problemas = ValidadorConsumoMontado.validar(_consumo(produtos=[Produto(id="P1", quantidade=None)], id_ponto_estoque=None))
+    assert not valido
+    assert problemas == [ValidadorConsumoMontado._mapa_mensagens["quantidade"], ValidadorConsumoMontado._mapa_mensagens["id_ponto_estoque"]]
+
+
+def test_exige_a_area_de_acordo_com_o_tipo_de_rateio():
+    _, problemas = ValidadorConsumoMontado.validar(_consumo(tipo_rateio="propriedade"))
+    assert problemas == [ValidadorConsumoMontado._mapa_mensagens["propriedade"]]
+    _, problemas = ValidadorConsumoMontado.validar(_consumo(tipo_rateio=None))
+    assert problemas == [ValidadorConsumoMontado._mapa_mensagens["tipo_rateio"]]
+
+
+def test_mensagem_pede_revisao():
+    mensagem = ValidadorConsumoMontado.montar_mensagem(["Problema."])
+    assert mensagem.startswith("Problema.") and mensagem.endswith(ValidadorConsumoMontado._pedido_revisao)